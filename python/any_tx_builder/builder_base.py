@@ -1,4 +1,41 @@
 from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Callable, List, NamedTuple, Optional
+
+
+class TxStatus(str, Enum):
+    BUILT = "built"
+    SIGNED = "signed"
+    # Accepted by the node, not included yet
+    PENDING = "pending"
+    SUCCESS = "success"
+    FAILED = "failed"
+    NOT_FOUND = "not_found"
+
+
+class TransactionResult(NamedTuple):
+    """Outcome of one transaction of a batch, batches never raise for a single transaction."""
+
+    status: TxStatus
+    transaction: Any = None
+    tx_hash: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status not in (TxStatus.FAILED, TxStatus.NOT_FOUND)
+
+    @classmethod
+    def failed(cls, error: Exception, transaction: Any = None, tx_hash: Optional[str] = None) -> "TransactionResult":
+        return cls(TxStatus.FAILED, transaction, tx_hash, repr(error))
+
+
+def _result_of(call: Callable[[], TransactionResult]) -> TransactionResult:
+    try:
+        return call()
+    except Exception as error:
+        return TransactionResult.failed(error)
+
 
 class BaseTransactionBuilder(ABC):
 
@@ -17,3 +54,39 @@ class BaseTransactionBuilder(ABC):
     @abstractmethod
     def is_transaction_broadcasted(self, tx_hash: str) -> bool:
         pass
+
+    #
+    # Batches: one result per input, in order. These loop over the single transaction
+    # methods, builders override them with their chain's bulk primitives.
+    #
+
+    def build_many(self, from_address: str, calls: List[dict]) -> List[TransactionResult]:
+        """Build one transaction per call, a call holding build_contract_transaction keyword arguments."""
+        return [
+            _result_of(lambda: TransactionResult(
+                TxStatus.BUILT, self.build_contract_transaction(from_address, **call)
+            ))
+            for call in calls
+        ]
+
+    def sign_many(self, transactions: List[Any], private_key) -> List[TransactionResult]:
+        return [
+            _result_of(lambda: TransactionResult(TxStatus.SIGNED, self.sign_transaction(transaction, private_key)))
+            for transaction in transactions
+        ]
+
+    def broadcast_many(self, transactions: List[Any]) -> List[TransactionResult]:
+        return [
+            _result_of(lambda: TransactionResult(
+                TxStatus.PENDING, transaction, str(self.broadcast_transaction(transaction))
+            ))
+            for transaction in transactions
+        ]
+
+    def status_many(self, tx_hashes: List[str]) -> List[TransactionResult]:
+        return [
+            _result_of(lambda: TransactionResult(
+                TxStatus.SUCCESS if self.is_transaction_broadcasted(tx_hash) else TxStatus.NOT_FOUND, tx_hash=tx_hash
+            ))
+            for tx_hash in tx_hashes
+        ]
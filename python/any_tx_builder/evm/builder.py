@@ -1,24 +1,32 @@
 import os
 import json
+import logging
 import requests
+from typing import List, Optional
 from web3.exceptions import ContractLogicError
 from web3 import Web3
 
-from any_tx_builder.evm.config import POLYGON_STAKING_CONTRACT, POLYGON_TOKEN_CONTRACT
-from any_tx_builder.builder_base import BaseTransactionBuilder
+from any_tx_builder.evm.config import MAX_BATCH_REQUESTS, POLYGON_STAKING_CONTRACT, POLYGON_TOKEN_CONTRACT
+from any_tx_builder.builder_base import BaseTransactionBuilder, TransactionResult, TxStatus
+from any_tx_builder.instrumentation import EVM, count_rpc, log_event, span
+
+logger = logging.getLogger(__name__)
 
 class EVMTransactionBuilder(BaseTransactionBuilder):
     def __init__(self, w3_con: Web3):
         self.w3 = w3_con
 
     def _estimate_gas_price(self):
-        # Get the latest block and calculate base fee
-        latest_block = self.w3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
+        with span("fee_estimation", chain=EVM):
+            # Get the latest block and calculate base fee
+            count_rpc(EVM, 'eth_getBlockByNumber')
+            latest_block = self.w3.eth.get_block('latest')
+            base_fee = latest_block['baseFeePerGas']
+
+            # Calculate max priority fee (tip)
+            count_rpc(EVM, 'eth_maxPriorityFeePerGas')
+            max_priority_fee_wei = self.w3.eth.max_priority_fee
 
-        # Calculate max priority fee (tip)
-        max_priority_fee_wei = self.w3.eth.max_priority_fee
-        
         # Calculate max fee per gas
         max_fee_per_gas = base_fee + max_priority_fee_wei
         
@@ -27,12 +35,19 @@ class EVMTransactionBuilder(BaseTransactionBuilder):
             'maxPriorityFeePerGas': max_priority_fee_wei
         }
 
+    def _get_nonce(self, from_address: str, block_identifier: str = 'latest') -> int:
+        with span("nonce_lookup", chain=EVM):
+            count_rpc(EVM, 'eth_getTransactionCount')
+            return self.w3.eth.get_transaction_count(from_address, block_identifier)
+
     def _estimate_gas(self, transaction: dict) -> int:
         try:
-            estimated_gas = self.w3.eth.estimate_gas(transaction)
+            with span("gas_simulation", chain=EVM):
+                count_rpc(EVM, 'eth_estimateGas')
+                estimated_gas = self.w3.eth.estimate_gas(transaction)
             return int(estimated_gas * 1.1)
         except ContractLogicError as e:
-            print(f"Gas estimation failed: {str(e)}")
+            log_event(logger, logging.WARNING, "gas_estimation_failed", chain=EVM, error=str(e))
             raise ContractLogicError(f"Gas estimation failed due to contract logic error: {str(e)}")
     
     def get_contract_abi(self, contract_address: str) -> list:
@@ -92,7 +107,7 @@ class EVMTransactionBuilder(BaseTransactionBuilder):
             'from': from_address,
             'maxFeePerGas': max_fee_per_gas,
             'maxPriorityFeePerGas': max_priority_fee_per_gas,
-            'nonce': self.w3.eth.get_transaction_count(from_address),
+            'nonce': self._get_nonce(from_address),
         })
         gas = self._estimate_gas(transaction)
         transaction['gas'] = gas
@@ -115,21 +130,24 @@ class EVMTransactionBuilder(BaseTransactionBuilder):
             'value': value,
             'maxFeePerGas': max_fee_per_gas,
             'maxPriorityFeePerGas': max_priority_fee_per_gas,
-            'nonce': self.w3.eth.get_transaction_count(from_address),
+            'nonce': self._get_nonce(from_address),
         })
         gas = self._estimate_gas(transaction)
         transaction['gas'] = gas
         return transaction
 
     def sign_transaction(self, transaction: dict, private_key: str):
-        account = self.w3.eth.account.from_key(private_key)
-        signed_txn = account.sign_transaction(transaction)
+        with span("signing", chain=EVM):
+            account = self.w3.eth.account.from_key(private_key)
+            signed_txn = account.sign_transaction(transaction)
         return signed_txn
     
     def broadcast_transaction(self, signed_raw_transaction: str) -> str:
-        tx_hash = self.w3.eth.send_raw_transaction(signed_raw_transaction)
-        print(f" ✅ Transaction sent: {tx_hash}")
-        return self.w3.to_hex(tx_hash)
+        with span("broadcast", chain=EVM):
+            count_rpc(EVM, 'eth_sendRawTransaction')
+            tx_hash = self.w3.to_hex(self.w3.eth.send_raw_transaction(signed_raw_transaction))
+        log_event(logger, logging.INFO, "transaction_sent", chain=EVM, tx_hash=tx_hash)
+        return tx_hash
 
     def is_transaction_broadcasted(self, tx_hash: str) -> bool:
         """
@@ -139,13 +157,143 @@ class EVMTransactionBuilder(BaseTransactionBuilder):
         :return: Boolean indicating whether the transaction was broadcasted successfully.
         """
         try:
+            count_rpc(EVM, 'eth_getTransactionReceipt')
             tx_receipt = self.w3.eth.get_transaction_receipt(tx_hash)
             if tx_receipt is not None:
                 return tx_receipt.status == 1
         except Exception as e:
-            print(e)
+            log_event(logger, logging.WARNING, "status_lookup_failed", chain=EVM, tx_hash=tx_hash, error=repr(e))
             return False
-            
+
+    #
+    # Batches
+    #
+
+    def _batch_request(self, method: str, params: List[list]) -> List[dict]:
+        """One JSON-RPC response per params, sent in batches of MAX_BATCH_REQUESTS; errors are per response."""
+        responses = []
+        for start in range(0, len(params), MAX_BATCH_REQUESTS):
+            chunk = params[start:start + MAX_BATCH_REQUESTS]
+            count_rpc(EVM, method, len(chunk))
+            chunk_responses = self.w3.provider.make_batch_request([(method, item) for item in chunk])
+            # A batch rejected as a whole comes back as a single error response
+            if not isinstance(chunk_responses, list):
+                chunk_responses = [chunk_responses] * len(chunk)
+            responses.extend(chunk_responses)
+        return responses
+
+    @staticmethod
+    def _response_error(response: dict) -> str:
+        error = response.get("error")
+        return error.get("message", str(error)) if isinstance(error, dict) else str(error)
+
+    def build_many(self, from_address: str, calls: List[dict]) -> List[TransactionResult]:
+        """
+        Build contract calls from one account with consecutive nonces.
+
+        Fees, chain id and nonce are fetched once, and gas is estimated for every call in
+        JSON-RPC batches. Calls failing estimation get no nonce, so the others stay gapless.
+        """
+        gas_price = self._estimate_gas_price()
+        count_rpc(EVM, 'eth_chainId')
+        chain_id = self.w3.eth.chain_id
+        nonce = self._get_nonce(from_address, 'pending')
+        contracts = {}
+
+        results: List[Optional[TransactionResult]] = [None] * len(calls)
+        built = []
+        for index, call in enumerate(calls):
+            try:
+                contract_address = call['contract_address']
+                contract = contracts.get(contract_address)
+                if contract is None:
+                    contract = self.w3.eth.contract(
+                        address=contract_address, abi=self.get_contract_abi(contract_address)
+                    )
+                    contracts[contract_address] = contract
+                contract_function = getattr(contract.functions, call['function_name'])
+                # With gas, nonce and chain id given, web3 builds the transaction without a request
+                transaction = contract_function(*call.get('function_args', [])).build_transaction({
+                    'from': from_address,
+                    'value': call.get('value', 0),
+                    'maxFeePerGas': gas_price['maxFeePerGas'],
+                    'maxPriorityFeePerGas': gas_price['maxPriorityFeePerGas'],
+                    'chainId': chain_id,
+                    'nonce': 0,
+                    'gas': 0,
+                })
+                built.append((index, transaction))
+            except Exception as e:
+                results[index] = TransactionResult.failed(e)
+
+        with span("gas_simulation", chain=EVM, transactions=len(built)):
+            estimates = self._batch_request('eth_estimateGas', [
+                [{
+                    'from': transaction['from'],
+                    'to': transaction['to'],
+                    'data': transaction['data'],
+                    'value': hex(transaction['value']),
+                }]
+                for _, transaction in built
+            ])
+        for (index, transaction), estimate in zip(built, estimates):
+            if 'error' in estimate:
+                error = self._response_error(estimate)
+                log_event(logger, logging.WARNING, "gas_estimation_failed", chain=EVM, error=error)
+                results[index] = TransactionResult(TxStatus.FAILED, transaction, error=error)
+                continue
+            transaction['gas'] = int(int(estimate['result'], 16) * 1.1)
+            transaction['nonce'] = nonce
+            nonce += 1
+            results[index] = TransactionResult(TxStatus.BUILT, transaction)
+        return results
+
+    def sign_many(self, transactions: List[dict], private_key: str) -> List[TransactionResult]:
+        with span("signing", chain=EVM, transactions=len(transactions)):
+            account = self.w3.eth.account.from_key(private_key)
+            results = []
+            for transaction in transactions:
+                try:
+                    results.append(TransactionResult(TxStatus.SIGNED, account.sign_transaction(transaction)))
+                except Exception as e:
+                    results.append(TransactionResult.failed(e, transaction))
+        return results
+
+    def broadcast_many(self, signed_transactions: list) -> List[TransactionResult]:
+        """Send signed transactions, or their raw bytes, in JSON-RPC batches."""
+        with span("serialization", chain=EVM, transactions=len(signed_transactions)):
+            raw_transactions = [
+                self.w3.to_hex(getattr(transaction, 'raw_transaction', transaction))
+                for transaction in signed_transactions
+            ]
+        with span("broadcast", chain=EVM, transactions=len(signed_transactions)):
+            responses = self._batch_request('eth_sendRawTransaction', [[raw] for raw in raw_transactions])
+        results = []
+        for transaction, response in zip(signed_transactions, responses):
+            if 'error' in response:
+                results.append(TransactionResult(TxStatus.FAILED, transaction, error=self._response_error(response)))
+            else:
+                results.append(TransactionResult(TxStatus.PENDING, transaction, response['result']))
+        sent = sum(result.ok for result in results)
+        log_event(logger, logging.INFO, "transactions_sent", chain=EVM, sent=sent, transactions=len(results))
+        return results
+
+    def status_many(self, tx_hashes: List[str]) -> List[TransactionResult]:
+        responses = self._batch_request('eth_getTransactionReceipt', [[tx_hash] for tx_hash in tx_hashes])
+        results = []
+        for tx_hash, response in zip(tx_hashes, responses):
+            receipt = response.get('result')
+            if 'error' in response:
+                results.append(TransactionResult(TxStatus.FAILED, tx_hash=tx_hash, error=self._response_error(response)))
+            elif receipt is None:
+                # Still pending, or unknown to the node
+                results.append(TransactionResult(TxStatus.NOT_FOUND, tx_hash=tx_hash))
+            elif int(receipt['status'], 16) == 1:
+                results.append(TransactionResult(TxStatus.SUCCESS, receipt, tx_hash))
+            else:
+                results.append(TransactionResult(TxStatus.FAILED, receipt, tx_hash, "Transaction reverted"))
+        return results
+
 
 class PolygonStakingTransactionBuilder(EVMTransactionBuilder):
     def __init__(self, w3_con):
@@ -174,7 +322,7 @@ class PolygonStakingTransactionBuilder(EVMTransactionBuilder):
             'from': from_address,
             'maxFeePerGas': max_fee_per_gas,
             'maxPriorityFeePerGas': max_priority_fee_per_gas,
-            'nonce': self.w3.eth.get_transaction_count(from_address),
+            'nonce': self._get_nonce(from_address),
         })
         gas = self._estimate_gas(transaction)
         transaction['gas'] = gas
@@ -198,7 +346,7 @@ class PolygonStakingTransactionBuilder(EVMTransactionBuilder):
             'from': from_address,
             'maxFeePerGas': max_fee_per_gas,
             'maxPriorityFeePerGas': max_priority_fee_per_gas,
-            'nonce': self.w3.eth.get_transaction_count(from_address),
+            'nonce': self._get_nonce(from_address),
         })
         gas = self._estimate_gas(transaction)
         transaction['gas'] = gas
@@ -222,7 +370,7 @@ class PolygonStakingTransactionBuilder(EVMTransactionBuilder):
             'from': from_address,
             'maxFeePerGas': max_fee_per_gas,
             'maxPriorityFeePerGas': max_priority_fee_per_gas,
-            'nonce': self.w3.eth.get_transaction_count(from_address),
+            'nonce': self._get_nonce(from_address),
         })
         gas = self._estimate_gas(transaction)
         transaction['gas'] = gas
@@ -246,7 +394,7 @@ class PolygonStakingTransactionBuilder(EVMTransactionBuilder):
             'from': from_address,
             'maxFeePerGas': max_fee_per_gas,
             'maxPriorityFeePerGas': max_priority_fee_per_gas,
-            'nonce': self.w3.eth.get_transaction_count(from_address),
+            'nonce': self._get_nonce(from_address),
         })
         gas = self._estimate_gas(transaction)
         transaction['gas'] = gas
@@ -4,3 +4,5 @@ POLYGON_LOGGER_CONTRACT = "0xa59C847Bd5aC0172Ff4FE912C5d29E5A71A7512B"
 POLYGON_TOKEN_CONTRACT = "0x44499312f493F62f2DFd3C6435Ca3603EbFCeeBa"#"0x455e53CBB86018Ac2B8092FdCd39d8444aFFC3F6"
 VALIDATOR_ADDRESS = "0x02a9F16b353410f150Fb25F7983B3DC90Db4679D"#"0xeA077b10A0eD33e4F68Edb2655C18FDA38F84712"
 
+# JSON-RPC requests sent in one batch, public endpoints commonly reject larger batches
+MAX_BATCH_REQUESTS = 100
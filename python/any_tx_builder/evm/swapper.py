@@ -1,6 +1,11 @@
+import logging
+
 from any_tx_builder.evm.builder import EVMTransactionBuilder
+from any_tx_builder.instrumentation import EVM, log_event
 from typing import Optional, Dict, Any
 
+logger = logging.getLogger(__name__)
+
 class Swapper:
     def __init__(self, tx_builder: EVMTransactionBuilder, private_key: str):
         self.tx_builder = tx_builder
@@ -9,7 +14,7 @@ class Swapper:
     def sign_and_send_transaction(self, transaction: Dict[str, Any]) -> str:
         signed_txn = self.sign_transaction(transaction, self.account.private_key)
         tx_hash = self.broadcast_transaction(signed_txn.rawTransaction)
-        print(f" ✅ Transaction sent: {tx_hash}")
+        log_event(logger, logging.INFO, "transaction_sent", chain=EVM, tx_hash=tx_hash)
         return self.w3.to_hex(tx_hash)
 
     def swap(self, 
@@ -0,0 +1,286 @@
+########################################################
+#
+# Instrumentation
+#
+# Spans around the steps of building and sending transactions, counters of RPC calls
+# per method, and structured log events. Nothing is recorded until an exporter is added:
+# `span` then hands out a shared no-op context manager and `count_rpc` returns at once.
+#
+# Span names: fee_estimation, nonce_lookup, sequence_lookup, blockhash_lookup,
+# gas_simulation, signing, serialization and broadcast, with a `chain` attribute.
+#
+########################################################
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+EVM = "evm"
+SOLANA = "solana"
+TENDERMINT = "tendermint"
+
+# Upper bounds of the Prometheus span duration histogram, in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Exporter:
+    """Receives spans and RPC counts once added with `add_exporter`; every hook is optional."""
+
+    def span_started(self, span: "Span") -> Any:
+        """Called when `span` starts, the returned token is handed back to `span_ended`."""
+        return None
+
+    def span_ended(self, span: "Span", token: Any):
+        pass
+
+    def rpc_called(self, chain: str, method: str, calls: int):
+        pass
+
+
+# Replaced rather than mutated, so that spans iterate over a stable list
+_exporters: Tuple[Exporter, ...] = ()
+_exporters_lock = threading.Lock()
+
+
+def add_exporter(exporter: Exporter) -> Exporter:
+    global _exporters
+    with _exporters_lock:
+        _exporters = (*_exporters, exporter)
+    return exporter
+
+
+def remove_exporter(exporter: Exporter):
+    global _exporters
+    with _exporters_lock:
+        _exporters = tuple(added for added in _exporters if added is not exporter)
+
+
+def enabled() -> bool:
+    return bool(_exporters)
+
+
+class Span:
+    __slots__ = ("name", "attributes", "start", "duration", "error", "_exporters", "_tokens")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], exporters: Tuple[Exporter, ...]):
+        self.name = name
+        self.attributes = attributes
+        self.start = 0.0
+        self.duration = 0.0
+        self.error: Optional[BaseException] = None
+        self._exporters = exporters
+        self._tokens: List[Any] = []
+
+    def __enter__(self) -> "Span":
+        self._tokens = [exporter.span_started(self) for exporter in self._exporters]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self.duration = time.perf_counter() - self.start
+        self.error = exc
+        for exporter, token in zip(self._exporters, self._tokens):
+            exporter.span_ended(self, token)
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes):
+    """Context manager timing the enclosed block, a shared no-op without exporters."""
+    exporters = _exporters
+    if not exporters:
+        return _NOOP_SPAN
+    return Span(name, attributes, exporters)
+
+
+def count_rpc(chain: str, method: str, calls: int = 1):
+    """Count `calls` RPC calls of `method`, batched calls counting one each."""
+    exporters = _exporters
+    if not exporters:
+        return
+    for exporter in exporters:
+        exporter.rpc_called(chain, method, calls)
+
+
+#
+# Structured logs
+#
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields):
+    """
+    Log `event` as "event key=value ...", the record keeping `event` and `fields`
+    attributes for structured formatters such as JsonLogFormatter.
+    """
+    if logger.isEnabledFor(level):
+        message = " ".join([event, *(f"{key}={value}" for key, value in fields.items())])
+        logger.log(level, message, extra={"event": event, "fields": fields})
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record, fields of log_event records included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None) or record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+#
+# Exporters
+#
+
+
+class LoggingExporter(Exporter):
+    """Every span as a `span` log event, and RPC calls as `rpc_call` events."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG):
+        self.logger = logger or logging.getLogger("any_tx_builder.instrumentation")
+        self.level = level
+
+    def span_ended(self, span: Span, token: Any):
+        fields = {"span": span.name, "duration_ms": round(span.duration * 1e3, 3), **span.attributes}
+        if span.error is not None:
+            fields["error"] = repr(span.error)
+        log_event(self.logger, self.level, "span", **fields)
+
+    def rpc_called(self, chain: str, method: str, calls: int):
+        log_event(self.logger, self.level, "rpc_call", chain=chain, method=method, calls=calls)
+
+
+def _labels(**labels) -> str:
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class PrometheusExporter(Exporter):
+    """
+    Span durations, span errors and RPC calls, rendered in the Prometheus text format.
+
+    Series are labelled with the span name or RPC method and the `chain` attribute only,
+    other attributes would make too many series. Serve `render()` from any HTTP handler,
+    or `write()` it for the node exporter's textfile collector.
+    """
+
+    def __init__(self, namespace: str = "any_tx_builder", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # (span, chain) -> bucket counts, the last one being +Inf
+        self._bucket_counts: Dict[Tuple[str, str], List[int]] = {}
+        self._duration_sums: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._rpc_calls: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def span_ended(self, span: Span, token: Any):
+        key = (span.name, str(span.attributes.get("chain", "")))
+        with self._lock:
+            counts = self._bucket_counts.get(key)
+            if counts is None:
+                counts = self._bucket_counts[key] = [0] * (len(self.buckets) + 1)
+            for index, bound in enumerate(self.buckets):
+                if span.duration <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._duration_sums[key] += span.duration
+            if span.error is not None:
+                self._errors[key] += 1
+
+    def rpc_called(self, chain: str, method: str, calls: int):
+        with self._lock:
+            self._rpc_calls[(chain, method)] += calls
+
+    def render(self) -> str:
+        name = f"{self.namespace}_span_duration_seconds"
+        lines = [f"# HELP {name} Duration of instrumented steps.", f"# TYPE {name} histogram"]
+        with self._lock:
+            for (span_name, chain), counts in sorted(self._bucket_counts.items()):
+                cumulative = 0
+                for bound, count in zip([*self.buckets, "+Inf"], counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(span=span_name, chain=chain, le=bound)} {cumulative}")
+                labels = _labels(span=span_name, chain=chain)
+                lines.append(f"{name}_sum{labels} {self._duration_sums[(span_name, chain)]}")
+                lines.append(f"{name}_count{labels} {cumulative}")
+
+            name = f"{self.namespace}_span_errors_total"
+            lines += [f"# HELP {name} Instrumented steps which raised.", f"# TYPE {name} counter"]
+            for (span_name, chain), count in sorted(self._errors.items()):
+                lines.append(f"{name}{_labels(span=span_name, chain=chain)} {count}")
+
+            name = f"{self.namespace}_rpc_calls_total"
+            lines += [f"# HELP {name} RPC calls per method, batched calls counting one each.", f"# TYPE {name} counter"]
+            for (chain, method), count in sorted(self._rpc_calls.items()):
+                lines.append(f"{name}{_labels(chain=chain, method=method)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        with open(path, "w") as file:
+            file.write(self.render())
+
+
+class OpenTelemetryExporter(Exporter):
+    """
+    Spans as OpenTelemetry spans, nested like the instrumented calls, and RPC calls on a
+    counter. Requires the `opentelemetry-api` package; the global tracer and meter
+    providers are used unless a tracer or meter is given.
+    """
+
+    def __init__(self, tracer=None, meter=None):
+        from opentelemetry import context, metrics, trace
+
+        self._context = context
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("any_tx_builder")
+        self.meter = meter or metrics.get_meter("any_tx_builder")
+        self._rpc_calls = self.meter.create_counter(
+            "any_tx_builder.rpc.calls", unit="{call}", description="RPC calls per method"
+        )
+
+    def span_started(self, span: Span) -> Any:
+        otel_span = self.tracer.start_span(span.name, attributes=span.attributes)
+        return otel_span, self._context.attach(self._trace.set_span_in_context(otel_span))
+
+    def span_ended(self, span: Span, token: Any):
+        otel_span, context_token = token
+        otel_span.set_attributes(span.attributes)
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, repr(span.error)))
+        otel_span.end()
+        self._context.detach(context_token)
+
+    def rpc_called(self, chain: str, method: str, calls: int):
+        self._rpc_calls.add(calls, {"chain": chain, "method": method})
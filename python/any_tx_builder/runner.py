@@ -0,0 +1,535 @@
+########################################################
+#
+# Job runner
+#
+# Streams operations from a JSONL file, one job per line:
+#   {"id": "1", "chain": "cosmos", "action": "delegate", "params": {...}, "mode": "broadcast"}
+# and writes one JSONL result per job, in completion order. Each chain has its own pool
+# of workers, jobs waiting for a chain being bounded by its queue. The results file is
+# also the checkpoint: with --resume, jobs whose id it already holds are skipped. A
+# "submitted" record with the transaction hash is written before each broadcast, jobs
+# interrupted after it are looked up by hash on resume instead of being sent again.
+#
+#   python -m any_tx_builder.runner jobs.jsonl -o results.jsonl --resume
+#
+########################################################
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, Set, TextIO, Union
+
+import attr
+from dotenv import load_dotenv
+
+from any_tx_builder.builder_base import TransactionResult, TxStatus
+from any_tx_builder.instrumentation import JsonLogFormatter, PrometheusExporter, add_exporter
+from any_tx_builder.tendermint.coin import Coin_
+from any_tx_builder.tendermint.messages import (
+    MsgBeginRedelegate_,
+    MsgDelegate_,
+    MsgSend_,
+    MsgUndelegate_,
+    MsgWithdrawDelegatorReward_,
+)
+from any_tx_builder.tendermint.registry import ChainRegistry
+from any_tx_builder.tendermint.transactions import CreateTxOptions
+
+BUILD_MODE = "build"
+SIGN_MODE = "sign"
+BROADCAST_MODE = "broadcast"
+MODES = (BUILD_MODE, SIGN_MODE, BROADCAST_MODE)
+
+DEFAULT_WORKERS = 8
+# Jobs queued per chain for each of its workers, beyond which reading the input waits
+QUEUE_DEPTH_PER_WORKER = 2
+
+EVM_CHAINS = ("polygon",)
+SOLANA_CHAINS = ("solana",)
+
+
+@attr.s(slots=True)
+class Job:
+    id: str = attr.ib()
+    chain: str = attr.ib()
+    action: str = attr.ib()
+    params: dict = attr.ib(factory=dict)
+    mode: str = attr.ib(default=BROADCAST_MODE)
+
+    @classmethod
+    def from_data(cls, data: dict, default_id: str) -> "Job":
+        mode = data.get("mode") or BROADCAST_MODE
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode}, expected one of {', '.join(MODES)}")
+        return cls(str(data.get("id") or default_id), data["chain"], data["action"], data.get("params") or {}, mode)
+
+
+@attr.s(slots=True)
+class JobResult:
+    id: str = attr.ib()
+    chain: Optional[str] = attr.ib()
+    action: Optional[str] = attr.ib()
+    success: bool = attr.ib()
+    result: Any = attr.ib(default=None)
+    error: Optional[str] = attr.ib(default=None)
+    # Broadcast about to be sent, the final result follows
+    submitted: bool = attr.ib(default=False)
+
+    def to_json(self) -> str:
+        data = {"id": self.id, "chain": self.chain, "action": self.action, "success": self.success}
+        if self.submitted:
+            data["submitted"] = True
+        if self.success:
+            data["result"] = self.result
+        else:
+            data["error"] = self.error
+        return json.dumps(data, default=str)
+
+
+#
+# Chain handlers, each executing the jobs of one chain family from worker threads.
+# `submit` is called with the transaction hash right before the broadcast, and
+# `status` resolves a job submitted by an interrupted run from its hash.
+#
+
+
+def _submitted_status(status: TransactionResult, submitted: dict) -> dict:
+    if status.status in (TxStatus.SUCCESS, TxStatus.PENDING):
+        return submitted
+    if status.status == TxStatus.NOT_FOUND:
+        raise RuntimeError(f"Transaction {status.tx_hash} was submitted before the interruption but is not found")
+    raise RuntimeError(f"Transaction {status.tx_hash} failed: {status.error}")
+
+
+class TendermintJobHandler:
+    """Cosmos SDK chains of the registry, signing with the TENDERMINT_PRIVATE_KEY mnemonic."""
+
+    def __init__(self, registry: ChainRegistry):
+        self.registry = registry
+        self._wallets = {}
+        self._signing_locks: Dict[Any, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.actions: Dict[str, Callable[[str, str, dict], list]] = {
+            "delegate": lambda chain, address, params: [
+                MsgDelegate_(address, params["validator_address"], self._coin(chain, params["amount"]))
+            ],
+            "undelegate": lambda chain, address, params: [
+                MsgUndelegate_(address, params["validator_address"], self._coin(chain, params["amount"]))
+            ],
+            "redelegate": lambda chain, address, params: [
+                MsgBeginRedelegate_(
+                    address,
+                    params["validator_src_address"],
+                    params["validator_dst_address"],
+                    self._coin(chain, params["amount"]),
+                )
+            ],
+            "withdraw_rewards": lambda chain, address, params: [
+                MsgWithdrawDelegatorReward_(address, params["validator_address"])
+            ],
+            "send": lambda chain, address, params: [
+                MsgSend_(address, params["to_address"], [self._coin(chain, params["amount"])])
+            ],
+        }
+
+    def _coin(self, chain: str, amount: Union[int, str]) -> Coin_:
+        # Bare amounts are in the chain's denom
+        if isinstance(amount, int) or str(amount).isdigit():
+            return Coin_(self.registry.config(chain).denom, int(amount))
+        return Coin_.from_str(amount)
+
+    def _wallet(self, chain: str, account: int, index: int):
+        key = (chain, account, index)
+        with self._lock:
+            if key not in self._wallets:
+                self._wallets[key] = self.registry.wallet_from_mnemonic(
+                    chain, os.environ["TENDERMINT_PRIVATE_KEY"], account, index
+                )
+                self._signing_locks[key] = threading.Lock()
+            return self._wallets[key], self._signing_locks[key]
+
+    def execute(self, job: Job, submit: Callable[[dict], None]) -> Any:
+        build_msgs = self.actions.get(job.action)
+        if build_msgs is None:
+            raise ValueError(f"Unknown Tendermint action {job.action}")
+        wallet, signing_lock = self._wallet(job.chain, job.params.get("account", 0), job.params.get("index", 0))
+        msgs = build_msgs(job.chain, wallet.key.acc_address, job.params)
+        # Simulations run concurrently, signatures and broadcasts in sequence order
+        tx = wallet.build_tx(CreateTxOptions(msgs=msgs, memo=job.params.get("memo")))
+        if job.mode == BUILD_MODE:
+            return tx.to_data()
+        with signing_lock:
+            signed_tx = wallet.sign_tx(tx)
+            # Signed only txs take their sequence too, they are meant to be broadcast elsewhere
+            if job.mode == SIGN_MODE:
+                return {"txhash": signed_tx.to_hash(), "tx_bytes": signed_tx.to_string_bytes()}
+            submit({"txhash": signed_tx.to_hash()})
+            result = wallet.broadcast(signed_tx)
+        tx_response = result.get("tx_response")
+        if not tx_response:
+            raise RuntimeError(f"Broadcast of {signed_tx.to_hash()} failed: {result.get('message') or result}")
+        if int(tx_response.get("code") or 0) != 0:
+            raise RuntimeError(f"Transaction {tx_response.get('txhash')} rejected: {tx_response.get('raw_log')}")
+        return {"txhash": tx_response.get("txhash")}
+
+    def status(self, job: Job, submitted: dict) -> Any:
+        wallet, _ = self._wallet(job.chain, job.params.get("account", 0), job.params.get("index", 0))
+        txhash = submitted["txhash"]
+        tx_response = wallet.client.get_tx(txhash)
+        if tx_response is None:
+            return _submitted_status(TransactionResult(TxStatus.NOT_FOUND, tx_hash=txhash), submitted)
+        if int(tx_response.get("code") or 0) != 0:
+            status = TransactionResult(TxStatus.FAILED, tx_response, txhash, tx_response.get("raw_log"))
+            return _submitted_status(status, submitted)
+        return submitted
+
+
+class EVMJobHandler:
+    """Polygon staking and contract calls, from the EVM_PRIVATE_KEY account."""
+
+    def __init__(self):
+        from any_tx_builder.evm.builder import PolygonStakingTransactionBuilder
+        from any_tx_builder.evm.connection import setup_web3_connection
+
+        self.builder = PolygonStakingTransactionBuilder(setup_web3_connection())
+        self.account = self.builder.w3.eth.account.from_key(os.environ["EVM_PRIVATE_KEY"])
+        # Builders read the pending nonce, transactions of the account go one at a time
+        self._nonce_lock = threading.Lock()
+        self.actions: Dict[str, Callable[[str, dict], dict]] = {
+            "contract_call": lambda address, params: self.builder.build_contract_transaction(
+                address,
+                params["contract_address"],
+                params["function_name"],
+                params.get("function_args") or [],
+                int(params.get("value") or 0),
+            ),
+            "approve": lambda address, params: self.builder.build_POL_allowance_transaction(
+                address, int(params["amount"])
+            ),
+            "stake": lambda address, params: self.builder.build_staking_transaction(
+                address, int(params["amount"]), params["validator_address"]
+            ),
+            "unstake": lambda address, params: self.builder.build_unstaking_transaction(
+                address, params["validator_address"], int(params["amount"])
+            ),
+            "restake": lambda address, params: self.builder.build_restaking_transaction(
+                address, params["validator_address"]
+            ),
+            "withdraw_rewards": lambda address, params: self.builder.build_withdraw_rewards_transaction(
+                address, params["validator_address"]
+            ),
+        }
+
+    def execute(self, job: Job, submit: Callable[[dict], None]) -> Any:
+        build = self.actions.get(job.action)
+        if build is None:
+            raise ValueError(f"Unknown EVM action {job.action}")
+        if job.mode == BUILD_MODE:
+            return build(self.account.address, job.params)
+        with self._nonce_lock:
+            signed_tx = self.builder.sign_transaction(build(self.account.address, job.params), self.account.key)
+            if job.mode == SIGN_MODE:
+                return {"tx_hash": signed_tx.hash.hex(), "raw_transaction": signed_tx.raw_transaction.hex()}
+            submit({"tx_hash": self.builder.w3.to_hex(signed_tx.hash)})
+            return {"tx_hash": self.builder.broadcast_transaction(signed_tx.raw_transaction)}
+
+    def status(self, job: Job, submitted: dict) -> Any:
+        return _submitted_status(self.builder.status_many([submitted["tx_hash"]])[0], submitted)
+
+
+class SolanaJobHandler:
+    """Solana staking and transfers, from the SOLANA_PRIVATE_KEY keypair."""
+
+    def __init__(self):
+        from solders.keypair import Keypair  # type: ignore
+
+        from any_tx_builder.sol.builder import SolanaStakingTransactionBuilder, SolanaSwapper
+        from any_tx_builder.sol.connection import setup_solana_connection
+
+        client = setup_solana_connection()
+        self.staking = SolanaStakingTransactionBuilder(client)
+        self.swapper = SolanaSwapper(client)
+        self.private_key = os.environ["SOLANA_PRIVATE_KEY"]
+        self.address = str(Keypair.from_base58_string(self.private_key).pubkey())
+        # Each action builds a transaction and, for new stake accounts, its extra signer
+        self.actions: Dict[str, Callable[[dict], tuple]] = {
+            "stake": lambda params: self.staking.build_staking_transaction(
+                self.address, params["validator_address"], float(params["amount"])
+            ),
+            "deactivate": lambda params: (
+                self.staking.build_deactivate_transaction(self.address, params["stake_account"]),
+                None,
+            ),
+            "withdraw": lambda params: (
+                self.staking.build_withdraw_transaction(
+                    self.address, params["stake_account"], float(params["amount"]), params.get("to_address")
+                ),
+                None,
+            ),
+            "transfer_sol": lambda params: (
+                self.swapper.transfer_sol(self.address, params["to_address"], float(params["amount"])),
+                None,
+            ),
+        }
+
+    def execute(self, job: Job, submit: Callable[[dict], None]) -> Any:
+        build = self.actions.get(job.action)
+        if build is None:
+            raise ValueError(f"Unknown Solana action {job.action}")
+        transaction, additional_signer = build(job.params)
+        if job.mode == BUILD_MODE:
+            return {"message": base64.b64encode(bytes(transaction.to_solders().message)).decode()}
+        signed_tx = self.staking.sign_transaction(transaction, self.private_key, additional_signer).to_solders()
+        if job.mode == SIGN_MODE:
+            return {
+                "signature": str(signed_tx.signatures[0]),
+                "transaction": base64.b64encode(bytes(signed_tx)).decode(),
+            }
+        submit({"signature": str(signed_tx.signatures[0])})
+        return {"signature": str(self.staking.broadcast_transaction(signed_tx).value)}
+
+    def status(self, job: Job, submitted: dict) -> Any:
+        return _submitted_status(self.staking.status_many([submitted["signature"]])[0], submitted)
+
+
+#
+# Runner
+#
+
+
+def read_jobs(file: TextIO) -> Iterator[Union[Job, JobResult]]:
+    """Jobs of a JSONL stream, malformed lines coming out as failed results."""
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            yield Job.from_data(data, default_id=str(line_number))
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            yield JobResult(str(line_number), None, None, False, error=f"Invalid job: {error!r}")
+
+
+def _read_results(path: str) -> Iterator[dict]:
+    if not os.path.exists(path):
+        return
+    with open(path) as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Line cut short by an interrupted run
+                continue
+
+
+def read_checkpoint(path: str, retry_errors: bool = False) -> Set[str]:
+    """Ids of the jobs already in a results file, only the successful ones with `retry_errors`."""
+    done = set()
+    for result in _read_results(path):
+        if not result.get("submitted") and (result.get("success") or not retry_errors):
+            done.add(str(result["id"]))
+    return done
+
+
+def read_submitted(path: str) -> Dict[str, dict]:
+    """Submitted results of the jobs of a results file which have no final result, by id."""
+    submitted = {}
+    for result in _read_results(path):
+        if result.get("submitted"):
+            submitted[str(result["id"])] = result["result"]
+        else:
+            submitted.pop(str(result["id"]), None)
+    return submitted
+
+
+class _ChainPool:
+    __slots__ = ("queue", "executor", "workers")
+
+    def __init__(self, workers: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=workers * QUEUE_DEPTH_PER_WORKER)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.workers = []
+
+
+class JobRunner:
+    """
+    Dispatch jobs to per-chain worker pools and write their results as they complete.
+
+    Builders are synchronous, each worker runs its jobs on a thread of the chain's pool,
+    so a slow chain does not hold back the others beyond its queue.
+    """
+
+    def __init__(
+        self,
+        registry: ChainRegistry,
+        output: TextIO,
+        workers: Optional[Dict[str, int]] = None,
+        default_workers: int = DEFAULT_WORKERS,
+    ):
+        self.registry = registry
+        self.output = output
+        self.workers = workers or {}
+        self.default_workers = default_workers
+        self.counts = {"success": 0, "failed": 0, "skipped": 0}
+        # Jobs submitted by an interrupted run, looked up by hash instead of sent again
+        self.submitted: Dict[str, dict] = {}
+        self._pools: Dict[str, _ChainPool] = {}
+        # Submitted records are written from the worker threads
+        self._output_lock = threading.Lock()
+        self._handlers: Dict[str, Any] = {}
+        self._handlers_lock = threading.Lock()
+
+    def _family(self, chain: str) -> Optional[str]:
+        if chain in EVM_CHAINS:
+            return "evm"
+        if chain in SOLANA_CHAINS:
+            return "solana"
+        return "tendermint" if chain in self.registry else None
+
+    def _handler(self, family: str):
+        # Created on the first job of their family, from a worker thread
+        with self._handlers_lock:
+            if family not in self._handlers:
+                if family == "evm":
+                    self._handlers[family] = EVMJobHandler()
+                elif family == "solana":
+                    self._handlers[family] = SolanaJobHandler()
+                else:
+                    self._handlers[family] = TendermintJobHandler(self.registry)
+            return self._handlers[family]
+
+    def _execute(self, job: Job) -> JobResult:
+        submitted = self.submitted.get(job.id)
+        if submitted is not None:
+            # The family is recorded with the hash, so that a chain removed since the
+            # interruption still gets its transaction checked
+            submitted = dict(submitted)
+            family = submitted.pop("family", None) or self._family(job.chain)
+        else:
+            family = self._family(job.chain)
+        if family is None:
+            return JobResult(job.id, job.chain, job.action, False, error=f"Unknown chain {job.chain}")
+
+        def submit(result: dict):
+            self._write(
+                JobResult(job.id, job.chain, job.action, True, result={**result, "family": family}, submitted=True)
+            )
+
+        try:
+            handler = self._handler(family)
+            if submitted is not None:
+                return JobResult(job.id, job.chain, job.action, True, result=handler.status(job, submitted))
+            return JobResult(job.id, job.chain, job.action, True, result=handler.execute(job, submit))
+        except Exception as error:
+            return JobResult(job.id, job.chain, job.action, False, error=repr(error))
+
+    def _write(self, result: JobResult):
+        with self._output_lock:
+            if not result.submitted:
+                self.counts["success" if result.success else "failed"] += 1
+            self.output.write(result.to_json() + "\n")
+            # Flushed per result, the file is the checkpoint of an interrupted run
+            self.output.flush()
+
+    async def _worker(self, pool: _ChainPool):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await pool.queue.get()
+            if job is None:
+                return
+            self._write(await loop.run_in_executor(pool.executor, self._execute, job))
+
+    def _pool(self, chain: str) -> _ChainPool:
+        pool = self._pools.get(chain)
+        if pool is None:
+            workers = self.workers.get(chain, self.default_workers)
+            pool = self._pools[chain] = _ChainPool(workers)
+            pool.workers = [asyncio.create_task(self._worker(pool)) for _ in range(workers)]
+        return pool
+
+    async def run(
+        self,
+        jobs: Iterator[Union[Job, JobResult]],
+        done: Set[str] = frozenset(),
+        submitted: Optional[Dict[str, dict]] = None,
+    ) -> Dict[str, int]:
+        self.submitted = submitted or {}
+        try:
+            for job in jobs:
+                if job.id in done:
+                    self.counts["skipped"] += 1
+                elif isinstance(job, JobResult):
+                    self._write(job)
+                else:
+                    await self._pool(job.chain).queue.put(job)
+            for pool in self._pools.values():
+                for _ in pool.workers:
+                    await pool.queue.put(None)
+            await asyncio.gather(*(worker for pool in self._pools.values() for worker in pool.workers))
+        finally:
+            for pool in self._pools.values():
+                for worker in pool.workers:
+                    worker.cancel()
+                pool.executor.shutdown(wait=False, cancel_futures=True)
+            await self.registry.close()
+        return self.counts
+
+
+def _parse_workers(values) -> Dict[str, int]:
+    workers = {}
+    for value in values or []:
+        chain, _, count = value.partition("=")
+        workers[chain] = int(count)
+    return workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run transaction jobs from a JSONL file")
+    parser.add_argument("jobs", help="JSONL jobs file, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL results file, - for stdout")
+    parser.add_argument("--chains", help="Tendermint chain registry file, see examples/tendermint_chains.json")
+    parser.add_argument("--workers", action="append", metavar="CHAIN=N", help="Workers of a chain, repeatable")
+    parser.add_argument("--default-workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--resume", action="store_true", help="Skip the jobs already in the output file")
+    parser.add_argument("--retry-errors", action="store_true", help="With --resume, run failed jobs again")
+    parser.add_argument("--log-json", action="store_true", help="Log events as JSON lines")
+    parser.add_argument("--metrics", metavar="FILE", help="Write span durations and RPC counts in Prometheus format")
+    args = parser.parse_args(argv)
+
+    # Builders log their progress to stderr, kept out of the results stream
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonLogFormatter() if args.log_json else logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
+    metrics = add_exporter(PrometheusExporter()) if args.metrics else None
+
+    load_dotenv()
+    if args.resume and args.output == "-":
+        parser.error("--resume needs an output file")
+    done = read_checkpoint(args.output, args.retry_errors) if args.resume else set()
+    submitted = read_submitted(args.output) if args.resume else {}
+    registry = ChainRegistry.from_file(args.chains) if args.chains else ChainRegistry.default()
+
+    jobs_file = sys.stdin if args.jobs == "-" else open(args.jobs)
+    output = sys.stdout if args.output == "-" else open(args.output, "a" if args.resume else "w")
+    try:
+        runner = JobRunner(registry, output, _parse_workers(args.workers), args.default_workers)
+        counts = asyncio.run(runner.run(read_jobs(jobs_file), done, submitted))
+    finally:
+        if jobs_file is not sys.stdin:
+            jobs_file.close()
+        if output is not sys.stdout:
+            output.close()
+        if metrics is not None:
+            metrics.write(args.metrics)
+    print(
+        f"✅ {counts['success']} succeeded, ❌ {counts['failed']} failed, ⏭️ {counts['skipped']} skipped",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,4 @@
 from .builder import SolanaTransactionBuilder
-from .connection import setup_solana_connection
\ No newline at end of file
+from .async_builder import AsyncSolanaTransactionBuilder, SignatureConfirmationTracker
+from .connection import setup_solana_connection, setup_async_solana_connection
+from .nonce import NonceManager
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment, Confirmed
+from solana.rpc.core import RPCException
+from solana.rpc.types import TxOpts
+from solana.transaction import Transaction
+from solders.commitment_config import CommitmentConfig, CommitmentLevel # type: ignore
+from solders.hash import Hash # type: ignore
+from solders.pubkey import Pubkey # type: ignore
+from solders.signature import Signature # type: ignore
+from solders.transaction import Transaction as SoldersTransaction, VersionedTransaction # type: ignore
+from solders.transaction_status import TransactionStatus # type: ignore
+
+from any_tx_builder.sol.builder import PROGRAM_IDLS, SolanaTransactionBuilder
+from any_tx_builder.sol.config import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_RESEND_INTERVAL,
+    MAX_KNOWN_BLOCKHASHES,
+    MAX_SIGNATURE_STATUSES,
+)
+from any_tx_builder.sol.idl import ProgramIdl, decode_idl_account, idl_address
+from any_tx_builder.instrumentation import SOLANA, count_rpc, log_event, span
+
+logger = logging.getLogger(__name__)
+
+AnyTransaction = Union[Transaction, SoldersTransaction, VersionedTransaction]
+
+COMMITMENT_CONFIGS = {
+    "processed": CommitmentConfig(CommitmentLevel.Processed),
+    "confirmed": CommitmentConfig(CommitmentLevel.Confirmed),
+    "finalized": CommitmentConfig(CommitmentLevel.Finalized),
+}
+
+# We re-send pending transactions ourselves, so the RPC node must not retry them
+PIPELINED_TX_OPTS = TxOpts(skip_confirmation=True, skip_preflight=True, max_retries=0)
+
+
+def serialize_transaction(transaction: AnyTransaction) -> bytes:
+    if isinstance(transaction, Transaction):
+        return transaction.serialize()
+    return bytes(transaction)
+
+
+def transaction_blockhash(transaction: AnyTransaction) -> Optional[Hash]:
+    if isinstance(transaction, Transaction):
+        return transaction.recent_blockhash
+    return transaction.message.recent_blockhash
+
+
+class _PendingTransaction:
+    __slots__ = ("raw_transaction", "last_valid_block_height", "last_sent")
+
+    def __init__(self, raw_transaction: bytes, last_valid_block_height: int):
+        self.raw_transaction = raw_transaction
+        self.last_valid_block_height = last_valid_block_height
+        self.last_sent = time.monotonic()
+
+
+class SignatureConfirmationTracker:
+    """
+    Track many signatures with one getSignatureStatuses call per 256 signatures.
+
+    Pending transactions are re-sent every `resend_interval` seconds until they land
+    or until the block height passes their blockhash's last valid block height.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        commitment: Commitment = Confirmed,
+        tx_opts: TxOpts = PIPELINED_TX_OPTS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        resend_interval: float = DEFAULT_RESEND_INTERVAL,
+    ):
+        self.client = client
+        self.commitment = commitment
+        self.tx_opts = tx_opts
+        self.poll_interval = poll_interval
+        self.resend_interval = resend_interval
+        self._commitment_config = COMMITMENT_CONFIGS[commitment]
+        self._pending: Dict[Signature, _PendingTransaction] = {}
+        # None means the transaction expired without landing
+        self._results: Dict[Signature, Optional[TransactionStatus]] = {}
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def track(self, signature: Signature, raw_transaction: bytes, last_valid_block_height: int):
+        self._pending[signature] = _PendingTransaction(raw_transaction, last_valid_block_height)
+
+    async def _poll_statuses(self):
+        signatures = list(self._pending)
+        chunks = [signatures[i:i + MAX_SIGNATURE_STATUSES] for i in range(0, len(signatures), MAX_SIGNATURE_STATUSES)]
+        count_rpc(SOLANA, 'getSignatureStatuses', len(chunks))
+        responses = await asyncio.gather(*(self.client.get_signature_statuses(chunk) for chunk in chunks))
+        for chunk, response in zip(chunks, responses):
+            for signature, status in zip(chunk, response.value):
+                if status is None:
+                    continue
+                # A failed transaction has landed too, there is nothing left to wait for
+                if status.err is not None or status.satisfies_commitment(self._commitment_config):
+                    self._pending.pop(signature, None)
+                    self._results[signature] = status
+
+    async def _resend(self, raw_transaction: bytes):
+        try:
+            count_rpc(SOLANA, 'sendTransaction')
+            await self.client.send_raw_transaction(raw_transaction, self.tx_opts)
+        except RPCException:
+            # Typically "already processed": the next status poll will pick it up
+            pass
+
+    async def _expire_or_resend(self):
+        count_rpc(SOLANA, 'getBlockHeight')
+        block_height = (await self.client.get_block_height(self.commitment)).value
+        now = time.monotonic()
+        to_resend = []
+        for signature, pending in list(self._pending.items()):
+            if block_height > pending.last_valid_block_height:
+                del self._pending[signature]
+                self._results[signature] = None
+            elif now - pending.last_sent >= self.resend_interval:
+                pending.last_sent = now
+                to_resend.append(pending.raw_transaction)
+        await asyncio.gather(*(self._resend(raw) for raw in to_resend))
+
+    async def wait(self, signatures: Iterable[Signature]) -> Dict[Signature, Optional[TransactionStatus]]:
+        signatures = list(signatures)
+        while any(signature in self._pending for signature in signatures):
+            await self._poll_statuses()
+            if self._pending:
+                await self._expire_or_resend()
+            if any(signature in self._pending for signature in signatures):
+                await asyncio.sleep(self.poll_interval)
+        return {signature: self._results.pop(signature, None) for signature in signatures}
+
+
+class AsyncSolanaTransactionBuilder(SolanaTransactionBuilder):
+    """
+    SolanaTransactionBuilder on top of the AsyncClient.
+
+    Transactions are sent concurrently (at most `max_in_flight` requests at once)
+    and their confirmation is delegated to a SignatureConfirmationTracker.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        tx_opts: TxOpts = PIPELINED_TX_OPTS,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        commitment: Commitment = Confirmed,
+    ):
+        self.client = client
+        self.tx_opts = tx_opts
+        self.tracker = SignatureConfirmationTracker(client, commitment=commitment, tx_opts=tx_opts)
+        self.last_valid_block_height: Optional[int] = None
+        # Last valid block height of each fetched blockhash, oldest first
+        self._blockhash_heights: Dict[Hash, int] = {}
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def _get_recent_blockhash(self):
+        with span("blockhash_lookup", chain=SOLANA):
+            count_rpc(SOLANA, 'getLatestBlockhash')
+            latest_blockhash = await self.client.get_latest_blockhash()
+        self.last_valid_block_height = latest_blockhash.value.last_valid_block_height
+        self._blockhash_heights[latest_blockhash.value.blockhash] = self.last_valid_block_height
+        while len(self._blockhash_heights) > MAX_KNOWN_BLOCKHASHES:
+            del self._blockhash_heights[next(iter(self._blockhash_heights))]
+        return latest_blockhash
+
+    async def _get_last_valid_block_height(self, transaction: AnyTransaction) -> int:
+        """Expiry of the transaction's own blockhash."""
+        last_valid_block_height = self._blockhash_heights.get(transaction_blockhash(transaction))
+        if last_valid_block_height is not None:
+            return last_valid_block_height
+        # Blockhash not fetched by this builder, the latest expiry bounds its own
+        if self.last_valid_block_height is None:
+            await self._get_recent_blockhash()
+        return self.last_valid_block_height
+
+    async def _fetch_program_idl(self, program_id: Pubkey):
+        if program_id in PROGRAM_IDLS or os.path.exists(f"./idl/{program_id}.json"):
+            return
+        count_rpc(SOLANA, 'getAccountInfo')
+        idl_account = await self.client.get_account_info(idl_address(program_id))
+        if idl_account.value is None:
+            raise ValueError(f"No IDL found for program {program_id}")
+        PROGRAM_IDLS[program_id] = ProgramIdl(decode_idl_account(idl_account.value.data))
+
+    async def build_contract_transaction(self, from_address: str, program_id: Union[str, Pubkey], function_name: str, function_args: Union[list, dict], value: int = 0, accounts: Dict[str, Union[str, Pubkey]] = None) -> Transaction:
+        if isinstance(program_id, str):
+            program_id = Pubkey.from_string(program_id)
+        # The sync loader would call the AsyncClient, fetch the IDL here instead
+        await self._fetch_program_idl(program_id)
+        recent_blockhash = (await self._get_recent_blockhash()).value.blockhash
+        return super().build_contract_transaction(
+            from_address, program_id, function_name, function_args, value, recent_blockhash=recent_blockhash, accounts=accounts
+        )
+
+    async def broadcast_transaction(self, transaction: AnyTransaction, last_valid_block_height: int = None) -> Signature:
+        with span("serialization", chain=SOLANA):
+            raw_transaction = serialize_transaction(transaction)
+        async with self._semaphore:
+            with span("broadcast", chain=SOLANA):
+                count_rpc(SOLANA, 'sendTransaction')
+                tx_sent = await self.client.send_raw_transaction(raw_transaction, self.tx_opts)
+        if last_valid_block_height is None:
+            last_valid_block_height = await self._get_last_valid_block_height(transaction)
+        self.tracker.track(tx_sent.value, raw_transaction, last_valid_block_height)
+        return tx_sent.value
+
+    async def broadcast_transactions(self, transactions: List[AnyTransaction], last_valid_block_height: int = None) -> List[Signature]:
+        signatures = await asyncio.gather(
+            *(self.broadcast_transaction(transaction, last_valid_block_height) for transaction in transactions)
+        )
+        log_event(logger, logging.INFO, "transactions_sent", chain=SOLANA, sent=len(signatures))
+        return signatures
+
+    async def confirm_transactions(self, signatures: Iterable[Signature]) -> Dict[Signature, Optional[TransactionStatus]]:
+        return await self.tracker.wait(signatures)
+
+    async def is_transaction_broadcasted(self, tx_signature: Union[str, Signature]) -> bool:
+        if isinstance(tx_signature, str):
+            tx_signature = Signature.from_string(tx_signature)
+        try:
+            count_rpc(SOLANA, 'getSignatureStatuses')
+            tx_status = await self.client.get_signature_statuses([tx_signature], search_transaction_history=True)
+            return tx_status.value[0] is not None
+        except Exception as e:
+            log_event(
+                logger, logging.WARNING, "status_lookup_failed", chain=SOLANA, tx_hash=tx_signature, error=repr(e)
+            )
+            return False
@@ -1,36 +1,134 @@
 from solana.rpc.api import Client
-from solana.transaction import Transaction
 from solana.constants import SYSTEM_PROGRAM_ID
+from solana.transaction import NonceInformation, Transaction
+from solders.hash import Hash # type: ignore
 from solders.keypair import Keypair # type: ignore
 from solders.pubkey import Pubkey # type: ignore
+from solders.signature import Signature # type: ignore
 from solders.system_program import transfer, TransferParams
 from solders.instruction import Instruction, AccountMeta # type: ignore
 from solders.system_program import create_account, CreateAccountParams # type: ignore
+from solders.system_program import create_account_with_seed, CreateAccountWithSeedParams # type: ignore
+from solders.system_program import advance_nonce_account, AdvanceNonceAccountParams, create_nonce_account_with_seed # type: ignore
+from solders.message import Message # type: ignore
+from solders.rpc.requests import SendRawTransaction, batch_to_json # type: ignore
+from solders.transaction_status import TransactionConfirmationStatus # type: ignore
 from spl.token.constants import TOKEN_PROGRAM_ID
 from spl.token.instructions import transfer as spl_transfer, TransferParams as SplTransferParams, get_associated_token_address
+import httpx
+
+import json
+import logging
+import os
+import secrets
+from typing import Dict, List, Optional, Set, Tuple, Union
+from any_tx_builder.builder_base import BaseTransactionBuilder, TransactionResult, TxStatus
+from any_tx_builder.instrumentation import SOLANA, count_rpc, log_event, span
+from any_tx_builder.sol.config import (
+    MAX_BATCH_REQUESTS,
+    MAX_MULTIPLE_ACCOUNTS,
+    MAX_SEED_LENGTH,
+    MAX_SIGNATURE_STATUSES,
+    NONCE_ACCOUNT_SPACE,
+    PACKET_DATA_SIZE,
+    RPC_TIMEOUT,
+    STAKE_ACCOUNT_SPACE,
+    STAKE_PROGRAM_ID,
+)
+from any_tx_builder.sol.idl import ProgramIdl, decode_idl_account, idl_address
+from any_tx_builder.sol.nonce import NonceManager
+from any_tx_builder.sol.utils import (
+    build_initialize_stake_data,
+    deactivate_instruction,
+    delegate_stake_instruction,
+    initialize_stake_instruction,
+    merge_instruction,
+    split_instruction,
+    withdraw_instruction,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _transaction_size(instructions: List[Instruction], fee_payer: Pubkey, recent_blockhash: Hash) -> int:
+    message = Message.new_with_blockhash(instructions, fee_payer, recent_blockhash)
+    # compact-u16 signature count + one signature per required signer
+    return 1 + 64 * message.header.num_required_signatures + len(bytes(message))
+
+
+# Compiled IDLs, by program id
+PROGRAM_IDLS: Dict[Pubkey, ProgramIdl] = {}
+
+
+def _pack_account_creations(groups: List[Tuple[List[Instruction], Pubkey]], fee_payer: Pubkey, recent_blockhash: Hash) -> List[Tuple[Transaction, List[Pubkey]]]:
+    # Greedily pack (instructions, created account) groups into as few transactions as the packet size allows
+    batches: List[Tuple[List[Instruction], List[Pubkey]]] = []
+    instructions: List[Instruction] = []
+    accounts: List[Pubkey] = []
+    for group_instructions, account in groups:
+        if instructions and _transaction_size(instructions + group_instructions, fee_payer, recent_blockhash) > PACKET_DATA_SIZE:
+            batches.append((instructions, accounts))
+            instructions, accounts = [], []
+        instructions.extend(group_instructions)
+        accounts.append(account)
+    if instructions:
+        batches.append((instructions, accounts))
+    return [
+        (Transaction(recent_blockhash=recent_blockhash, fee_payer=fee_payer, instructions=instructions), accounts)
+        for instructions, accounts in batches
+    ]
 
-from typing import Union
-from any_tx_builder.builder_base import BaseTransactionBuilder
-from any_tx_builder.sol.utils import INSTRUCTIONS_LAYOUT, InstructionType, Authorized, Lockup
 
 class SolanaTransactionBuilder(BaseTransactionBuilder):
 
     LAMPORTS_PER_SOL = 1_000_000_000
 
-    def __init__(self, client: Client):
+    def __init__(self, client: Client, rpc_url: Optional[str] = None, http_client: Optional[httpx.Client] = None):
         self.client = client
+        # The client has no public batch API: with the url of its node, broadcast_many posts
+        # JSON-RPC batches itself, otherwise it sends the transactions one by one
+        self.rpc_url = rpc_url
+        self.http_client = http_client or (httpx.Client(timeout=RPC_TIMEOUT) if rpc_url else None)
 
     def _get_recent_blockhash(self):
         # Solana doesn't use gas, but we can get the recent blockhash
-        return self.client.get_latest_blockhash()
+        with span("blockhash_lookup", chain=SOLANA):
+            count_rpc(SOLANA, 'getLatestBlockhash')
+            return self.client.get_latest_blockhash()
     
-    def _encode_instruction_data(self, function_name: str, function_args: list) -> bytes:
-        # This is a simplified encoding. You might need to adjust based on your specific program's requirements
-        encoded_name = function_name.encode()
-        encoded_args = b''.join(str(arg).encode() for arg in function_args)
-        return encoded_name + b':' + encoded_args
-
-    def build_contract_transaction(self, from_address: str, program_id: Union[str, Pubkey], function_name: str, function_args: list, value: int = 0) -> Transaction:
+    def get_program_idl(self, program_id: Pubkey) -> ProgramIdl:
+        # IDLs are compiled once and shared by every builder
+        program_idl = PROGRAM_IDLS.get(program_id)
+        if program_idl is None:
+            program_idl = ProgramIdl(self._load_program_idl(program_id))
+            PROGRAM_IDLS[program_id] = program_idl
+        return program_idl
+
+    def _load_program_idl(self, program_id: Pubkey) -> dict:
+        local_file_path = f"./idl/{program_id}.json"
+        if os.path.exists(local_file_path):
+            with open(local_file_path, 'r') as file:
+                return json.load(file)
+        # If local file doesn't exist, fetch the IDL account published by Anchor
+        count_rpc(SOLANA, 'getAccountInfo')
+        idl_account = self.client.get_account_info(idl_address(program_id))
+        if idl_account.value is None:
+            raise ValueError(f"No IDL found for program {program_id}")
+        idl = decode_idl_account(idl_account.value.data)
+        # Save IDL to local file for future use
+        if not os.path.exists('./idl'):
+            os.makedirs('./idl')
+        with open(local_file_path, 'w') as file:
+            json.dump(idl, file)
+        return idl
+
+    def build_contract_transaction(self, from_address: str, program_id: Union[str, Pubkey], function_name: str, function_args: Union[list, dict], value: int = 0, recent_blockhash: Hash = None, accounts: Dict[str, Union[str, Pubkey]] = None) -> Transaction:
+        """
+        Build a call to an Anchor program instruction.
+
+        `function_args` are given in IDL order (or by name), `accounts` maps IDL account
+        names to addresses; missing signers default to `from_address`.
+        """
         # Convert addresses to Pubkey objects
         from_pubkey = Pubkey.from_string(from_address)
         if isinstance(program_id, str):
@@ -38,18 +136,20 @@ class SolanaTransactionBuilder(BaseTransactionBuilder):
         else:
             program_pubkey = program_id
 
-        recent_blockhash = self._get_recent_blockhash()
+        if recent_blockhash is None:
+            recent_blockhash = self._get_recent_blockhash().value.blockhash
 
         # Create transaction
         transaction = Transaction()
-        transaction.recent_blockhash = recent_blockhash.value.blockhash
+        transaction.recent_blockhash = recent_blockhash
+        transaction.fee_payer = from_pubkey
 
         # Create instruction data
-        instruction_data = self._encode_instruction_data(function_name, function_args)
+        idl_instruction = self.get_program_idl(program_pubkey).instruction(function_name)
         transaction.add(Instruction(
             program_id=program_pubkey,
-            accounts=[AccountMeta(pubkey=from_pubkey, is_signer=True, is_writable=True)],
-            data=instruction_data
+            accounts=idl_instruction.account_metas(accounts or {}, from_pubkey),
+            data=idl_instruction.encode(function_args)
         ))
 
         # If value is provided, add a transfer instruction
@@ -63,32 +163,213 @@ class SolanaTransactionBuilder(BaseTransactionBuilder):
 
         return transaction
 
+    def _existing_accounts(self, pubkeys: List[Pubkey]) -> Set[Pubkey]:
+        existing = set()
+        for i in range(0, len(pubkeys), MAX_MULTIPLE_ACCOUNTS):
+            chunk = pubkeys[i:i + MAX_MULTIPLE_ACCOUNTS]
+            count_rpc(SOLANA, 'getMultipleAccounts')
+            accounts = self.client.get_multiple_accounts(chunk).value
+            existing.update(pubkey for pubkey, account in zip(chunk, accounts) if account is not None)
+        return existing
+
+    def build_create_nonce_accounts_transactions(self, from_address: str, count: int, seed_prefix: str) -> List[Tuple[Transaction, List[Pubkey]]]:
+        """
+        Create `count` durable nonce accounts derived from the wallet and `seed_prefix`, the wallet being their authority.
+
+        Accounts left by an earlier call with the same `seed_prefix` are kept and not created again.
+        Returns the transactions along with the nonce accounts each of them creates.
+        """
+        wallet_pubkey = Pubkey.from_string(from_address)
+        seeds = {
+            Pubkey.create_with_seed(wallet_pubkey, seed, SYSTEM_PROGRAM_ID): seed
+            for seed in (f"{seed_prefix}{i}" for i in range(count))
+        }
+        existing = self._existing_accounts(list(seeds))
+        count_rpc(SOLANA, 'getMinimumBalanceForRentExemption')
+        rent_exempt_lamports = self.client.get_minimum_balance_for_rent_exemption(NONCE_ACCOUNT_SPACE).value
+        recent_blockhash = self._get_recent_blockhash().value.blockhash
+
+        groups = []
+        for nonce_pubkey, seed in seeds.items():
+            if nonce_pubkey in existing:
+                continue
+            nonce_instructions = list(create_nonce_account_with_seed(
+                wallet_pubkey, nonce_pubkey, wallet_pubkey, seed, wallet_pubkey, rent_exempt_lamports
+            ))
+            groups.append((nonce_instructions, nonce_pubkey))
+        transactions = _pack_account_creations(groups, wallet_pubkey, recent_blockhash)
+
+        log_event(
+            logger, logging.INFO, "creating_nonce_accounts", chain=SOLANA,
+            count=len(groups), existing=len(existing), transactions=len(transactions),
+        )
+        return transactions
+
+    def build_durable_transaction(self, from_address: str, instructions: List[Instruction], nonce_manager: NonceManager) -> tuple[Transaction, Pubkey]:
+        """
+        Build a transaction using a durable nonce instead of a recent blockhash, so it does not expire.
+
+        The wallet must be the nonce authority. The nonce account must be released to the
+        `nonce_manager` once the transaction has landed.
+        """
+        wallet_pubkey = Pubkey.from_string(from_address)
+        nonce_pubkey, nonce = nonce_manager.acquire()
+        advance_nonce_ix = advance_nonce_account(AdvanceNonceAccountParams(
+            nonce_pubkey=nonce_pubkey,
+            authorized_pubkey=wallet_pubkey,
+        ))
+        transaction = Transaction(
+            nonce_info=NonceInformation(nonce=nonce, nonce_instruction=advance_nonce_ix),
+            fee_payer=wallet_pubkey,
+            instructions=instructions,
+        )
+        return transaction, nonce_pubkey
+
+    def make_durable_transaction(self, from_address: str, transaction: Transaction, nonce_manager: NonceManager) -> tuple[Transaction, Pubkey]:
+        # Rebuild an already built transaction around a durable nonce
+        return self.build_durable_transaction(from_address, list(transaction.instructions), nonce_manager)
+
     def sign_transaction(self, transaction: Transaction, private_key: str, additional_signer: Keypair = None) -> Transaction:
-        keypair = Keypair.from_base58_string(private_key)
-        if additional_signer:
-            transaction.sign_partial(keypair)
-            transaction.sign_partial(additional_signer)
-        else:
-            transaction.sign(keypair)
+        with span("signing", chain=SOLANA):
+            keypair = Keypair.from_base58_string(private_key)
+            if additional_signer:
+                transaction.sign_partial(keypair)
+                transaction.sign_partial(additional_signer)
+            else:
+                transaction.sign(keypair)
         return transaction 
     
     def broadcast_transaction(self, transaction: Transaction) -> str:
-        tx_sent = self.client.send_transaction(transaction)
-        print(f"✅ Transaction sent: {tx_sent}")
+        with span("broadcast", chain=SOLANA):
+            count_rpc(SOLANA, 'sendTransaction')
+            tx_sent = self.client.send_transaction(transaction)
+        log_event(logger, logging.INFO, "transaction_sent", chain=SOLANA, tx_hash=tx_sent.value)
         return tx_sent
 
-    def is_transaction_broadcasted(self, tx_signature: str) -> bool:
+    def is_transaction_broadcasted(self, tx_signature: Union[str, Signature]) -> bool:
+        if isinstance(tx_signature, str):
+            tx_signature = Signature.from_string(tx_signature)
         try:
-            tx_status = self.client.get_transaction(tx_signature)
-            return tx_status is not None
+            # getSignatureStatuses is much lighter than fetching the whole transaction
+            count_rpc(SOLANA, 'getSignatureStatuses')
+            tx_status = self.client.get_signature_statuses([tx_signature], search_transaction_history=True)
+            return tx_status.value[0] is not None
         except Exception as e:
-            print(e)
+            log_event(
+                logger, logging.WARNING, "status_lookup_failed", chain=SOLANA, tx_hash=tx_signature, error=repr(e)
+            )
             return False
 
+    #
+    # Batches
+    #
+
+    def build_many(self, from_address: str, calls: List[dict]) -> List[TransactionResult]:
+        """Build program calls sharing a single recent blockhash, IDLs being loaded once per program."""
+        recent_blockhash = self._get_recent_blockhash().value.blockhash
+        results = []
+        for call in calls:
+            try:
+                transaction = self.build_contract_transaction(
+                    from_address, recent_blockhash=recent_blockhash, **call
+                )
+                results.append(TransactionResult(TxStatus.BUILT, transaction))
+            except Exception as e:
+                results.append(TransactionResult.failed(e))
+        return results
+
+    def sign_many(self, transactions: List[Transaction], private_key: str) -> List[TransactionResult]:
+        with span("signing", chain=SOLANA, transactions=len(transactions)):
+            keypair = Keypair.from_base58_string(private_key)
+            results = []
+            for transaction in transactions:
+                try:
+                    transaction.sign(keypair)
+                    results.append(TransactionResult(TxStatus.SIGNED, transaction, str(transaction.signature())))
+                except Exception as e:
+                    results.append(TransactionResult.failed(e, transaction))
+        return results
+
+    def _post_batch(self, serialized: List[Tuple[int, bytes]]) -> Dict[int, dict]:
+        # Request ids are the transactions' indexes
+        bodies = tuple(SendRawTransaction(tx_bytes, None, index) for index, tx_bytes in serialized)
+        response = self.http_client.post(
+            self.rpc_url, content=batch_to_json(bodies), headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+        # Parsed here, the solders parsers do not understand every error response of a batch
+        responses = response.json()
+        if isinstance(responses, list):
+            return {response.get("id"): response for response in responses}
+        # A batch rejected as a whole comes back as a single error response
+        return {index: responses for index, _ in serialized}
+
+    def _send_each(self, serialized: List[Tuple[int, bytes]]) -> Dict[int, dict]:
+        responses = {}
+        for index, tx_bytes in serialized:
+            try:
+                responses[index] = {"result": str(self.client.send_raw_transaction(tx_bytes).value)}
+            except Exception as e:
+                responses[index] = {"error": {"message": str(e)}}
+        return responses
+
+    def broadcast_many(self, transactions: List[Transaction]) -> List[TransactionResult]:
+        """
+        Send signed transactions in JSON-RPC batches of MAX_BATCH_REQUESTS, or one by one
+        when the builder has no rpc_url.
+        """
+        results: List[Optional[TransactionResult]] = [None] * len(transactions)
+        for start in range(0, len(transactions), MAX_BATCH_REQUESTS):
+            serialized = []
+            with span("serialization", chain=SOLANA):
+                for index in range(start, min(start + MAX_BATCH_REQUESTS, len(transactions))):
+                    try:
+                        serialized.append((index, transactions[index].serialize()))
+                    except Exception as e:
+                        results[index] = TransactionResult.failed(e, transactions[index])
+            if not serialized:
+                continue
+            with span("broadcast", chain=SOLANA, transactions=len(serialized)):
+                count_rpc(SOLANA, 'sendTransaction', len(serialized))
+                responses_by_id = self._post_batch(serialized) if self.rpc_url else self._send_each(serialized)
+            for index, _ in serialized:
+                transaction = transactions[index]
+                response = responses_by_id.get(index) or {"error": {"message": "No response"}}
+                error = response.get("error")
+                if error:
+                    message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+                    results[index] = TransactionResult(TxStatus.FAILED, transaction, error=message)
+                else:
+                    results[index] = TransactionResult(TxStatus.PENDING, transaction, response["result"])
+        sent = sum(result.ok for result in results)
+        log_event(logger, logging.INFO, "transactions_sent", chain=SOLANA, sent=sent, transactions=len(results))
+        return results
+
+    def status_many(self, tx_signatures: List[Union[str, Signature]]) -> List[TransactionResult]:
+        signatures = [
+            Signature.from_string(signature) if isinstance(signature, str) else signature
+            for signature in tx_signatures
+        ]
+        results = []
+        for start in range(0, len(signatures), MAX_SIGNATURE_STATUSES):
+            chunk = signatures[start:start + MAX_SIGNATURE_STATUSES]
+            count_rpc(SOLANA, 'getSignatureStatuses')
+            statuses = self.client.get_signature_statuses(chunk, search_transaction_history=True).value
+            for signature, status in zip(chunk, statuses):
+                if status is None:
+                    results.append(TransactionResult(TxStatus.NOT_FOUND, tx_hash=str(signature)))
+                elif status.err is not None:
+                    results.append(TransactionResult(TxStatus.FAILED, status, str(signature), str(status.err)))
+                elif status.confirmation_status == TransactionConfirmationStatus.Processed:
+                    results.append(TransactionResult(TxStatus.PENDING, status, str(signature)))
+                else:
+                    results.append(TransactionResult(TxStatus.SUCCESS, status, str(signature)))
+        return results
+
 class SolanaStakingTransactionBuilder(SolanaTransactionBuilder):
 
-    def __init__(self, client: Client):
-        self.client = client
+    def __init__(self, client: Client, rpc_url: Optional[str] = None, http_client: Optional[httpx.Client] = None):
+        super().__init__(client, rpc_url, http_client)
 
     def build_staking_transaction(self, from_address: str, validator_address: str, staking_amount: int) -> tuple[Transaction, Keypair]:
         # Generating pubkey for the stake account
@@ -108,47 +389,17 @@ class SolanaStakingTransactionBuilder(SolanaTransactionBuilder):
             from_pubkey=wallet_pubkey,
             to_pubkey=stake_account_pubkey,
             lamports=amount,
-            space=200,  # Stake account size
-            owner=Pubkey.from_string("Stake11111111111111111111111111111111111111")
+            space=STAKE_ACCOUNT_SPACE,
+            owner=STAKE_PROGRAM_ID
         ))
 
         # Initialize stake instruction
-
-        init_stake_ix = Instruction(
-            accounts=[
-                AccountMeta(pubkey=stake_account_pubkey, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=Pubkey.from_string("SysvarRent111111111111111111111111111111111"), is_signer=False, is_writable=False),
-            ],
-            program_id=Pubkey.from_string("Stake11111111111111111111111111111111111111"),
-            data=INSTRUCTIONS_LAYOUT.build(
-                dict(
-                    instruction_type=InstructionType.INITIALIZE,
-                    args=dict(
-                        authorized=Authorized(staker=wallet_pubkey, withdrawer=wallet_pubkey).as_bytes_dict(),
-                        lockup=Lockup(unix_timestamp=0, epoch=0, custodian=SYSTEM_PROGRAM_ID).as_bytes_dict(),
-                    ),
-                )
-            )
+        init_stake_ix = initialize_stake_instruction(
+            stake_account_pubkey, build_initialize_stake_data(wallet_pubkey, wallet_pubkey)
         )
 
         # Deposit stake instruction
-        deposit_stake_ix = Instruction(
-            accounts=[
-                AccountMeta(pubkey=stake_account_pubkey, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=validator_pubkey, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=Pubkey.from_string("SysvarC1ock11111111111111111111111111111111"), is_signer=False, is_writable=False),
-                AccountMeta(pubkey=Pubkey.from_string("SysvarStakeHistory1111111111111111111111111"), is_signer=False, is_writable=False),
-                AccountMeta(pubkey=Pubkey.from_string("StakeConfig11111111111111111111111111111111"), is_signer=False, is_writable=False),
-                AccountMeta(pubkey=wallet_pubkey, is_signer=True, is_writable=False),
-            ],
-            program_id=Pubkey.from_string("Stake11111111111111111111111111111111111111"),
-            data=INSTRUCTIONS_LAYOUT.build(
-                dict(
-                    instruction_type=InstructionType.DELEGATE_STAKE,
-                    args=None,
-                )
-            )
-        )
+        deposit_stake_ix = delegate_stake_instruction(stake_account_pubkey, validator_pubkey, wallet_pubkey)
 
         stake_account_transaction.add(create_account_ix)
         stake_account_transaction.add(init_stake_ix)
@@ -158,27 +409,145 @@ class SolanaStakingTransactionBuilder(SolanaTransactionBuilder):
         stake_account_transaction.recent_blockhash = latest_blockhash.value.blockhash
         stake_account_transaction.fee_payer = wallet_pubkey   
 
-        print(f"Staking {staking_amount} SOL to [{stake_account_pubkey}]")
+        log_event(
+            logger, logging.INFO, "staking", chain=SOLANA, amount=staking_amount, stake_account=stake_account_pubkey
+        )
         #payload = bytes(stake_account_transaction.message()).hex()
         return stake_account_transaction, stake_account_keypair
 
+    def build_batch_staking_transactions(self, from_address: str, delegations: List[Tuple[str, float]], seed_prefix: str = None) -> List[Tuple[Transaction, List[Pubkey]]]:
+        """
+        Delegate to many validators, packing as many stake accounts per transaction as fits.
+
+        Stake accounts are derived with `create_account_with_seed` from the wallet, so the
+        wallet is the only signer. `delegations` is a list of (validator vote address, SOL amount).
+        Returns the transactions along with the stake accounts each of them creates.
+        """
+        wallet_pubkey = Pubkey.from_string(from_address)
+        # Seeds must be unique per wallet, an already used one would fail the account creation
+        seed_prefix = seed_prefix or f"stake-{secrets.token_hex(4)}-"
+        longest_seed = f"{seed_prefix}{max(len(delegations) - 1, 0)}"
+        if len(longest_seed.encode()) > MAX_SEED_LENGTH:
+            raise ValueError(f"Seed {longest_seed} is longer than {MAX_SEED_LENGTH} bytes, use a shorter seed_prefix")
+        init_stake_data = build_initialize_stake_data(wallet_pubkey, wallet_pubkey)
+        recent_blockhash = self._get_recent_blockhash().value.blockhash
+
+        groups = []
+        for i, (validator_address, staking_amount) in enumerate(delegations):
+            seed = f"{seed_prefix}{i}"
+            stake_account_pubkey = Pubkey.create_with_seed(wallet_pubkey, seed, STAKE_PROGRAM_ID)
+            stake_instructions = [
+                create_account_with_seed(CreateAccountWithSeedParams(
+                    from_pubkey=wallet_pubkey,
+                    to_pubkey=stake_account_pubkey,
+                    base=wallet_pubkey,
+                    seed=seed,
+                    lamports=int(staking_amount * self.LAMPORTS_PER_SOL),
+                    space=STAKE_ACCOUNT_SPACE,
+                    owner=STAKE_PROGRAM_ID,
+                )),
+                initialize_stake_instruction(stake_account_pubkey, init_stake_data),
+                delegate_stake_instruction(stake_account_pubkey, Pubkey.from_string(validator_address), wallet_pubkey),
+            ]
+            groups.append((stake_instructions, stake_account_pubkey))
+        transactions = _pack_account_creations(groups, wallet_pubkey, recent_blockhash)
+
+        log_event(
+            logger, logging.INFO, "staking_batch", chain=SOLANA,
+            validators=len(delegations), transactions=len(transactions),
+        )
+        return transactions
+
+    def _build_stake_account_transaction(self, wallet_pubkey: Pubkey, instructions: List[Instruction]) -> Transaction:
+        return Transaction(
+            recent_blockhash=self._get_recent_blockhash().value.blockhash,
+            fee_payer=wallet_pubkey,
+            instructions=instructions,
+        )
+
+    def build_deactivate_transaction(self, from_address: str, stake_account: str) -> Transaction:
+        wallet_pubkey = Pubkey.from_string(from_address)
+        stake_account_pubkey = Pubkey.from_string(stake_account)
+        log_event(logger, logging.INFO, "deactivating", chain=SOLANA, stake_account=stake_account_pubkey)
+        return self._build_stake_account_transaction(
+            wallet_pubkey, [deactivate_instruction(stake_account_pubkey, wallet_pubkey)]
+        )
+
+    def build_withdraw_transaction(self, from_address: str, stake_account: str, amount: float, to_address: str = None) -> Transaction:
+        wallet_pubkey = Pubkey.from_string(from_address)
+        stake_account_pubkey = Pubkey.from_string(stake_account)
+        to_pubkey = Pubkey.from_string(to_address) if to_address else wallet_pubkey
+        lamports = int(amount * self.LAMPORTS_PER_SOL)
+        log_event(
+            logger, logging.INFO, "withdrawing", chain=SOLANA,
+            amount=amount, stake_account=stake_account_pubkey, to=to_pubkey,
+        )
+        return self._build_stake_account_transaction(
+            wallet_pubkey, [withdraw_instruction(stake_account_pubkey, to_pubkey, wallet_pubkey, lamports)]
+        )
+
+    def build_split_transaction(self, from_address: str, stake_account: str, amount: float, seed: str) -> tuple[Transaction, Pubkey]:
+        """
+        Split `amount` SOL out of `stake_account` into a new stake account derived from the wallet and `seed`.
+
+        The split destination has to be rent exempt, the wallet pays for it.
+        """
+        wallet_pubkey = Pubkey.from_string(from_address)
+        stake_account_pubkey = Pubkey.from_string(stake_account)
+        split_stake_pubkey = Pubkey.create_with_seed(wallet_pubkey, seed, STAKE_PROGRAM_ID)
+        count_rpc(SOLANA, 'getMinimumBalanceForRentExemption')
+        rent_exempt_lamports = self.client.get_minimum_balance_for_rent_exemption(STAKE_ACCOUNT_SPACE).value
+        lamports = int(amount * self.LAMPORTS_PER_SOL)
+
+        create_split_account_ix = create_account_with_seed(CreateAccountWithSeedParams(
+            from_pubkey=wallet_pubkey,
+            to_pubkey=split_stake_pubkey,
+            base=wallet_pubkey,
+            seed=seed,
+            lamports=rent_exempt_lamports,
+            space=STAKE_ACCOUNT_SPACE,
+            owner=STAKE_PROGRAM_ID,
+        ))
+        split_ix = split_instruction(stake_account_pubkey, split_stake_pubkey, wallet_pubkey, lamports)
+
+        log_event(
+            logger, logging.INFO, "splitting", chain=SOLANA,
+            amount=amount, stake_account=stake_account_pubkey, split_stake_account=split_stake_pubkey,
+        )
+        transaction = self._build_stake_account_transaction(wallet_pubkey, [create_split_account_ix, split_ix])
+        return transaction, split_stake_pubkey
+
+    def build_merge_transaction(self, from_address: str, destination_stake_account: str, source_stake_account: str) -> Transaction:
+        wallet_pubkey = Pubkey.from_string(from_address)
+        destination_pubkey = Pubkey.from_string(destination_stake_account)
+        source_pubkey = Pubkey.from_string(source_stake_account)
+        log_event(
+            logger, logging.INFO, "merging", chain=SOLANA, stake_account=source_pubkey, destination=destination_pubkey
+        )
+        return self._build_stake_account_transaction(
+            wallet_pubkey, [merge_instruction(destination_pubkey, source_pubkey, wallet_pubkey)]
+        )
+
 class SolanaSwapper(SolanaTransactionBuilder):
 
     RAYDIUM_AMM_PROGRAM_ID = Pubkey.from_string("675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8")
 
-    def __init__(self, client: Client):
-        self.client = client
+    def __init__(self, client: Client, rpc_url: Optional[str] = None, http_client: Optional[httpx.Client] = None):
+        super().__init__(client, rpc_url, http_client)
 
     def get_token_decimals(self, token_address: str) -> int:
         try:
             # Get the mint account info
+            count_rpc(SOLANA, 'getAccountInfo')
             mint_info = self.client.get_account_info(Pubkey.from_string(token_address))
             if mint_info.value is None:
                 raise ValueError(f"Token mint {token_address} not found")
             decimals = mint_info.value.data[44]
             return decimals
         except Exception as e:
-            print(f"Error getting token decimals: {e}")
+            log_event(
+                logger, logging.WARNING, "token_decimals_failed", chain=SOLANA, token=token_address, error=repr(e)
+            )
             raise
 
     def transfer_sol(self, from_address: str, to_address: str, amount_sol: float) -> Transaction:
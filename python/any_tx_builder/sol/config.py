@@ -0,0 +1,56 @@
+########################################################
+#
+# Solana Constants
+#
+########################################################
+from solders.pubkey import Pubkey # type: ignore
+
+#
+# Programs & Sysvars (parsed once at import)
+#
+
+STAKE_PROGRAM_ID = Pubkey.from_string("Stake11111111111111111111111111111111111111")
+STAKE_CONFIG_ID = Pubkey.from_string("StakeConfig11111111111111111111111111111111")
+SYSVAR_RENT_PUBKEY = Pubkey.from_string("SysvarRent111111111111111111111111111111111")
+SYSVAR_CLOCK_PUBKEY = Pubkey.from_string("SysvarC1ock11111111111111111111111111111111")
+SYSVAR_STAKE_HISTORY_PUBKEY = Pubkey.from_string("SysvarStakeHistory1111111111111111111111111")
+
+# Stake account size
+STAKE_ACCOUNT_SPACE = 200
+
+# Nonce account size
+NONCE_ACCOUNT_SPACE = 80
+
+# Maximum size of a serialized transaction
+PACKET_DATA_SIZE = 1232
+
+# Longest seed accepted by create_account_with_seed, in bytes
+MAX_SEED_LENGTH = 32
+
+# getMultipleAccounts accepts at most 100 accounts per request
+MAX_MULTIPLE_ACCOUNTS = 100
+
+#
+# Broadcast
+#
+
+# getSignatureStatuses accepts at most 256 signatures per request
+MAX_SIGNATURE_STATUSES = 256
+
+# JSON-RPC requests sent in one batch, public endpoints commonly reject larger batches
+MAX_BATCH_REQUESTS = 100
+
+# Seconds before a JSON-RPC batch posted by the builder times out, as for solana-py's Client
+RPC_TIMEOUT = 10.0
+
+# Default number of transactions in flight against a single RPC endpoint
+DEFAULT_MAX_IN_FLIGHT = 64
+
+# Seconds between two getSignatureStatuses polls of the confirmation tracker
+DEFAULT_POLL_INTERVAL = 0.5
+
+# Seconds before a pending transaction is re-sent to the RPC node
+DEFAULT_RESEND_INTERVAL = 2.0
+
+# Fetched blockhashes whose last valid block height is remembered, a blockhash expires after 150 blocks
+MAX_KNOWN_BLOCKHASHES = 512
@@ -1,6 +1,11 @@
 from solana.rpc.api import Client
+from solana.rpc.async_api import AsyncClient
 import os
 
 def setup_solana_connection():
     provider_url = os.getenv('SOLANA_PROVIDER_URL')
     return Client(provider_url)
+
+def setup_async_solana_connection():
+    provider_url = os.getenv('SOLANA_PROVIDER_URL')
+    return AsyncClient(provider_url)
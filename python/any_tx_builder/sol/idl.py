@@ -0,0 +1,294 @@
+import hashlib
+import json
+import re
+import struct
+import zlib
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+from solana.constants import SYSTEM_PROGRAM_ID
+from solders.instruction import AccountMeta # type: ignore
+from solders.pubkey import Pubkey # type: ignore
+from spl.token.constants import ASSOCIATED_TOKEN_PROGRAM_ID, TOKEN_PROGRAM_ID
+
+from any_tx_builder.sol.config import SYSVAR_CLOCK_PUBKEY, SYSVAR_RENT_PUBKEY
+
+IDL_SEED = "anchor:idl"
+
+# Accounts resolved without being passed explicitly
+WELL_KNOWN_ACCOUNTS = {
+    "system_program": SYSTEM_PROGRAM_ID,
+    "token_program": TOKEN_PROGRAM_ID,
+    "associated_token_program": ASSOCIATED_TOKEN_PROGRAM_ID,
+    "rent": SYSVAR_RENT_PUBKEY,
+    "clock": SYSVAR_CLOCK_PUBKEY,
+}
+
+_PRIMITIVE_FORMATS = {
+    "bool": "?",
+    "u8": "B",
+    "i8": "b",
+    "u16": "H",
+    "i16": "h",
+    "u32": "I",
+    "i32": "i",
+    "u64": "Q",
+    "i64": "q",
+    "f32": "f",
+    "f64": "d",
+}
+
+_U32 = struct.Struct("<I")
+
+Encoder = Callable[[Any], bytes]
+
+
+class _Fixed(NamedTuple):
+    """Fixed-size Borsh type, packed together with its neighbours in a single struct call."""
+    fmt: str
+    convert: Optional[Callable[[Any], Any]]
+
+
+def snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _pubkey_bytes(value: Union[str, Pubkey]) -> bytes:
+    return bytes(Pubkey.from_string(value) if isinstance(value, str) else value)
+
+
+def _int128(signed: bool) -> Encoder:
+    return lambda value: int(value).to_bytes(16, "little", signed=signed)
+
+
+def _string(value: str) -> bytes:
+    encoded = value.encode()
+    return _U32.pack(len(encoded)) + encoded
+
+
+def _bytes(value: bytes) -> bytes:
+    return _U32.pack(len(value)) + bytes(value)
+
+
+def _as_encoder(item: Union[_Fixed, Encoder]) -> Encoder:
+    if not isinstance(item, _Fixed):
+        return item
+    packer = struct.Struct("<" + item.fmt)
+    if item.convert is None:
+        return packer.pack
+    convert = item.convert
+    return lambda value: packer.pack(convert(value))
+
+
+def _type_name(defined: Union[str, dict]) -> str:
+    # Anchor >= 0.30 wraps defined types in {"name": ..., "generics": ...}
+    return defined["name"] if isinstance(defined, dict) else defined
+
+
+class IdlTypes:
+    """Compile IDL types into Borsh encoders, once per type."""
+
+    def __init__(self, type_defs: List[dict]):
+        self._type_defs = {type_def["name"]: type_def["type"] for type_def in type_defs if "type" in type_def}
+        self._defined: Dict[str, Encoder] = {}
+
+    def compile(self, idl_type: Union[str, dict]) -> Union[_Fixed, Encoder]:
+        if isinstance(idl_type, str):
+            if idl_type in _PRIMITIVE_FORMATS:
+                return _Fixed(_PRIMITIVE_FORMATS[idl_type], None)
+            if idl_type in ("publicKey", "pubkey"):
+                return _Fixed("32s", _pubkey_bytes)
+            if idl_type in ("u128", "i128"):
+                return _int128(idl_type == "i128")
+            if idl_type == "string":
+                return _string
+            if idl_type == "bytes":
+                return _bytes
+            raise ValueError(f"Unsupported IDL type: {idl_type}")
+        if "vec" in idl_type:
+            item_encoder = _as_encoder(self.compile(idl_type["vec"]))
+            return lambda values: _U32.pack(len(values)) + b"".join(item_encoder(value) for value in values)
+        if "option" in idl_type:
+            item_encoder = _as_encoder(self.compile(idl_type["option"]))
+            return lambda value: b"\x00" if value is None else b"\x01" + item_encoder(value)
+        if "coption" in idl_type:
+            # C-compatible option, its tag is a little endian u32
+            item_encoder = _as_encoder(self.compile(idl_type["coption"]))
+            return lambda value: b"\x00\x00\x00\x00" if value is None else b"\x01\x00\x00\x00" + item_encoder(value)
+        if "array" in idl_type:
+            item_type, length = idl_type["array"]
+            item = self.compile(item_type)
+            if isinstance(item, _Fixed) and item.convert is None:
+                packer = struct.Struct("<" + item.fmt * length)
+                return lambda values: packer.pack(*values)
+            item_encoder = _as_encoder(item)
+            return lambda values: b"".join(item_encoder(value) for value in values)
+        if "defined" in idl_type:
+            return self._compile_defined(_type_name(idl_type["defined"]))
+        raise ValueError(f"Unsupported IDL type: {idl_type}")
+
+    def _compile_defined(self, name: str) -> Encoder:
+        if name in self._defined:
+            return self._defined[name]
+        if name not in self._type_defs:
+            raise ValueError(f"IDL type {name} is not defined")
+        # Placeholder so that recursive types resolve to the final encoder
+        self._defined[name] = lambda value: self._defined[name](value)
+        type_def = self._type_defs[name]
+        if type_def["kind"] == "struct":
+            encoder = self._compile_struct(type_def.get("fields", []))
+        elif type_def["kind"] == "enum":
+            encoder = self._compile_enum(type_def["variants"])
+        else:
+            raise ValueError(f"Unsupported IDL type kind: {type_def['kind']}")
+        self._defined[name] = encoder
+        return encoder
+
+    def _compile_struct(self, fields: List[Union[dict, str]]) -> Encoder:
+        named = bool(fields) and isinstance(fields[0], dict) and "name" in fields[0]
+        encode_fields = self.compile_sequence([field["type"] if named else field for field in fields])
+        if not named:
+            return encode_fields
+        names = [field["name"] for field in fields]
+        return lambda value: encode_fields(
+            [value[field_name] for field_name in names] if isinstance(value, dict) else value
+        )
+
+    def _compile_enum(self, variants: List[dict]) -> Encoder:
+        variant_encoders = {}
+        for index, variant in enumerate(variants):
+            fields_encoder = self._compile_struct(variant["fields"]) if variant.get("fields") else None
+            variant_encoders[variant["name"]] = (bytes([index]), fields_encoder)
+
+        def encode(value):
+            # Unit variants are given by name, others as {name: fields}
+            if isinstance(value, str):
+                name, fields = value, None
+            else:
+                (name, fields), = value.items()
+            tag, fields_encoder = variant_encoders[name]
+            return tag if fields_encoder is None else tag + fields_encoder(fields)
+        return encode
+
+    def compile_sequence(self, idl_types: List[Union[str, dict]]) -> Callable[[List[Any]], bytes]:
+        """Encode a list of values, consecutive fixed-size values being packed by a single struct."""
+        segments: list = []
+        for index, item in enumerate(self.compile(idl_type) for idl_type in idl_types):
+            if isinstance(item, _Fixed):
+                if segments and isinstance(segments[-1], list):
+                    segments[-1].append((index, item))
+                else:
+                    segments.append([(index, item)])
+            else:
+                segments.append((index, item))
+
+        compiled = []
+        for segment in segments:
+            if isinstance(segment, list):
+                packer = struct.Struct("<" + "".join(item.fmt for _, item in segment))
+                compiled.append((packer.pack, [(index, item.convert) for index, item in segment]))
+            else:
+                compiled.append(segment)
+
+        def encode(values):
+            parts = []
+            for first, second in compiled:
+                if isinstance(second, list):
+                    args = [values[i] if convert is None else convert(values[i]) for i, convert in second]
+                    parts.append(first(*args))
+                else:
+                    parts.append(second(values[first]))
+            return b"".join(parts)
+        return encode
+
+
+class IdlAccount(NamedTuple):
+    name: str
+    is_signer: bool
+    is_writable: bool
+    address: Optional[Pubkey]
+
+
+def _flatten_accounts(accounts: List[dict]) -> List[IdlAccount]:
+    flat = []
+    for account in accounts:
+        # Nested account groups are flattened in order
+        if "accounts" in account:
+            flat.extend(_flatten_accounts(account["accounts"]))
+            continue
+        address = account.get("address")
+        flat.append(IdlAccount(
+            name=account["name"],
+            is_signer=account.get("isSigner", account.get("signer", False)),
+            is_writable=account.get("isMut", account.get("writable", False)),
+            address=Pubkey.from_string(address) if address else WELL_KNOWN_ACCOUNTS.get(snake_case(account["name"])),
+        ))
+    return flat
+
+
+class IdlInstruction:
+    def __init__(self, instruction: dict, types: IdlTypes):
+        self.name = instruction["name"]
+        if "discriminator" in instruction:
+            self.discriminator = bytes(instruction["discriminator"])
+        else:
+            self.discriminator = hashlib.sha256(f"global:{snake_case(self.name)}".encode()).digest()[:8]
+        self.arg_names = [arg["name"] for arg in instruction["args"]]
+        self.accounts = _flatten_accounts(instruction["accounts"])
+        self._encode_args = types.compile_sequence([arg["type"] for arg in instruction["args"]])
+
+    def encode(self, args: Union[list, dict]) -> bytes:
+        if isinstance(args, dict):
+            args = [args[name] for name in self.arg_names]
+        return self.discriminator + self._encode_args(args)
+
+    def account_metas(self, accounts: Dict[str, Union[str, Pubkey]], default_signer: Pubkey) -> List[AccountMeta]:
+        """
+        Resolve the instruction accounts in IDL order.
+
+        Accounts are looked up by IDL or snake_case name, then fall back on fixed/well-known
+        addresses, and signers default to `default_signer`.
+        """
+        metas = []
+        for account in self.accounts:
+            pubkey = accounts.get(account.name, accounts.get(snake_case(account.name)))
+            if pubkey is None:
+                pubkey = account.address
+            if pubkey is None and account.is_signer:
+                pubkey = default_signer
+            if pubkey is None:
+                raise ValueError(f"Missing account {account.name} for instruction {self.name}")
+            if isinstance(pubkey, str):
+                pubkey = Pubkey.from_string(pubkey)
+            metas.append(AccountMeta(pubkey=pubkey, is_signer=account.is_signer, is_writable=account.is_writable))
+        return metas
+
+
+class ProgramIdl:
+    """Anchor IDL whose instructions are compiled into encoders once, when loaded."""
+
+    def __init__(self, idl: dict):
+        self.idl = idl
+        types = IdlTypes(idl.get("types", []) + idl.get("accounts", []))
+        self.instructions: Dict[str, IdlInstruction] = {}
+        for instruction in idl["instructions"]:
+            compiled = IdlInstruction(instruction, types)
+            self.instructions[compiled.name] = compiled
+            self.instructions[snake_case(compiled.name)] = compiled
+
+    def instruction(self, name: str) -> IdlInstruction:
+        compiled = self.instructions.get(name) or self.instructions.get(snake_case(name))
+        if compiled is None:
+            raise ValueError(f"Instruction {name} not found in IDL")
+        return compiled
+
+
+def idl_address(program_id: Pubkey) -> Pubkey:
+    # Anchor stores the IDL in an account derived from the program's signer PDA
+    base, _ = Pubkey.find_program_address([], program_id)
+    return Pubkey.create_with_seed(base, IDL_SEED, program_id)
+
+
+def decode_idl_account(data: bytes) -> dict:
+    # 8 bytes discriminator, 32 bytes authority, then a length prefixed zlib compressed JSON
+    (length,) = _U32.unpack_from(data, 40)
+    return json.loads(zlib.decompress(data[44:44 + length]))
@@ -0,0 +1,64 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from solana.rpc.api import Client
+from solders.hash import Hash # type: ignore
+from solders.pubkey import Pubkey # type: ignore
+
+from any_tx_builder.sol.config import MAX_MULTIPLE_ACCOUNTS
+from any_tx_builder.sol.utils import NONCE_ACCOUNT_LAYOUT, NonceStateType
+
+
+class NonceManager:
+    """
+    Local cache of durable nonce values for a pool of nonce accounts.
+
+    A nonce account backs a single pending transaction at a time: `acquire` hands out a
+    free account with its current nonce, and `release` must be called once the
+    transaction has landed so the advanced nonce is fetched again before reuse.
+    """
+
+    def __init__(self, client: Client, nonce_accounts: List[Pubkey] = None):
+        self.client = client
+        # None means the cached nonce is stale and must be fetched again
+        self._nonces: Dict[Pubkey, Optional[Hash]] = {}
+        self._in_use: Set[Pubkey] = set()
+        for nonce_pubkey in nonce_accounts or []:
+            self.add(nonce_pubkey)
+
+    def add(self, nonce_pubkey: Pubkey):
+        self._nonces.setdefault(nonce_pubkey, None)
+
+    @property
+    def available_count(self) -> int:
+        return len(self._nonces) - len(self._in_use)
+
+    def refresh(self, nonce_pubkeys: List[Pubkey] = None):
+        """Fetch the current nonce of the given (default: all stale) accounts, 100 accounts per RPC call."""
+        if nonce_pubkeys is None:
+            nonce_pubkeys = [pubkey for pubkey, nonce in self._nonces.items() if nonce is None]
+        for i in range(0, len(nonce_pubkeys), MAX_MULTIPLE_ACCOUNTS):
+            chunk = nonce_pubkeys[i:i + MAX_MULTIPLE_ACCOUNTS]
+            accounts = self.client.get_multiple_accounts(chunk).value
+            for nonce_pubkey, account in zip(chunk, accounts):
+                if account is None:
+                    raise ValueError(f"Nonce account {nonce_pubkey} not found")
+                nonce_account = NONCE_ACCOUNT_LAYOUT.parse(account.data)
+                if nonce_account.state != NonceStateType.INITIALIZED:
+                    raise ValueError(f"Nonce account {nonce_pubkey} is not initialized")
+                self._nonces[nonce_pubkey] = Hash(nonce_account.nonce)
+
+    def acquire(self) -> Tuple[Pubkey, Hash]:
+        free = [pubkey for pubkey in self._nonces if pubkey not in self._in_use]
+        if not free:
+            raise ValueError("No nonce account available, release one or add more accounts")
+        if any(self._nonces[pubkey] is None for pubkey in free):
+            self.refresh()
+        nonce_pubkey = free[0]
+        self._in_use.add(nonce_pubkey)
+        return nonce_pubkey, self._nonces[nonce_pubkey]
+
+    def release(self, nonce_pubkey: Pubkey, used: bool = True):
+        """Give back a nonce account, `used` marks its nonce as advanced on-chain."""
+        self._in_use.discard(nonce_pubkey)
+        if used:
+            self._nonces[nonce_pubkey] = None
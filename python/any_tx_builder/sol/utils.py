@@ -1,9 +1,20 @@
-from construct import Switch  # type: ignore
-from construct import Int32ul, Pass, Int64ul  # type: ignore
-from construct import Bytes, Struct, Container
+import struct
+from construct import Switch, this  # type: ignore
+from construct import Int32ul, Pass, Int64ul, Int64sl, Flag  # type: ignore
+from construct import Bytes, Struct, Container, If, PascalString
 from enum import IntEnum
+from solana.constants import SYSTEM_PROGRAM_ID
+from solders.instruction import Instruction, AccountMeta # type: ignore
 from solders.pubkey import Pubkey # type: ignore
-from typing import NamedTuple, Dict
+from typing import NamedTuple, Dict, Optional
+
+from any_tx_builder.sol.config import (
+    STAKE_CONFIG_ID,
+    STAKE_PROGRAM_ID,
+    SYSVAR_CLOCK_PUBKEY,
+    SYSVAR_RENT_PUBKEY,
+    SYSVAR_STAKE_HISTORY_PUBKEY,
+)
 
 
 class Authorized(NamedTuple):
@@ -52,10 +63,33 @@ class InstructionType(IntEnum):
     AUTHORIZED_CHECKED = 10
     AUTHORIZED_CHECKED_WITH_SEED = 11
     SET_LOCKUP_CHECKED = 12
+    GET_MINIMUM_DELEGATION = 13
+    DEACTIVATE_DELINQUENT = 14
+    REDELEGATE = 15
+    MOVE_STAKE = 16
+    MOVE_LAMPORTS = 17
+
+
+class StakeAuthorize(IntEnum):
+    """Stake Authority Types."""
+
+    STAKER = 0
+    WITHDRAWER = 1
 
 
 PUBLIC_KEY_LAYOUT = Bytes(32)
 
+# Rust's String as serialized by bincode
+STRING_LAYOUT = PascalString(Int64ul, "utf8")
+
+
+def option_layout(layout):
+    # Rust's Option<T> as serialized by bincode
+    return Struct(
+        "is_some" / Flag,
+        "value" / If(this.is_some, layout),
+    )
+
 
 LOCKUP_LAYOUT = Struct(
     "unix_timestamp" / Int64ul,
@@ -79,6 +113,38 @@ AUTHORIZE_LAYOUT = Struct(
     "stake_authorize" / Int32ul,
 )
 
+LAMPORTS_LAYOUT = Struct(
+    "lamports" / Int64ul,
+)
+
+SET_LOCKUP_LAYOUT = Struct(
+    "unix_timestamp" / option_layout(Int64sl),
+    "epoch" / option_layout(Int64ul),
+    "custodian" / option_layout(PUBLIC_KEY_LAYOUT),
+)
+
+AUTHORIZE_WITH_SEED_LAYOUT = Struct(
+    "new_authority" / PUBLIC_KEY_LAYOUT,
+    "stake_authorize" / Int32ul,
+    "authority_seed" / STRING_LAYOUT,
+    "authority_owner" / PUBLIC_KEY_LAYOUT,
+)
+
+AUTHORIZE_CHECKED_LAYOUT = Struct(
+    "stake_authorize" / Int32ul,
+)
+
+AUTHORIZE_CHECKED_WITH_SEED_LAYOUT = Struct(
+    "stake_authorize" / Int32ul,
+    "authority_seed" / STRING_LAYOUT,
+    "authority_owner" / PUBLIC_KEY_LAYOUT,
+)
+
+SET_LOCKUP_CHECKED_LAYOUT = Struct(
+    "unix_timestamp" / option_layout(Int64sl),
+    "epoch" / option_layout(Int64ul),
+)
+
 
 INSTRUCTIONS_LAYOUT = Struct(
     "instruction_type" / Int32ul,
@@ -89,16 +155,218 @@ INSTRUCTIONS_LAYOUT = Struct(
             InstructionType.INITIALIZE: INITIALIZE_LAYOUT,
             InstructionType.AUTHORIZE: AUTHORIZE_LAYOUT,
             InstructionType.DELEGATE_STAKE: Pass,
-            InstructionType.SPLIT: Pass,
-            InstructionType.WITHDRAW: Pass,
+            InstructionType.SPLIT: LAMPORTS_LAYOUT,
+            InstructionType.WITHDRAW: LAMPORTS_LAYOUT,
             InstructionType.DEACTIVATE: Pass,
-            InstructionType.SET_LOCKUP: Pass,
+            InstructionType.SET_LOCKUP: SET_LOCKUP_LAYOUT,
             InstructionType.MERGE: Pass,
-            InstructionType.AUTHORIZE_WITH_SEED: Pass,
+            InstructionType.AUTHORIZE_WITH_SEED: AUTHORIZE_WITH_SEED_LAYOUT,
             InstructionType.INITIALIZE_CHECKED: Pass,
-            InstructionType.AUTHORIZED_CHECKED: Pass,
-            InstructionType.AUTHORIZED_CHECKED_WITH_SEED: Pass,
-            InstructionType.SET_LOCKUP_CHECKED: Pass,
+            InstructionType.AUTHORIZED_CHECKED: AUTHORIZE_CHECKED_LAYOUT,
+            InstructionType.AUTHORIZED_CHECKED_WITH_SEED: AUTHORIZE_CHECKED_WITH_SEED_LAYOUT,
+            InstructionType.SET_LOCKUP_CHECKED: SET_LOCKUP_CHECKED_LAYOUT,
+            InstructionType.GET_MINIMUM_DELEGATION: Pass,
+            InstructionType.DEACTIVATE_DELINQUENT: Pass,
+            InstructionType.REDELEGATE: Pass,
+            InstructionType.MOVE_STAKE: LAMPORTS_LAYOUT,
+            InstructionType.MOVE_LAMPORTS: LAMPORTS_LAYOUT,
         },
     ),
 )
+
+
+#
+# Nonce Accounts
+#
+
+class NonceStateType(IntEnum):
+    """Nonce Account States."""
+
+    UNINITIALIZED = 0
+    INITIALIZED = 1
+
+
+NONCE_ACCOUNT_LAYOUT = Struct(
+    "version" / Int32ul,
+    "state" / Int32ul,
+    "authority" / PUBLIC_KEY_LAYOUT,
+    "nonce" / PUBLIC_KEY_LAYOUT,
+    "lamports_per_signature" / Int64ul,
+)
+
+
+#
+# Fixed-layout encoders
+#
+# INSTRUCTIONS_LAYOUT walks the construct tree on every build, these produce the
+# same bytes with a single precompiled struct.pack call.
+#
+
+_TAG_STRUCT = struct.Struct("<I")
+_LAMPORTS_STRUCT = struct.Struct("<IQ")
+_INITIALIZE_STRUCT = struct.Struct("<I32s32sqQ32s")
+_AUTHORIZE_STRUCT = struct.Struct("<I32sI")
+_AUTHORIZE_CHECKED_STRUCT = struct.Struct("<II")
+
+DELEGATE_STAKE_DATA = _TAG_STRUCT.pack(InstructionType.DELEGATE_STAKE)
+DEACTIVATE_DATA = _TAG_STRUCT.pack(InstructionType.DEACTIVATE)
+MERGE_DATA = _TAG_STRUCT.pack(InstructionType.MERGE)
+INITIALIZE_CHECKED_DATA = _TAG_STRUCT.pack(InstructionType.INITIALIZE_CHECKED)
+DEACTIVATE_DELINQUENT_DATA = _TAG_STRUCT.pack(InstructionType.DEACTIVATE_DELINQUENT)
+
+
+def encode_initialize_data(authorized: Authorized, lockup: Lockup) -> bytes:
+    return _INITIALIZE_STRUCT.pack(
+        InstructionType.INITIALIZE,
+        bytes(authorized.staker),
+        bytes(authorized.withdrawer),
+        lockup.unix_timestamp,
+        lockup.epoch,
+        bytes(lockup.custodian),
+    )
+
+
+def encode_authorize_data(new_authority: Pubkey, stake_authorize: StakeAuthorize) -> bytes:
+    return _AUTHORIZE_STRUCT.pack(InstructionType.AUTHORIZE, bytes(new_authority), stake_authorize)
+
+
+def encode_authorize_checked_data(stake_authorize: StakeAuthorize) -> bytes:
+    return _AUTHORIZE_CHECKED_STRUCT.pack(InstructionType.AUTHORIZED_CHECKED, stake_authorize)
+
+
+def encode_lamports_data(instruction_type: InstructionType, lamports: int) -> bytes:
+    # Split, Withdraw, MoveStake and MoveLamports only carry an amount
+    return _LAMPORTS_STRUCT.pack(instruction_type, lamports)
+
+
+def _encode_option(fmt: str, value) -> bytes:
+    if value is None:
+        return b"\x00"
+    return b"\x01" + struct.pack(fmt, value)
+
+
+def encode_set_lockup_data(unix_timestamp: Optional[int] = None, epoch: Optional[int] = None, custodian: Optional[Pubkey] = None) -> bytes:
+    return (
+        _TAG_STRUCT.pack(InstructionType.SET_LOCKUP)
+        + _encode_option("<q", unix_timestamp)
+        + _encode_option("<Q", epoch)
+        + _encode_option("32s", bytes(custodian) if custodian is not None else None)
+    )
+
+
+def encode_set_lockup_checked_data(unix_timestamp: Optional[int] = None, epoch: Optional[int] = None) -> bytes:
+    return (
+        _TAG_STRUCT.pack(InstructionType.SET_LOCKUP_CHECKED)
+        + _encode_option("<q", unix_timestamp)
+        + _encode_option("<Q", epoch)
+    )
+
+
+#
+# Instructions
+#
+
+CLOCK_SYSVAR_META = AccountMeta(pubkey=SYSVAR_CLOCK_PUBKEY, is_signer=False, is_writable=False)
+STAKE_HISTORY_SYSVAR_META = AccountMeta(pubkey=SYSVAR_STAKE_HISTORY_PUBKEY, is_signer=False, is_writable=False)
+RENT_SYSVAR_META = AccountMeta(pubkey=SYSVAR_RENT_PUBKEY, is_signer=False, is_writable=False)
+
+DELEGATE_STAKE_SYSVAR_METAS = [
+    CLOCK_SYSVAR_META,
+    STAKE_HISTORY_SYSVAR_META,
+    AccountMeta(pubkey=STAKE_CONFIG_ID, is_signer=False, is_writable=False),
+]
+
+
+def build_initialize_stake_data(staker: Pubkey, withdrawer: Pubkey) -> bytes:
+    return encode_initialize_data(
+        Authorized(staker=staker, withdrawer=withdrawer),
+        Lockup(unix_timestamp=0, epoch=0, custodian=SYSTEM_PROGRAM_ID),
+    )
+
+
+def initialize_stake_instruction(stake_pubkey: Pubkey, data: bytes) -> Instruction:
+    return Instruction(
+        accounts=[
+            AccountMeta(pubkey=stake_pubkey, is_signer=False, is_writable=True),
+            RENT_SYSVAR_META,
+        ],
+        program_id=STAKE_PROGRAM_ID,
+        data=data,
+    )
+
+
+def delegate_stake_instruction(stake_pubkey: Pubkey, vote_pubkey: Pubkey, authority: Pubkey) -> Instruction:
+    return Instruction(
+        accounts=[
+            AccountMeta(pubkey=stake_pubkey, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=vote_pubkey, is_signer=False, is_writable=False),
+            *DELEGATE_STAKE_SYSVAR_METAS,
+            AccountMeta(pubkey=authority, is_signer=True, is_writable=False),
+        ],
+        program_id=STAKE_PROGRAM_ID,
+        data=DELEGATE_STAKE_DATA,
+    )
+
+
+def authorize_instruction(stake_pubkey: Pubkey, authority: Pubkey, new_authority: Pubkey, stake_authorize: StakeAuthorize) -> Instruction:
+    return Instruction(
+        accounts=[
+            AccountMeta(pubkey=stake_pubkey, is_signer=False, is_writable=True),
+            CLOCK_SYSVAR_META,
+            AccountMeta(pubkey=authority, is_signer=True, is_writable=False),
+        ],
+        program_id=STAKE_PROGRAM_ID,
+        data=encode_authorize_data(new_authority, stake_authorize),
+    )
+
+
+def split_instruction(stake_pubkey: Pubkey, split_stake_pubkey: Pubkey, authority: Pubkey, lamports: int) -> Instruction:
+    return Instruction(
+        accounts=[
+            AccountMeta(pubkey=stake_pubkey, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=split_stake_pubkey, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=authority, is_signer=True, is_writable=False),
+        ],
+        program_id=STAKE_PROGRAM_ID,
+        data=encode_lamports_data(InstructionType.SPLIT, lamports),
+    )
+
+
+def withdraw_instruction(stake_pubkey: Pubkey, to_pubkey: Pubkey, withdraw_authority: Pubkey, lamports: int) -> Instruction:
+    return Instruction(
+        accounts=[
+            AccountMeta(pubkey=stake_pubkey, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=to_pubkey, is_signer=False, is_writable=True),
+            CLOCK_SYSVAR_META,
+            STAKE_HISTORY_SYSVAR_META,
+            AccountMeta(pubkey=withdraw_authority, is_signer=True, is_writable=False),
+        ],
+        program_id=STAKE_PROGRAM_ID,
+        data=encode_lamports_data(InstructionType.WITHDRAW, lamports),
+    )
+
+
+def deactivate_instruction(stake_pubkey: Pubkey, authority: Pubkey) -> Instruction:
+    return Instruction(
+        accounts=[
+            AccountMeta(pubkey=stake_pubkey, is_signer=False, is_writable=True),
+            CLOCK_SYSVAR_META,
+            AccountMeta(pubkey=authority, is_signer=True, is_writable=False),
+        ],
+        program_id=STAKE_PROGRAM_ID,
+        data=DEACTIVATE_DATA,
+    )
+
+
+def merge_instruction(destination_pubkey: Pubkey, source_pubkey: Pubkey, authority: Pubkey) -> Instruction:
+    return Instruction(
+        accounts=[
+            AccountMeta(pubkey=destination_pubkey, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=source_pubkey, is_signer=False, is_writable=True),
+            CLOCK_SYSVAR_META,
+            STAKE_HISTORY_SYSVAR_META,
+            AccountMeta(pubkey=authority, is_signer=True, is_writable=False),
+        ],
+        program_id=STAKE_PROGRAM_ID,
+        data=MERGE_DATA,
+    )
@@ -0,0 +1,198 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import attr
+import httpx
+
+from any_tx_builder.instrumentation import TENDERMINT, count_rpc, span
+from any_tx_builder.tendermint.client import (
+    ACCOUNTS_ENDPOINT,
+    BLOCKS_ENDPOINT,
+    BROADCAST_ENDPOINT,
+    GRANTS_ENDPOINT,
+    SIMULATE_ENDPOINT,
+    TXS_ENDPOINT,
+    DEFAULT_ENDPOINT_LIMITS,
+    BaseTendermintClient,
+)
+from any_tx_builder.tendermint.gas import GasEstimateCache
+from any_tx_builder.tendermint.transactions import CreateTxOptions, SignerInfo_, Tx_
+from any_tx_builder.tendermint.transactions.fee import Fee_
+from any_tx_builder.tendermint.types import AccAddress
+
+# Page size of tx search queries
+TXS_PAGE_LIMIT = 100
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 64
+
+
+class LCDError(Exception):
+    def __init__(self, endpoint: str, status_code: int, message: str):
+        super().__init__(f"{endpoint} failed with status {status_code}: {message}")
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.message = message
+
+
+class AsyncTendermintClient(BaseTendermintClient):
+    """
+    Tendermint LCD client on a pooled httpx.AsyncClient, its queries being coroutines.
+
+    Connections are kept alive across calls, and the number of in-flight requests is
+    limited per endpoint so that many wallets can share one client. Pass `http_client`
+    to share a single pool between clients of several chains. Requests failing to reach
+    the node move on to the next of `fallback_urls`.
+    """
+
+    def __init__(
+        self,
+        lcd_url: str,
+        default_price: str,
+        denom: str,
+        chain_id: str = "cosmoshub-4",
+        gas_adjustment: float = 1.2,
+        gas_cache: Optional[GasEstimateCache] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        endpoint_limits: Optional[Dict[str, int]] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        fallback_urls: Sequence[str] = (),
+    ):
+        super().__init__(lcd_url, default_price, denom, chain_id, gas_adjustment, gas_cache)
+        self.lcd_urls = [lcd_url, *fallback_urls]
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        limits = {**DEFAULT_ENDPOINT_LIMITS, **(endpoint_limits or {})}
+        self._semaphores = {endpoint: asyncio.Semaphore(limit) for endpoint, limit in limits.items()}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    async def _request(self, endpoint: str, method: str, path: str, **kwargs) -> dict:
+        count_rpc(TENDERMINT, endpoint)
+        async with self._semaphores[endpoint]:
+            for attempt in range(len(self.lcd_urls)):
+                lcd_url = self.lcd_url
+                try:
+                    response = await self.http_client.request(method, f"{lcd_url}{path}", **kwargs)
+                    break
+                except httpx.TransportError:
+                    if attempt == len(self.lcd_urls) - 1:
+                        raise
+                    # Concurrent failures on the same endpoint rotate once
+                    if self.lcd_url == lcd_url:
+                        self.lcd_url = self.lcd_urls[(self.lcd_urls.index(lcd_url) + 1) % len(self.lcd_urls)]
+        try:
+            result = response.json()
+        except ValueError:
+            result = {}
+        if response.is_error:
+            raise LCDError(endpoint, response.status_code, result.get("message") or response.text)
+        return result
+
+    async def get_latest_height(self) -> int:
+        result = await self._request(BLOCKS_ENDPOINT, "GET", "/cosmos/base/tendermint/v1beta1/blocks/latest")
+        return int(result["block"]["header"]["height"])
+
+    async def get_txs_by_height(self, height: int) -> List[dict]:
+        """Responses of every transaction included at `height`."""
+        tx_responses = []
+        page = 1
+        while True:
+            result = await self._request(
+                TXS_ENDPOINT,
+                "GET",
+                "/cosmos/tx/v1beta1/txs",
+                # `events` before Cosmos SDK 0.50, `query` since
+                params={
+                    "events": f"tx.height={height}",
+                    "query": f"tx.height={height}",
+                    "page": page,
+                    "limit": TXS_PAGE_LIMIT,
+                },
+            )
+            page_responses = result.get("tx_responses") or []
+            tx_responses.extend(page_responses)
+            if len(page_responses) < TXS_PAGE_LIMIT:
+                return tx_responses
+            page += 1
+
+    async def get_tx(self, txhash: str) -> Optional[dict]:
+        """Response of an included transaction, None when it is unknown to the node."""
+        try:
+            result = await self._request(TXS_ENDPOINT, "GET", f"/cosmos/tx/v1beta1/txs/{txhash}")
+        except LCDError as error:
+            if error.status_code in (400, 404):
+                return None
+            raise
+        return result.get("tx_response")
+
+    async def get_account_info(self, acc_address: AccAddress) -> dict:
+        result = await self._request(ACCOUNTS_ENDPOINT, "GET", f"/cosmos/auth/v1beta1/accounts/{acc_address}")
+        return result.get("account")
+
+    async def get_accounts_info(self, acc_addresses: Iterable[AccAddress]) -> List[dict]:
+        return await asyncio.gather(*(self.get_account_info(acc_address) for acc_address in acc_addresses))
+
+    async def get_grants(self, granter: AccAddress, grantee: AccAddress) -> List[dict]:
+        try:
+            result = await self._request(
+                GRANTS_ENDPOINT,
+                "GET",
+                "/cosmos/authz/v1beta1/grants",
+                params={"granter": granter, "grantee": grantee},
+            )
+        except LCDError as error:
+            # Older nodes answer "authorization not found" instead of an empty list
+            if error.status_code in (400, 404):
+                return []
+            raise
+        return result.get("grants") or []
+
+    async def get_grants_many(self, granters: Iterable[AccAddress], grantee: AccAddress) -> List[List[dict]]:
+        return await asyncio.gather(*(self.get_grants(granter, grantee) for granter in granters))
+
+    async def simulate_gas_used(self, tx: Tx_) -> int:
+        with span("gas_simulation", chain=TENDERMINT):
+            result = await self._request(
+                SIMULATE_ENDPOINT, "POST", "/cosmos/tx/v1beta1/simulate", json={"tx_bytes": tx.to_string_bytes()}
+            )
+        return self._record_simulation(tx, result)
+
+    async def estimate_gas(self, tx: Tx_, options: Optional[CreateTxOptions]) -> int:
+        gas_adjustment = options.gas_adjustment if options else self.default_adjustment
+        return int(gas_adjustment * await self.simulate_gas_used(tx))
+
+    async def estimate_fee(self, signer_data: List[SignerInfo_], tx_options: CreateTxOptions) -> Fee_:
+        gas_prices = tx_options.gas_prices or self.default_price
+        gas_adjustment = tx_options.gas_adjustment or self.default_adjustment
+
+        gas = tx_options.gas
+        with span("fee_estimation", chain=TENDERMINT):
+            if gas is None or gas == "auto" or int(gas) == 0:
+                gas = self._cached_gas(tx_options, gas_adjustment)
+                if gas is None:
+                    gas = await self.estimate_gas(
+                        self._simulation_tx(signer_data, tx_options),
+                        attr.evolve(tx_options, gas_adjustment=gas_adjustment),
+                    )
+            return self._fee(gas, gas_prices)
+
+    async def _broadcast(self, tx: Tx_) -> dict:
+        with span("broadcast", chain=TENDERMINT):
+            return await self._request(
+                BROADCAST_ENDPOINT,
+                "POST",
+                "/cosmos/tx/v1beta1/txs",
+                json={"tx_bytes": tx.to_string_bytes(), "mode": "BROADCAST_MODE_SYNC"},
+            )
@@ -0,0 +1,184 @@
+########################################################
+#
+# Authz batching
+#
+# An operator holding authz grants from many delegators restakes on their behalf:
+# each delegator's withdraw + delegate pair is wrapped in a MsgExec signed by the
+# operator, and the MsgExecs are packed into as few transactions as gas allows.
+#
+########################################################
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import attr
+
+from any_tx_builder.tendermint.async_client import AsyncTendermintClient
+from any_tx_builder.tendermint.builder import DEFAULT_BATCH_MAX_GAS, DEFAULT_BATCH_MAX_TX_BYTES, Wallet
+from any_tx_builder.tendermint.coin import Coin_
+from any_tx_builder.tendermint.messages import (
+    BaseTendermintData,
+    MsgBeginRedelegate_,
+    MsgDelegate_,
+    MsgExec_,
+    MsgUndelegate_,
+    MsgWithdrawDelegatorReward_,
+)
+from any_tx_builder.tendermint.transactions import Tx_
+from any_tx_builder.tendermint.types import AccAddress, ValAddress
+
+GENERIC_AUTHORIZATION = "/cosmos.authz.v1beta1.GenericAuthorization"
+STAKE_AUTHORIZATION = "/cosmos.staking.v1beta1.StakeAuthorization"
+
+STAKE_AUTHORIZATION_TYPES = {
+    MsgDelegate_.type_url: "AUTHORIZATION_TYPE_DELEGATE",
+    MsgUndelegate_.type_url: "AUTHORIZATION_TYPE_UNDELEGATE",
+    MsgBeginRedelegate_.type_url: "AUTHORIZATION_TYPE_REDELEGATE",
+}
+
+
+def _int_coin(value) -> Coin_:
+    # Rewards are DecCoins, only their integer part can be delegated
+    return Coin_.parse(value).to_int_coin()
+
+
+@attr.s(frozen=True)
+class Restake:
+    """
+    Rewards of `granter` at `validator_address` withdrawn and delegated back, `amount` being
+    the rewards, rounded down. Rewards under one unit give no messages.
+    """
+
+    granter: AccAddress = attr.ib()
+    validator_address: ValAddress = attr.ib()
+    amount: Coin_ = attr.ib(converter=_int_coin)
+
+    def to_msgs(self) -> List[BaseTendermintData]:
+        if self.amount.amount <= 0:
+            return []
+        return [
+            MsgWithdrawDelegatorReward_(self.granter, self.validator_address),
+            MsgDelegate_(self.granter, self.validator_address, self.amount),
+        ]
+
+
+def _parse_time(value: str) -> datetime:
+    # RFC 3339 with up to nanoseconds, seconds are precise enough for expirations
+    return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+def _validator_of(msg: BaseTendermintData) -> Optional[ValAddress]:
+    if isinstance(msg, MsgBeginRedelegate_):
+        return msg.validator_dst_address
+    return getattr(msg, "validator_address", None)
+
+
+def grant_allows(grant: dict, msg: BaseTendermintData, now: Optional[datetime] = None, spent: int = 0) -> bool:
+    """
+    Whether an LCD grant entry authorizes the grantee to execute `msg`, `spent` being
+    the amount already used by earlier messages of the batch under the same grant.
+    """
+    expiration = grant.get("expiration")
+    if expiration and _parse_time(expiration) <= (now or datetime.now(timezone.utc)):
+        return False
+
+    authorization = grant.get("authorization") or {}
+    authorization_type = authorization.get("@type")
+    if authorization_type == GENERIC_AUTHORIZATION:
+        return authorization.get("msg") == msg.type_url
+    if authorization_type != STAKE_AUTHORIZATION:
+        return False
+
+    if authorization.get("authorization_type") != STAKE_AUTHORIZATION_TYPES.get(msg.type_url):
+        return False
+    validator = _validator_of(msg)
+    allow_list = (authorization.get("allow_list") or {}).get("address")
+    if allow_list and validator not in allow_list:
+        return False
+    deny_list = (authorization.get("deny_list") or {}).get("address")
+    if deny_list and validator in deny_list:
+        return False
+    max_tokens = authorization.get("max_tokens")
+    if max_tokens:
+        limit = Coin_.from_data(max_tokens)
+        # The chain lowers max_tokens with every executed message
+        if limit.denom != msg.amount.denom or limit.amount < spent + msg.amount.amount:
+            return False
+    return True
+
+
+class AuthzBatchBuilder:
+    """
+    Restakes of many granters, executed and signed by one grantee wallet.
+
+    Grants are checked with one query per granter, run concurrently on an
+    AsyncTendermintClient, so that a missing or expired grant drops its granter
+    instead of failing the simulation of a whole batch.
+    """
+
+    def __init__(self, wallet: Wallet, query_client: Optional[AsyncTendermintClient] = None):
+        self.wallet = wallet
+        self.query_client = query_client
+
+    @property
+    def grantee(self) -> AccAddress:
+        return self.wallet.key.acc_address
+
+    async def verify_grants(
+        self, restakes: List[Restake], now: Optional[datetime] = None
+    ) -> Tuple[List[Restake], List[Restake]]:
+        """Split restakes between those the grantee may execute and those it may not."""
+        if self.query_client is None:
+            raise ValueError("Grant verification requires a query_client")
+        granters = list(dict.fromkeys(restake.granter for restake in restakes))
+        grants: Dict[AccAddress, List[dict]] = dict(
+            zip(granters, await self.query_client.get_grants_many(granters, self.grantee))
+        )
+        now = now or datetime.now(timezone.utc)
+
+        # Amounts executed under each grant by the restakes allowed so far, a granter's
+        # restakes sharing one MsgExec
+        spent: Dict[int, int] = {}
+        allowed, denied = [], []
+        for restake in restakes:
+            restake_spent = dict(spent)
+            for msg in restake.to_msgs():
+                grant = next(
+                    (
+                        grant for grant in grants[restake.granter]
+                        if grant_allows(grant, msg, now, restake_spent.get(id(grant), 0))
+                    ),
+                    None,
+                )
+                if grant is None:
+                    denied.append(restake)
+                    break
+                amount = getattr(msg, "amount", None)
+                if amount is not None:
+                    restake_spent[id(grant)] = restake_spent.get(id(grant), 0) + amount.amount
+            else:
+                allowed.append(restake)
+                spent = restake_spent
+        return allowed, denied
+
+    def exec_msgs(self, restakes: List[Restake]) -> List[MsgExec_]:
+        # One MsgExec per granter, so that batches split between granters
+        msgs_by_granter: Dict[AccAddress, List[BaseTendermintData]] = {}
+        for restake in restakes:
+            msgs = restake.to_msgs()
+            if msgs:
+                msgs_by_granter.setdefault(restake.granter, []).extend(msgs)
+        return [MsgExec_(self.grantee, msgs) for msgs in msgs_by_granter.values()]
+
+    def build_txs(
+        self,
+        restakes: List[Restake],
+        memo: Optional[str] = None,
+        max_gas: int = DEFAULT_BATCH_MAX_GAS,
+        max_tx_bytes: int = DEFAULT_BATCH_MAX_TX_BYTES,
+        gas_prices: Optional[str] = None,
+        gas_adjustment: float = 0,
+    ) -> List[Tx_]:
+        """Unsigned transactions executing every restake, to be signed with the wallet's sign_txs."""
+        return self.wallet.build_batch_txs(
+            self.exec_msgs(restakes), memo, max_gas, max_tx_bytes, gas_prices, gas_adjustment
+        )
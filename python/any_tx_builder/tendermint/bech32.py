@@ -0,0 +1,100 @@
+########################################################
+#
+# Bech32 addresses (BIP173)
+#
+# Cosmos SDK addresses are the bech32 encoding of ripemd160(sha256(pubkey)),
+# with a chain specific human readable prefix.
+#
+########################################################
+import hashlib
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_CHARSET_INDEX = {char: index for index, char in enumerate(CHARSET)}
+_GENERATOR = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+
+# Cosmos SDK addresses are longer than the 90 characters limit of BIP173
+MAX_ADDRESS_LENGTH = 1023
+
+
+def _polymod(values) -> int:
+    checksum = 1
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            if (top >> i) & 1:
+                checksum ^= _GENERATOR[i]
+    return checksum
+
+
+def _hrp_expand(hrp: str) -> List[int]:
+    return [ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp]
+
+
+def convert_bits(data, from_bits: int, to_bits: int, pad: bool = True) -> List[int]:
+    acc, bits, result = 0, 0, []
+    max_value = (1 << to_bits) - 1
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            result.append((acc >> bits) & max_value)
+    if pad:
+        if bits:
+            result.append((acc << (to_bits - bits)) & max_value)
+    elif bits >= from_bits or (acc << (to_bits - bits)) & max_value:
+        raise ValueError("Invalid bech32 padding")
+    return result
+
+
+def bech32_encode(hrp: str, data: bytes) -> str:
+    words = convert_bits(data, 8, 5)
+    polymod = _polymod(_hrp_expand(hrp) + words + [0] * 6) ^ 1
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return hrp + "1" + "".join(CHARSET[word] for word in words + checksum)
+
+
+def bech32_decode(address: str) -> Tuple[str, bytes]:
+    """Split an address into its prefix and data, raising ValueError when it is not valid bech32."""
+    if len(address) > MAX_ADDRESS_LENGTH or (address.lower() != address and address.upper() != address):
+        raise ValueError(f"Invalid bech32 address: {address}")
+    address = address.lower()
+    separator = address.rfind("1")
+    if separator < 1 or separator + 7 > len(address):
+        raise ValueError(f"Invalid bech32 address: {address}")
+    hrp = address[:separator]
+    try:
+        words = [_CHARSET_INDEX[char] for char in address[separator + 1:]]
+    except KeyError:
+        raise ValueError(f"Invalid bech32 address: {address}") from None
+    if _polymod(_hrp_expand(hrp) + words) != 1:
+        raise ValueError(f"Invalid bech32 checksum: {address}")
+    return hrp, bytes(convert_bits(words[:-6], 5, 8, pad=False))
+
+
+@lru_cache(maxsize=65536)
+def is_valid_address(address: str, prefix: Optional[str] = None) -> bool:
+    try:
+        hrp, data = bech32_decode(address)
+    except ValueError:
+        return False
+    # 20 bytes for accounts, 32 for module and interchain accounts
+    return (prefix is None or hrp == prefix) and len(data) in (20, 32)
+
+
+def _ripemd160(data: bytes) -> bytes:
+    try:
+        return hashlib.new("ripemd160", data).digest()
+    except ValueError:
+        # OpenSSL 3 builds without the legacy provider
+        from Crypto.Hash import RIPEMD160
+        return RIPEMD160.new(data).digest()
+
+
+@lru_cache(maxsize=65536)
+def pubkey_to_address(public_key: bytes, prefix: str) -> str:
+    """Address of a compressed secp256k1 public key."""
+    return bech32_encode(prefix, _ripemd160(hashlib.sha256(public_key).digest()))
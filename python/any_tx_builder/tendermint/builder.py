@@ -1,21 +1,21 @@
 import base64
-import copy
 import hashlib
-from typing import List
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
 
 from ecdsa import SECP256k1, SigningKey
 from ecdsa.util import sigencode_string_canonize
-from bip32utils import BIP32_HARDEN, BIP32Key
-from mnemonic import Mnemonic
+from any_tx_builder.builder_base import BaseTransactionBuilder, TransactionResult, TxStatus
+from any_tx_builder.instrumentation import TENDERMINT, log_event, span
+from any_tx_builder.tendermint.bech32 import is_valid_address, pubkey_to_address
+from any_tx_builder.tendermint.canonical_json import encode_std_sign_doc
 from any_tx_builder.tendermint.client import TendermintClient
+from any_tx_builder.tendermint.derivation import derive_private_key
 from any_tx_builder.tendermint.key import PublicKey
-from any_tx_builder.tendermint.transactions.signature import (
-    Descriptor,
-    SignatureV2,
-    SignDoc_,
-    SignOptions,
-    Single,
-)
+from any_tx_builder.tendermint.messages import MESSAGE_TYPES, BaseTendermintData
+from any_tx_builder.tendermint.sequence import SEQUENCE_MISMATCH_CODE, SequenceManager
 from any_tx_builder.tendermint.transactions import (
     AuthInfo_,
     CreateTxOptions,
@@ -26,52 +26,117 @@ from any_tx_builder.tendermint.transactions import (
     TxBody_,
 )
 from any_tx_builder.tendermint.proto import SignMode
+from any_tx_builder.tendermint.proto.writer import encode_auth_info, encode_sign_doc
 from any_tx_builder.tendermint.types import AccAddress
 from any_tx_builder.tendermint.key import Account
 
+logger = logging.getLogger(__name__)
+
+# Signer infos never mutate their mode info, a single instance is shared
+DIRECT_MODE_INFO = ModeInfo_(single=ModeInfoSingle_(SignMode.SIGN_MODE_DIRECT))
+AMINO_JSON_MODE_INFO = ModeInfo_(single=ModeInfoSingle_(SignMode.SIGN_MODE_LEGACY_AMINO_JSON))
+
+# Batch ceilings, below the usual block max gas and the default 1MB mempool tx size
+DEFAULT_BATCH_MAX_GAS = 2_000_000
+DEFAULT_BATCH_MAX_TX_BYTES = 64 * 1024
+# Signer info, fee and signature of a single signer tx
+TX_OVERHEAD_BYTES = 256
+# Concurrent LCD requests of batch simulations and lookups
+DEFAULT_BATCH_WORKERS = 8
+# Message types by action, for build_contract_transaction
+MESSAGE_ACTIONS = {message_type.action: message_type for message_type in MESSAGE_TYPES.values()}
+
+
+@lru_cache(maxsize=4096)
+def _signing_key(private_key: bytes) -> SigningKey:
+    # Built once per key and reused for every signature, the curve's generator tables are
+    # computed by the first point multiplication and shared afterwards
+    return SigningKey.from_string(private_key, curve=SECP256k1)
+
 
 class Wallet:
-    def __init__(self, client: TendermintClient, acc_address: AccAddress):
+    """
+    Signer for one account.
+
+    Nothing is fetched when the wallet is created: the account number and sequence
+    are queried on first use, unless given.
+    """
+
+    def __init__(
+        self,
+        client: TendermintClient,
+        acc_address: AccAddress,
+        account_number: Optional[int] = None,
+        sequence: Optional[int] = None,
+    ):
+        if not is_valid_address(acc_address):
+            raise ValueError(f"Invalid account address: {acc_address}")
         self.client: TendermintClient = client
-        self.key: Account = Account.from_data(self.client.get_account_info(acc_address))
+        self.key: Account = Account(None, acc_address, None, account_number, sequence)
         self.private_key = None
+        self.signing_key: Optional[SigningKey] = None
+        self.sequences = SequenceManager(client, self.key.acc_address, self.key.account_number, self.key.sequence)
+
+    @classmethod
+    def from_private_key(cls, client: TendermintClient, private_key: bytes, prefix: str = "cosmos", **account_info):
+        """Wallet whose address is derived locally, `prefix` being the chain's bech32_prefix."""
+        public_key = _signing_key(private_key).get_verifying_key().to_string("compressed")
+        wallet = cls(client, AccAddress(pubkey_to_address(public_key, prefix)), **account_info)
+        wallet.set_raw_private_key(private_key)
+        return wallet
+
+    @classmethod
+    def from_mnemonic(
+        cls,
+        client: TendermintClient,
+        mnemonic: str,
+        coin_type: int,
+        account: int = 0,
+        index: int = 0,
+        prefix: str = "cosmos",
+        **account_info,
+    ):
+        private_key = derive_private_key(mnemonic, coin_type, account, index)
+        return cls.from_private_key(client, private_key, prefix, **account_info)
 
     def set_private_key(self, mnemonic: str, coin_type: int, account: int, index: int):
-        seed = Mnemonic("english").to_seed(mnemonic)
-        root = BIP32Key.fromEntropy(seed)
-        child = (
-            root.ChildKey(44 + BIP32_HARDEN)
-            .ChildKey(coin_type + BIP32_HARDEN)
-            .ChildKey(account + BIP32_HARDEN)
-            .ChildKey(0)
-            .ChildKey(index)
-        )
-        self.private_key = child.PrivateKey()
+        self.set_raw_private_key(derive_private_key(mnemonic, coin_type, account, index))
+
+    def set_raw_private_key(self, private_key: bytes):
+        self.private_key = private_key
+        self.signing_key = _signing_key(private_key)
         self.key.public_key = PublicKey(
             type="/cosmos.crypto.secp256k1.PubKey",
-            key=SigningKey.from_string(self.private_key, curve=SECP256k1).get_verifying_key().to_string("compressed")
+            key=self.signing_key.get_verifying_key().to_string("compressed")
         )
 
     def account_number_and_sequence(self) -> dict:
-        account_info = self.client.get_account_info(self.key.acc_address)
         return {
-            "account_number": account_info.get("account_number"),
-            "sequence": account_info.get("sequence"),
+            "account_number": self.sequences.get_account_number(),
+            "sequence": self.sequences.peek(),
         }
 
     def sign(self, payload: bytes) -> bytes:
-        sk = SigningKey.from_string(self.private_key, curve=SECP256k1)
-        return sk.sign_deterministic(
+        return self.signing_key.sign_deterministic(
             payload,
             hashfunc=hashlib.sha256,
             sigencode=sigencode_string_canonize,
         )
 
+    def _public_key(self) -> PublicKey:
+        # Without a private key, simulations use the public key the account has on chain
+        if self.key.public_key is None:
+            pub_key = self.sequences.get_pub_key()
+            if pub_key is None:
+                raise ValueError(
+                    f"Account {self.key.acc_address} has no public key on chain, set its private key first"
+                )
+            self.key.public_key = PublicKey(type=pub_key["@type"], key=base64.b64decode(pub_key["key"]))
+        return self.key.public_key
+
     def build_tx(self, tx_options: CreateTxOptions) -> dict:
         signer_data: List[SignerInfo_] = [
-            SignerInfo_(
-                self.key.sequence, self.key.public_key, ModeInfo_(single=ModeInfoSingle_(SignMode.SIGN_MODE_DIRECT))
-            )
+            SignerInfo_(self.sequences.peek(), self._public_key(), DIRECT_MODE_INFO)
         ]
 
         if tx_options.fee is None:
@@ -83,57 +148,228 @@ class Wallet:
             [],
         )
 
-    def sign_tx(self, tx: Tx_):
-        sign_options = SignOptions(
-            account_number=self.key.account_number,
-            sequence=self.key.sequence,
-            chain_id=self.client.chain_id,
-            sign_mode=SignMode.SIGN_MODE_DIRECT,
-        )
-        signedTx = Tx_(
+    def _take_by_size(self, msgs: List[BaseTendermintData], memo: Optional[str], max_tx_bytes: int) -> int:
+        """Number of leading messages fitting in `max_tx_bytes`, at least one."""
+        size = TX_OVERHEAD_BYTES + len((memo or "").encode())
+        for count, msg in enumerate(msgs):
+            # Any wrapper plus its field tag and length
+            size += len(msg.pack_any_bytes()) + 4
+            if count and size > max_tx_bytes:
+                return count
+        return len(msgs)
+
+    def build_batch_txs(
+        self,
+        msgs: List[BaseTendermintData],
+        memo: Optional[str] = None,
+        max_gas: int = DEFAULT_BATCH_MAX_GAS,
+        max_tx_bytes: int = DEFAULT_BATCH_MAX_TX_BYTES,
+        gas_prices: Optional[str] = None,
+        gas_adjustment: float = 0,
+    ) -> List[Tx_]:
+        """
+        Pack many messages into as few transactions as the gas and size ceilings allow.
+
+        Each transaction takes as many messages as fit in `max_tx_bytes`, and is shrunk in
+        proportion when its estimated gas is above `max_gas`. Transactions are meant to be
+        signed in order with `sign_txs`, which gives them consecutive sequences.
+        """
+        txs = []
+        start = 0
+        while start < len(msgs):
+            count = self._take_by_size(msgs[start:], memo, max_tx_bytes)
+            while True:
+                tx = self.build_tx(
+                    CreateTxOptions(
+                        msgs=msgs[start:start + count], memo=memo, gas_prices=gas_prices, gas_adjustment=gas_adjustment
+                    )
+                )
+                gas = tx.auth_info.fee.gas_limit
+                if gas <= max_gas or count == 1:
+                    break
+                count = max(1, min(count - 1, count * max_gas // gas))
+            txs.append(tx)
+            start += count
+        return txs
+
+    def sign_txs(self, txs: List[Tx_], sign_mode: SignMode = SignMode.SIGN_MODE_DIRECT) -> List[Tx_]:
+        """Sign transactions with consecutive sequences, allocated at once."""
+        sequences = self.sequences.next_many(len(txs))
+        try:
+            return [self.sign_tx(tx, sequence, sign_mode) for tx, sequence in zip(txs, sequences)]
+        except Exception:
+            # Nothing was broadcast, give back every allocated sequence
+            self.sequences.resync(sequences.start)
+            raise
+
+    def sign_tx(
+        self, tx: Tx_, sequence: Optional[int] = None, sign_mode: SignMode = SignMode.SIGN_MODE_DIRECT
+    ) -> Tx_:
+        # Each signature consumes a locally allocated sequence
+        if sequence is None:
+            sequence = self.sequences.next()
+        amino_json = sign_mode == SignMode.SIGN_MODE_LEGACY_AMINO_JSON
+        mode_info = AMINO_JSON_MODE_INFO if amino_json else DIRECT_MODE_INFO
+        signer_info = SignerInfo_(sequence, self.key.public_key, mode_info)
+
+        # The sign doc only covers our own signer info; body and auth_info are encoded
+        # once, for the sign doc and the final TxRaw
+        account_number = self.sequences.get_account_number()
+        with span("serialization", chain=TENDERMINT):
+            body_bytes = tx.body.to_bytes()
+            auth_info_bytes = encode_auth_info([signer_info.to_bytes()], tx.auth_info.fee.to_bytes())
+            if amino_json:
+                sign_doc = encode_std_sign_doc(
+                    account_number,
+                    self.client.chain_id,
+                    tx.auth_info.fee,
+                    tx.body.memo,
+                    [msg.to_amino_json() for msg in tx.body.messages],
+                    sequence,
+                    tx.body.timeout_height,
+                )
+            else:
+                sign_doc = encode_sign_doc(body_bytes, auth_info_bytes, self.client.chain_id, account_number)
+        with span("signing", chain=TENDERMINT):
+            signature = self.sign(sign_doc)
+
+        signed_tx = Tx_(
             body=tx.body,
-            auth_info=AuthInfo_(signer_infos=[], fee=tx.auth_info.fee),
-            signatures=[],
-        )
-        sign_doc = SignDoc_(
-            chain_id=sign_options.chain_id,
-            account_number=sign_options.account_number,
-            sequence=sign_options.sequence,
-            auth_info=signedTx.auth_info,
-            tx_body=signedTx.body,
+            auth_info=AuthInfo_(signer_infos=[*tx.auth_info.signer_infos, signer_info], fee=tx.auth_info.fee),
+            signatures=[*tx.signatures, signature],
         )
+        # With no previous signer, the signed auth_info is exactly the final one
+        if not tx.auth_info.signer_infos:
+            signed_tx.body_bytes = body_bytes
+            signed_tx.auth_info_bytes = auth_info_bytes
+        return signed_tx
 
-        si_backup = copy.deepcopy(sign_doc.auth_info.signer_infos)
-        sign_doc.auth_info.signer_infos = [
-            SignerInfo_(
-                public_key=self.key.public_key,
-                sequence=sign_doc.sequence,
-                mode_info=ModeInfo_(single=ModeInfoSingle_(mode=SignMode.SIGN_MODE_DIRECT)),
-            )
-        ]
-        signature = self.sign(sign_doc.to_bytes())
-        # restore
-        sign_doc.auth_info.signer_infos = si_backup
-        final_signature = SignatureV2(
-            public_key=self.key.public_key,
-            data=Descriptor(single=Single(mode=SignMode.SIGN_MODE_DIRECT, signature=signature)),
-            sequence=sign_doc.sequence,
-        )
+    def broadcast(self, tx: Tx_):
+        result = self.client._broadcast(tx)
+        # Our own signature is the last one appended by sign_tx
+        self.sequences.handle_broadcast_result(result, tx.auth_info.signer_infos[-1].sequence)
+        return result
+
+
+class TendermintTransactionBuilder(BaseTransactionBuilder):
+    """
+    Batch interface of a Wallet on a TendermintClient.
+
+    Transactions are built from messages: each call of `build_many` holds CreateTxOptions
+    fields, e.g. {"msgs": [...], "memo": "..."}. Fees missing from the calls are simulated
+    concurrently, signatures take consecutive sequences, and broadcasts stop at the first
+    rejection since every following sequence would be rejected too.
+    """
+
+    def __init__(self, wallet: Wallet, max_workers: int = DEFAULT_BATCH_WORKERS):
+        self.wallet = wallet
+        self.max_workers = max_workers
+
+    def build_contract_transaction(
+        self, from_address: str, contract_address: str, function_name: str, function_args: list, value: int = 0,
+        gas: int = None, gas_price: int = None,
+    ) -> Tx_:
+        """
+        Build a single message transaction, `function_name` being the message action (e.g.
+        "delegate") or type_url. The message is built from the signer's address, then
+        `contract_address` (validator or recipient) and `function_args`, e.g.
+        build_contract_transaction(address, validator, "delegate", [Coin_("uatom", 1000)]).
+        `gas_price` takes gas prices such as "0.025uatom".
+        """
+        self._check_signer(from_address)
+        if value:
+            raise ValueError("Tendermint messages carry their own amounts, value must be 0")
+        message_type = MESSAGE_TYPES.get(function_name) or MESSAGE_ACTIONS.get(function_name)
+        if message_type is None:
+            raise ValueError(f"Unknown message {function_name}")
+        message = message_type(from_address, contract_address, *function_args)
+        return self.wallet.build_tx(CreateTxOptions(msgs=[message], gas=gas, gas_prices=gas_price))
+
+    def _check_signer(self, from_address: str):
+        if from_address != self.wallet.key.acc_address:
+            raise ValueError(f"{from_address} is not the wallet's address {self.wallet.key.acc_address}")
 
-        sig_data: Single = final_signature.data.single
-        for sig in tx.signatures:
-            signedTx.signatures.append(sig)
-        signedTx.signatures.append(sig_data.signature)
-        for infos in tx.auth_info.signer_infos:
-            signedTx.auth_info.signer_infos.append(infos)
-        signedTx.auth_info.signer_infos.append(
-            SignerInfo_(
-                public_key=final_signature.public_key,
-                sequence=final_signature.sequence,
-                mode_info=ModeInfo_(single=ModeInfoSingle_(mode=sig_data.mode)),
+    def _use_private_key(self, private_key: Optional[bytes]):
+        if private_key is not None and private_key != self.wallet.private_key:
+            self.wallet.set_raw_private_key(private_key)
+
+    def _build(self, call: dict) -> TransactionResult:
+        try:
+            return TransactionResult(TxStatus.BUILT, self.wallet.build_tx(CreateTxOptions(**call)))
+        except Exception as error:
+            return TransactionResult.failed(error)
+
+    def build_many(self, from_address: str, calls: List[dict]) -> List[TransactionResult]:
+        self._check_signer(from_address)
+        # Fetch the sequence once, before the concurrent simulations need it
+        self.wallet.sequences.peek()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._build, calls))
+
+    def sign_transaction(self, transaction: Tx_, private_key: Optional[bytes] = None) -> Tx_:
+        self._use_private_key(private_key)
+        return self.wallet.sign_tx(transaction)
+
+    def sign_many(self, transactions: List[Tx_], private_key: Optional[bytes] = None) -> List[TransactionResult]:
+        try:
+            self._use_private_key(private_key)
+            signed_txs = self.wallet.sign_txs(transactions)
+        except Exception as error:
+            return [TransactionResult.failed(error, transaction) for transaction in transactions]
+        return [TransactionResult(TxStatus.SIGNED, tx, tx.to_hash()) for tx in signed_txs]
+
+    def broadcast_transaction(self, transaction: Tx_) -> dict:
+        return self.wallet.broadcast(transaction)
+
+    def broadcast_many(self, transactions: List[Tx_]) -> List[TransactionResult]:
+        """Broadcast in sequence order with BROADCAST_MODE_SYNC, results being PENDING once CheckTx passed."""
+        results = []
+        for index, tx in enumerate(transactions):
+            try:
+                result = self.wallet.broadcast(tx)
+            except Exception as error:
+                results.append(TransactionResult.failed(error, tx, tx.to_hash()))
+                continue
+            tx_response = result.get("tx_response")
+            if not tx_response:
+                # LCD error body, the wallet already resynced its sequence from the chain
+                error = result.get("message") or f"code {result.get('code')}"
+                results.append(TransactionResult(TxStatus.FAILED, tx, tx.to_hash(), error))
+            else:
+                txhash = tx_response.get("txhash") or tx.to_hash()
+                code = int(tx_response.get("code") or 0)
+                if code == 0:
+                    results.append(TransactionResult(TxStatus.PENDING, tx, txhash))
+                    continue
+                error = tx_response.get("raw_log") or f"code {code}"
+                results.append(TransactionResult(TxStatus.FAILED, tx, txhash, error))
+                # The rejected sequence was not consumed, the next batch starts over from it
+                if code != SEQUENCE_MISMATCH_CODE:
+                    self.wallet.sequences.resync(tx.auth_info.signer_infos[-1].sequence)
+            skipped = transactions[index + 1:]
+            results.extend(
+                TransactionResult(TxStatus.FAILED, tx, error="Not broadcast, a previous transaction was rejected")
+                for tx in skipped
             )
-        )
-        return signedTx
+            break
+        sent = sum(result.ok for result in results)
+        log_event(logger, logging.INFO, "transactions_sent", chain=TENDERMINT, sent=sent, transactions=len(results))
+        return results
 
-    def broadcast(self, tx: Tx_):
-        return self.client._broadcast(tx)
+    def _status(self, txhash: str) -> TransactionResult:
+        try:
+            tx_response = self.wallet.client.get_tx(txhash)
+        except Exception as error:
+            return TransactionResult.failed(error, tx_hash=txhash)
+        if tx_response is None:
+            return TransactionResult(TxStatus.NOT_FOUND, tx_hash=txhash)
+        if int(tx_response.get("code") or 0) != 0:
+            return TransactionResult(TxStatus.FAILED, tx_response, txhash, tx_response.get("raw_log"))
+        return TransactionResult(TxStatus.SUCCESS, tx_response, txhash)
+
+    def is_transaction_broadcasted(self, tx_hash: str) -> bool:
+        return self._status(tx_hash).status == TxStatus.SUCCESS
+
+    def status_many(self, tx_hashes: List[str]) -> List[TransactionResult]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._status, tx_hashes))
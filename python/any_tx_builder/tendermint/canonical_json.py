@@ -0,0 +1,172 @@
+########################################################
+#
+# Canonical JSON
+#
+# Sorted keys and no whitespace, with the fields, their order and their encoders
+# resolved once per message class. to_json gives the bytes of json.dumps(to_data(),
+# sort_keys=True, separators=(",", ":")); amino JSON, which the chain signs, is
+# written as Go's encoding/json does: raw UTF-8, "<", ">", "&", U+2028 and U+2029 escaped.
+#
+########################################################
+import json
+import typing
+from json.encoder import encode_basestring, encode_basestring_ascii
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import attr
+
+from any_tx_builder.tendermint.coin import Coin_, format_amount
+from any_tx_builder.tendermint.utils import to_data
+
+Serializer = Callable[[Any], str]
+
+# encoding/json writes raw UTF-8 but escapes these characters, json.dumps does not
+_GO_ESCAPES = (
+    ("<", "\\u003c"), (">", "\\u003e"), ("&", "\\u0026"), ("\u2028", "\\u2028"), ("\u2029", "\\u2029")
+)
+
+_SERIALIZERS: Dict[Tuple[type, bool], Serializer] = {}
+
+
+def _escape_go(encoded: str) -> str:
+    # Outside of strings JSON never holds these characters, escaping the whole output is safe
+    for char, escape in _GO_ESCAPES:
+        if char in encoded:
+            encoded = encoded.replace(char, escape)
+    return encoded
+
+
+def encode_string(value: str) -> str:
+    """JSON string as Go's encoding/json writes it, the amino JSON the chain signs."""
+    return _escape_go(encode_basestring(value))
+
+
+def _generic_data(value: Any) -> Any:
+    # Nested attrs objects go through attr.asdict, as in BaseTendermintData.to_data
+    if attr.has(type(value)):
+        value = attr.asdict(value)
+    return to_data(value)
+
+
+def _generic(value: Any) -> str:
+    return json.dumps(_generic_data(value), sort_keys=True, separators=(",", ":"))
+
+
+def _generic_amino(value: Any) -> str:
+    return _escape_go(json.dumps(_generic_data(value), sort_keys=True, separators=(",", ":"), ensure_ascii=False))
+
+
+def _coin_encoder(string: Serializer) -> Serializer:
+    return lambda coin: '{"amount":' + string(format_amount(coin.amount)) + ',"denom":' + string(coin.denom) + "}"
+
+
+def _coins_encoder(coin: Serializer) -> Serializer:
+    return lambda coins: "[" + ",".join(coin(item) for item in coins) + "]"
+
+
+encode_coin = _coin_encoder(encode_string)
+encode_coins = _coins_encoder(encode_coin)
+_encode_coin_ascii = _coin_encoder(encode_basestring_ascii)
+
+# String, coin, coins and fallback encoders: to_json matches json.dumps, amino JSON matches encoding/json
+_JSON_ENCODERS = (encode_basestring_ascii, _encode_coin_ascii, _coins_encoder(_encode_coin_ascii), _generic)
+_AMINO_ENCODERS = (encode_string, encode_coin, encode_coins, _generic_amino)
+
+
+def _field_encoder(field_type: Any, encoders: Tuple[Serializer, ...]) -> Serializer:
+    string, coin, coins, generic = encoders
+    # NewType aliases, such as AccAddress, resolve to their base type
+    field_type = getattr(field_type, "__supertype__", field_type)
+    if field_type is str:
+        return string
+    if field_type is int:
+        return lambda value: '"' + str(value) + '"'
+    if field_type is Coin_:
+        return coin
+    if typing.get_origin(field_type) in (list, List) and typing.get_args(field_type) == (Coin_,):
+        return coins
+    return generic
+
+
+def _nullable(encoder: Serializer) -> Serializer:
+    return lambda value: "null" if value is None else encoder(value)
+
+
+def serializer(cls: type, amino: bool = False) -> Serializer:
+    """
+    Canonical JSON encoder of an attrs message class, compiled on first use.
+
+    The default is to_json, with the "@type" key and the bytes of json.dumps. `amino` gives
+    the amino JSON value instead: no "@type", raw UTF-8 and Go's escapes.
+    """
+    key = (cls, amino)
+    compiled = _SERIALIZERS.get(key)
+    if compiled is not None:
+        return compiled
+
+    encoders = _AMINO_ENCODERS if amino else _JSON_ENCODERS
+    string = encoders[0]
+    entries: List[Tuple[str, Optional[Callable[[Any], Any]], Serializer]] = [
+        (field.name, attrgetter(field.name), _nullable(_field_encoder(field.type, encoders)))
+        for field in attr.fields(cls)
+    ]
+    if not amino:
+        entries.append(("@type", None, string))
+    entries.sort(key=lambda entry: entry[0])
+    type_url = string(getattr(cls, "type_url", ""))
+    plan = [
+        (("{" if index == 0 else ",") + string(name) + ":", getter, encoder)
+        for index, (name, getter, encoder) in enumerate(entries)
+    ]
+
+    def compiled(obj: Any) -> str:
+        if not plan:
+            return "{}"
+        parts = []
+        for prefix, getter, encoder in plan:
+            parts.append(prefix)
+            parts.append(type_url if getter is None else encoder(getter(obj)))
+        parts.append("}")
+        return "".join(parts)
+
+    _SERIALIZERS[key] = compiled
+    return compiled
+
+
+#
+# Legacy amino JSON sign doc (StdSignDoc)
+#
+
+
+def encode_std_fee(fee) -> str:
+    # payer and granter are omitted when empty
+    parts = ['{"amount":' + encode_coins(fee.amount), '"gas":"' + str(fee.gas_limit) + '"']
+    if fee.granter:
+        parts.append('"granter":' + encode_string(fee.granter))
+    if fee.payer:
+        parts.append('"payer":' + encode_string(fee.payer))
+    return ",".join(parts) + "}"
+
+
+def encode_std_sign_doc(
+    account_number: int,
+    chain_id: str,
+    fee,
+    memo: str,
+    amino_msgs: List[str],
+    sequence: int,
+    timeout_height: int = 0,
+) -> bytes:
+    """Bytes signed in SIGN_MODE_LEGACY_AMINO_JSON, `amino_msgs` being the messages' to_amino_json."""
+    doc = (
+        '{"account_number":"' + str(account_number) + '"'
+        + ',"chain_id":' + encode_string(chain_id)
+        + ',"fee":' + encode_std_fee(fee)
+        + ',"memo":' + encode_string(memo or "")
+        + ',"msgs":[' + ",".join(amino_msgs) + "]"
+        + ',"sequence":"' + str(sequence) + '"'
+    )
+    if timeout_height:
+        doc += ',"timeout_height":"' + str(timeout_height) + '"'
+    return (doc + "}").encode()
@@ -1,8 +1,12 @@
-import copy
-from typing import List, Optional
+import threading
+from typing import Dict, List, Optional
+
+import attr
 import requests
 
-from any_tx_builder.tendermint.coin import Coin_
+from any_tx_builder.instrumentation import TENDERMINT, count_rpc, span
+from any_tx_builder.tendermint.coin import Coin_, fee_coin
+from any_tx_builder.tendermint.gas import GasEstimateCache
 from any_tx_builder.tendermint.transactions.fee import Fee_
 from any_tx_builder.tendermint.transactions import (
     AuthInfo_,
@@ -13,53 +17,148 @@ from any_tx_builder.tendermint.transactions import (
 )
 from any_tx_builder.tendermint.types import AccAddress
 
+# LCD endpoints, as counted by the instrumentation
+ACCOUNTS_ENDPOINT = "accounts"
+SIMULATE_ENDPOINT = "simulate"
+BROADCAST_ENDPOINT = "broadcast"
+TXS_ENDPOINT = "txs"
+BLOCKS_ENDPOINT = "blocks"
+GRANTS_ENDPOINT = "grants"
+
+# Concurrent requests per LCD endpoint, simulations being the most expensive for the node
+DEFAULT_ENDPOINT_LIMITS = {
+    ACCOUNTS_ENDPOINT: 32,
+    SIMULATE_ENDPOINT: 8,
+    BROADCAST_ENDPOINT: 32,
+    TXS_ENDPOINT: 16,
+    BLOCKS_ENDPOINT: 4,
+    GRANTS_ENDPOINT: 32,
+}
+
+
+class BaseTendermintClient:
+    """
+    Chain settings and the fee and gas cache helpers shared by the sync and async clients.
+
+    Nothing here does I/O: TendermintClient queries the LCD with blocking calls,
+    AsyncTendermintClient with coroutines.
+    """
 
-class TendermintClient:
     def __init__(
-        self, lcd_url: str, default_price: str, denom: str, chain_id: str = "cosmoshub-4", gas_adjustment: float = 1.2
+        self, lcd_url: str, default_price: str, denom: str, chain_id: str = "cosmoshub-4", gas_adjustment: float = 1.2,
+        gas_cache: Optional[GasEstimateCache] = None,
     ):
         self.lcd_url = lcd_url
         self.denom = denom
         self.chain_id = chain_id
         self.default_price = default_price
         self.default_adjustment = gas_adjustment
+        # When set, transactions shaped like a previous one skip the simulate round trip
+        self.gas_cache = gas_cache
 
-    def get_account_info(self, acc_address: AccAddress) -> int:
-        result = requests.get(f"{self.lcd_url}/cosmos/auth/v1beta1/accounts/{acc_address}")
-        return result.json().get("account")
+    def _record_simulation(self, tx: Tx_, result: dict) -> int:
+        gas_used = int(result["gas_info"].get("gas_used", 0))
+        if self.gas_cache is not None:
+            key = self.gas_cache.key(self.chain_id, tx.body.messages, tx.body.memo)
+            self.gas_cache.record(key, gas_used, simulated=True)
+        return gas_used
 
-    def estimate_gas(self, tx: Tx_, options: Optional[CreateTxOptions]) -> int:
-        gas_adjustment = options.gas_adjustment if options else self.default_adjustment
-        res = requests.post(
-            f"{self.lcd_url}/cosmos/tx/v1beta1/simulate",
-            json={"tx_bytes": tx.to_string_bytes()},
-        )
-        return int(gas_adjustment * int(res.json()["gas_info"].get("gas_used", 0)))
-
-    def estimate_fee(self, signer_data: List[SignerInfo_], tx_options: CreateTxOptions) -> Fee_:
-        gas_prices = tx_options.gas_prices or self.default_price
-        gas_adjustment = tx_options.gas_adjustment or self.default_adjustment
-        gas_prices_coins = Coin_.from_str(gas_prices)
+    def record_gas_used(self, tx: Tx_, tx_response: dict):
+        """Learn the gas used by an included transaction, ignored when no gas cache is set."""
+        if self.gas_cache is None:
+            return
+        gas_used = int(tx_response.get("gas_used") or 0)
+        self.gas_cache.record(self.gas_cache.key(self.chain_id, tx.body.messages, tx.body.memo), gas_used)
 
+    def _simulation_tx(self, signer_data: List[SignerInfo_], tx_options: CreateTxOptions) -> Tx_:
         tx_body = TxBody_(messages=tx_options.msgs, memo=tx_options.memo or "")
         emptyFee = Fee_(0, [Coin_(denom=self.denom, amount=0)])
         auth_info = AuthInfo_([], emptyFee)
 
         tx = Tx_(tx_body, auth_info, [])
         tx.append_empty_signatures(signer_data)
+        return tx
 
-        gas = tx_options.gas
-        if gas is None or gas == "auto" or int(gas) == 0:
-            opt = copy.deepcopy(tx_options)
-            opt.gas_adjustment = gas_adjustment
-            gas = self.estimate_gas(tx, opt)
+    def _cached_gas(self, tx_options: CreateTxOptions, gas_adjustment: float) -> Optional[int]:
+        if self.gas_cache is None:
+            return None
+        cached_gas = self.gas_cache.get(self.gas_cache.key(self.chain_id, tx_options.msgs, tx_options.memo))
+        return int(gas_adjustment * cached_gas) if cached_gas is not None else None
 
-        fee_amount = gas_prices_coins.mul(gas) if gas_prices_coins else Coin_.from_str(f"3000{self.denom}")
+    def _fee(self, gas: int, gas_prices: str) -> Fee_:
+        fee_amount = fee_coin(gas_prices, int(gas)) if gas_prices else Coin_.from_str(f"3000{self.denom}")
         return Fee_(gas, [fee_amount], "", "")
 
-    def _broadcast(self, tx: Tx_):
-        result = requests.post(
-            f"{self.lcd_url}/cosmos/tx/v1beta1/txs",
-            json={"tx_bytes": tx.to_string_bytes(), "mode": "BROADCAST_MODE_SYNC"},
+
+class TendermintClient(BaseTendermintClient):
+    def __init__(
+        self, lcd_url: str, default_price: str, denom: str, chain_id: str = "cosmoshub-4", gas_adjustment: float = 1.2,
+        gas_cache: Optional[GasEstimateCache] = None, session: Optional[requests.Session] = None,
+        endpoint_limits: Optional[Dict[str, int]] = None,
+    ):
+        super().__init__(lcd_url, default_price, denom, chain_id, gas_adjustment, gas_cache)
+        # A requests.Session keeps connections alive across calls, the requests module does not
+        self.session = session or requests
+        # Threads sharing the client wait for a slot instead of all hitting the node at once
+        limits = {**DEFAULT_ENDPOINT_LIMITS, **(endpoint_limits or {})}
+        self._semaphores = {endpoint: threading.BoundedSemaphore(limit) for endpoint, limit in limits.items()}
+
+    def _request(self, endpoint: str, method: str, path: str, **kwargs) -> requests.Response:
+        count_rpc(TENDERMINT, endpoint)
+        with self._semaphores[endpoint]:
+            return self.session.request(method, f"{self.lcd_url}{path}", **kwargs)
+
+    def get_account_info(self, acc_address: AccAddress) -> int:
+        result = self._request(ACCOUNTS_ENDPOINT, "GET", f"/cosmos/auth/v1beta1/accounts/{acc_address}")
+        return result.json().get("account")
+
+    def get_grants(self, granter: AccAddress, grantee: AccAddress) -> List[dict]:
+        result = self._request(
+            GRANTS_ENDPOINT, "GET", "/cosmos/authz/v1beta1/grants", params={"granter": granter, "grantee": grantee}
         )
-        return result.json()
+        return result.json().get("grants") or []
+
+    def get_tx(self, txhash: str) -> Optional[dict]:
+        """Response of an included transaction, None when it is unknown to the node."""
+        result = self._request(TXS_ENDPOINT, "GET", f"/cosmos/tx/v1beta1/txs/{txhash}")
+        if result.status_code in (400, 404):
+            return None
+        result.raise_for_status()
+        return result.json().get("tx_response")
+
+    def simulate_gas_used(self, tx: Tx_) -> int:
+        with span("gas_simulation", chain=TENDERMINT):
+            res = self._request(
+                SIMULATE_ENDPOINT, "POST", "/cosmos/tx/v1beta1/simulate", json={"tx_bytes": tx.to_string_bytes()}
+            )
+        return self._record_simulation(tx, res.json())
+
+    def estimate_gas(self, tx: Tx_, options: Optional[CreateTxOptions]) -> int:
+        gas_adjustment = options.gas_adjustment if options else self.default_adjustment
+        return int(gas_adjustment * self.simulate_gas_used(tx))
+
+    def estimate_fee(self, signer_data: List[SignerInfo_], tx_options: CreateTxOptions) -> Fee_:
+        gas_prices = tx_options.gas_prices or self.default_price
+        gas_adjustment = tx_options.gas_adjustment or self.default_adjustment
+
+        gas = tx_options.gas
+        with span("fee_estimation", chain=TENDERMINT):
+            if gas is None or gas == "auto" or int(gas) == 0:
+                gas = self._cached_gas(tx_options, gas_adjustment)
+                if gas is None:
+                    # Shallow copy, the messages are shared with tx_options
+                    gas = self.estimate_gas(
+                        self._simulation_tx(signer_data, tx_options),
+                        attr.evolve(tx_options, gas_adjustment=gas_adjustment),
+                    )
+            return self._fee(gas, gas_prices)
+
+    def _broadcast(self, tx: Tx_):
+        with span("broadcast", chain=TENDERMINT):
+            result = self._request(
+                BROADCAST_ENDPOINT,
+                "POST",
+                "/cosmos/tx/v1beta1/txs",
+                json={"tx_bytes": tx.to_string_bytes(), "mode": "BROADCAST_MODE_SYNC"},
+            )
+            return result.json()
@@ -1,14 +1,64 @@
 import re
-from typing import Union
+from decimal import ROUND_CEILING, ROUND_FLOOR, Context, Decimal
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import attr
 from any_tx_builder.tendermint.proto import Coin
+from any_tx_builder.tendermint.proto.reader import get_string, parse_fields
+from any_tx_builder.tendermint.proto.writer import encode_coin
 
+COIN_PATTERN = re.compile(r"^(\-?[0-9]+(\.[0-9]+)?)([0-9a-zA-Z/]+)$")
 
-@attr.s(frozen=True)
+# Enough digits for any uint256 amount, 18 decimals tokens (inj, evmos) included
+DECIMAL_CONTEXT = Context(prec=96)
+
+Amount = Union[int, Decimal]
+
+
+def to_amount(value: Union[int, str, float, Decimal]) -> Amount:
+    """Exact amount: int when integral, Decimal otherwise."""
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        if "." not in value and "e" not in value and "E" not in value:
+            return int(value)
+        value = Decimal(value)
+    elif isinstance(value, float):
+        # Shortest repr of the float, not its binary expansion
+        value = Decimal(repr(value))
+    elif not isinstance(value, Decimal):
+        value = Decimal(value)
+    numerator, denominator = value.as_integer_ratio()
+    return numerator if denominator == 1 else value
+
+
+def format_amount(amount: Amount) -> str:
+    return str(amount) if type(amount) is int else format(amount, "f")
+
+
+def _add(a: Amount, b: Amount) -> Amount:
+    if type(a) is int and type(b) is int:
+        return a + b
+    # Context operations take ints as is
+    return to_amount(DECIMAL_CONTEXT.add(a, b))
+
+
+def _mul(a: Amount, b: Amount) -> Amount:
+    if type(a) is int and type(b) is int:
+        return a * b
+    return to_amount(DECIMAL_CONTEXT.multiply(a, b))
+
+
+@attr.s(frozen=True, slots=True)
 class Coin_:
+    """
+    `amount` is exact: an int, or a Decimal for decimal coins. It used to be a string,
+    format_amount(coin.amount) gives that string, as to_data does.
+    """
+
     denom: str = attr.ib()
-    amount: str = attr.ib()
+    amount: Amount = attr.ib(converter=to_amount)
 
     def parse(arg: Union[str, dict]):
         if isinstance(arg, Coin_):
@@ -22,10 +72,26 @@ class Coin_:
     def from_data(cls, data: dict):
         return cls(data["denom"], data["amount"])
 
+    @classmethod
+    def from_proto(cls, proto: Coin):
+        return cls(proto.denom, proto.amount)
+
+    @classmethod
+    def from_bytes(cls, value: bytes):
+        fields = parse_fields(value)
+        return cls(get_string(fields, 1), get_string(fields, 2))
+
+    @classmethod
+    def _from_int(cls, denom: str, amount: int):
+        # Skips the converter, as Coins._from_amounts skips parsing
+        coin = cls.__new__(cls)
+        object.__setattr__(coin, "denom", denom)
+        object.__setattr__(coin, "amount", amount)
+        return coin
+
     @classmethod
     def from_str(cls, string: str):
-        pattern = r"^(\-?[0-9]+(\.[0-9]+)?)([0-9a-zA-Z/]+)$"
-        match = re.match(pattern, string)
+        match = COIN_PATTERN.match(string)
         if match is None:
             raise ValueError(f"failed to parse Coin: {string}")
         else:
@@ -34,14 +100,149 @@ class Coin_:
     def to_dec_coin(self):
         return Coin_(self.denom, self.amount)
 
+    def is_int_coin(self) -> bool:
+        return type(self.amount) is int
+
+    def to_int_coin(self):
+        """Amount rounded down, the chain only accepts integer amounts."""
+        if type(self.amount) is int:
+            return self
+        return Coin_(self.denom, int(self.amount.to_integral_value(rounding=ROUND_FLOOR)))
+
+    def to_int_ceil_coin(self):
+        """Amount rounded up, as the fee checks of the chain do."""
+        if type(self.amount) is int:
+            return self
+        return Coin_(self.denom, int(self.amount.to_integral_value(rounding=ROUND_CEILING)))
+
     def to_data(self) -> dict:
-        return {"denom": self.denom, "amount": str(self.amount)}
+        return {"denom": self.denom, "amount": format_amount(self.amount)}
 
     def to_proto(self) -> Coin:
-        return Coin(denom=self.denom, amount=str(self.amount))
+        return Coin(denom=self.denom, amount=format_amount(self.amount))
+
+    def to_bytes(self) -> bytes:
+        return encode_coin(self.denom, format_amount(self.amount))
+
+    def _check_denom(self, other: "Coin_"):
+        if other.denom != self.denom:
+            raise ValueError(f"Coin denoms differ: {self.denom} and {other.denom}")
+
+    def add(self, other: "Coin_"):
+        self._check_denom(other)
+        return Coin_(self.denom, _add(self.amount, other.amount))
+
+    def sub(self, other: "Coin_"):
+        self._check_denom(other)
+        return Coin_(self.denom, _add(self.amount, -other.amount))
+
+    def mul(self, multiplier: Union[int, str, float, Decimal]):
+        return Coin_(self.denom, _mul(self.amount, to_amount(multiplier)))
+
+    def div(self, divisor: Union[int, str, float, Decimal]):
+        """Floor division of integer amounts, decimal amounts are divided exactly."""
+        if type(self.amount) is not int:
+            return self.div_exact(divisor)
+        divisor = to_amount(divisor)
+        if type(divisor) is int:
+            return Coin_(self.denom, self.amount // divisor)
+        quotient = DECIMAL_CONTEXT.divide(Decimal(self.amount), divisor)
+        return Coin_(self.denom, int(quotient.to_integral_value(rounding=ROUND_FLOOR)))
+
+    def div_exact(self, divisor: Union[int, str, float, Decimal]):
+        quotient = DECIMAL_CONTEXT.divide(Decimal(self.amount), to_amount(divisor))
+        return Coin_(self.denom, to_amount(quotient))
+
+
+class Coins:
+    """Multi-denom amounts, one entry per denom, kept as plain amounts rather than Coin_ objects."""
+
+    __slots__ = ("_amounts",)
+
+    def __init__(self, coins: Optional[Iterable[Union[Coin_, str, dict]]] = None):
+        self._amounts: Dict[str, Amount] = {}
+        for coin in coins or ():
+            coin = Coin_.parse(coin)
+            self._amounts[coin.denom] = _add(self._amounts.get(coin.denom, 0), coin.amount)
+
+    @classmethod
+    def from_str(cls, string: str):
+        """Comma separated coins, as in "1000uatom,25uosmo"."""
+        return cls(part.strip() for part in string.split(",") if part.strip())
+
+    @classmethod
+    def from_data(cls, data: List[dict]):
+        return cls(Coin_.from_data(coin) for coin in data)
+
+    @classmethod
+    def _from_amounts(cls, amounts: Dict[str, Amount]):
+        coins = cls.__new__(cls)
+        coins._amounts = amounts
+        return coins
+
+    def get(self, denom: str) -> Optional[Coin_]:
+        amount = self._amounts.get(denom)
+        return Coin_(denom, amount) if amount is not None else None
+
+    def denoms(self) -> List[str]:
+        return sorted(self._amounts)
+
+    def to_list(self) -> List[Coin_]:
+        return [Coin_(denom, self._amounts[denom]) for denom in sorted(self._amounts)]
+
+    def to_data(self) -> List[dict]:
+        return [coin.to_data() for coin in self.to_list()]
+
+    def to_str(self) -> str:
+        return ",".join(f"{format_amount(self._amounts[denom])}{denom}" for denom in sorted(self._amounts))
+
+    def add(self, other: Union["Coins", Coin_]):
+        amounts = dict(self._amounts)
+        items = [(other.denom, other.amount)] if isinstance(other, Coin_) else other._amounts.items()
+        for denom, amount in items:
+            amounts[denom] = _add(amounts.get(denom, 0), amount)
+        return Coins._from_amounts(amounts)
+
+    def sub(self, other: Union["Coins", Coin_]):
+        items = [(other.denom, other.amount)] if isinstance(other, Coin_) else other._amounts.items()
+        return self.add(Coins._from_amounts({denom: -amount for denom, amount in items}))
+
+    def mul(self, multiplier: Union[int, str, float, Decimal]):
+        multiplier = to_amount(multiplier)
+        return Coins._from_amounts({denom: _mul(amount, multiplier) for denom, amount in self._amounts.items()})
+
+    def to_int_coins(self):
+        return Coins(coin.to_int_coin() for coin in self.to_list())
+
+    def to_int_ceil_coins(self):
+        return Coins(coin.to_int_ceil_coin() for coin in self.to_list())
+
+    def __iter__(self) -> Iterator[Coin_]:
+        return iter(self.to_list())
+
+    def __len__(self) -> int:
+        return len(self._amounts)
+
+    def __contains__(self, denom: str) -> bool:
+        return denom in self._amounts
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Coins) and self._amounts == other._amounts
+
+    def __repr__(self) -> str:
+        return f"Coins({self.to_str()!r})"
+
+
+
+@lru_cache(maxsize=256)
+def _gas_price_ratio(gas_price: str) -> Tuple[str, int, int]:
+    # Gas prices take few distinct values, fees then only need integer operations
+    coin = Coin_.from_str(gas_price)
+    numerator, denominator = (coin.amount, 1) if type(coin.amount) is int else coin.amount.as_integer_ratio()
+    return coin.denom, numerator, denominator
 
-    def div(self, divisor: float):
-        return Coin_(self.denom, str(int(float(self.amount) // float(divisor))))
 
-    def mul(self, multiplier: float):
-        return Coin_(self.denom, str(int(float(self.amount) * float(multiplier))))
+def fee_coin(gas_price: str, gas: int) -> Coin_:
+    """Exact fee of `gas` at a gas price such as "0.006uatom", rounded up as the chain's minimum fee check does."""
+    denom, numerator, denominator = _gas_price_ratio(gas_price)
+    return Coin_._from_int(denom, -(-numerator * gas // denominator))
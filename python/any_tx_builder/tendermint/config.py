@@ -3,6 +3,8 @@
 # Tendermint Constants
 #
 ########################################################
+from typing import Dict, List, Optional
+
 from pydantic import BaseModel
 
 
@@ -13,6 +15,14 @@ class TendermintChainConfig(BaseModel):
     chain: str
     chain_id: str
     coin_type: int
+    bech32_prefix: str = "cosmos"
+    # LCD endpoints tried in turn when rpc_url is unreachable
+    fallback_urls: List[str] = []
+    grpc_url: Optional[str] = None
+    websocket_url: Optional[str] = None
+    gas_adjustment: float = 1.2
+    # Concurrent requests per LCD endpoint, on top of client.DEFAULT_ENDPOINT_LIMITS, for sync and async clients
+    endpoint_limits: Dict[str, int] = {}
 #
 # Cosmos Constants
 #
@@ -29,5 +39,6 @@ TENDERMINT_SETUP = {
         chain="cosmos",
         chain_id="cosmoshub-4",
         coin_type=118,
+        bech32_prefix="cosmos",
     )
 }
@@ -0,0 +1,87 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from bip32utils import BIP32_HARDEN, BIP32Key
+from mnemonic import Mnemonic
+
+#
+# HD key derivation caches
+#
+# The BIP39 seed (2048 PBKDF2 rounds) and the hardened m/44'/coin'/account'/0 node are
+# computed once per mnemonic, so deriving another index is a single BIP32 step.
+# Mnemonics are never kept, caches are keyed by their fingerprint. Each cache is an LRU,
+# so that key material of mnemonics no longer in use is dropped.
+#
+
+_MNEMONIC = Mnemonic("english")
+_LOCK = threading.Lock()
+SEED_CACHE_SIZE = 16
+CHANGE_NODE_CACHE_SIZE = 64
+PRIVATE_KEY_CACHE_SIZE = 4096
+_SEEDS: "OrderedDict[bytes, bytes]" = OrderedDict()
+_CHANGE_NODES: "OrderedDict[Tuple[bytes, int, int], BIP32Key]" = OrderedDict()
+_PRIVATE_KEYS: "OrderedDict[Tuple[bytes, int, int, int], bytes]" = OrderedDict()
+
+
+def _cache_get(cache: OrderedDict, key) -> Optional[object]:
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _cache_put(cache: OrderedDict, key, value, max_size: int):
+    cache[key] = value
+    if len(cache) > max_size:
+        cache.popitem(last=False)
+
+
+def mnemonic_fingerprint(mnemonic: str) -> bytes:
+    return hashlib.sha256(mnemonic.encode()).digest()
+
+
+def _change_node(mnemonic: str, fingerprint: bytes, coin_type: int, account: int) -> BIP32Key:
+    node_key = (fingerprint, coin_type, account)
+    node = _cache_get(_CHANGE_NODES, node_key)
+    if node is None:
+        seed = _cache_get(_SEEDS, fingerprint)
+        if seed is None:
+            seed = _MNEMONIC.to_seed(mnemonic)
+            _cache_put(_SEEDS, fingerprint, seed, SEED_CACHE_SIZE)
+        node = (
+            BIP32Key.fromEntropy(seed)
+            .ChildKey(44 + BIP32_HARDEN)
+            .ChildKey(coin_type + BIP32_HARDEN)
+            .ChildKey(account + BIP32_HARDEN)
+            .ChildKey(0)
+        )
+        _cache_put(_CHANGE_NODES, node_key, node, CHANGE_NODE_CACHE_SIZE)
+    return node
+
+
+def derive_private_keys(mnemonic: str, coin_type: int, account: int, indexes: Iterable[int]) -> List[bytes]:
+    """Derive the private keys at m/44'/coin_type'/account'/0/index for many indexes of one mnemonic."""
+    fingerprint = mnemonic_fingerprint(mnemonic)
+    private_keys = []
+    with _LOCK:
+        for index in indexes:
+            cache_key = (fingerprint, coin_type, account, index)
+            private_key = _cache_get(_PRIVATE_KEYS, cache_key)
+            if private_key is None:
+                private_key = _change_node(mnemonic, fingerprint, coin_type, account).ChildKey(index).PrivateKey()
+                _cache_put(_PRIVATE_KEYS, cache_key, private_key, PRIVATE_KEY_CACHE_SIZE)
+            private_keys.append(private_key)
+    return private_keys
+
+
+def derive_private_key(mnemonic: str, coin_type: int, account: int, index: int) -> bytes:
+    return derive_private_keys(mnemonic, coin_type, account, [index])[0]
+
+
+def clear_derivation_cache():
+    with _LOCK:
+        _SEEDS.clear()
+        _CHANGE_NODES.clear()
+        _PRIVATE_KEYS.clear()
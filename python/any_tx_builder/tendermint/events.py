@@ -0,0 +1,217 @@
+########################################################
+#
+# CometBFT event subscriptions
+#
+# Push channel over the node's RPC /websocket: NewBlock and Tx events are read by a
+# single background task, which reconnects and subscribes again when the connection
+# drops, and handed out through a bounded queue.
+#
+########################################################
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import logging
+from typing import AsyncIterator, Dict, Iterable, Optional
+
+import attr
+import websockets
+
+from any_tx_builder.instrumentation import TENDERMINT, log_event
+from any_tx_builder.tendermint.types import AccAddress
+
+logger = logging.getLogger(__name__)
+
+NEW_BLOCK_QUERY = "tm.event='NewBlock'"
+TX_QUERY = "tm.event='Tx'"
+
+DEFAULT_QUEUE_SIZE = 4096
+DEFAULT_RECONNECT_DELAY = 0.5
+DEFAULT_MAX_RECONNECT_DELAY = 30.0
+# Blocks carry every tx of the block, larger than the websockets 1MiB default
+DEFAULT_MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+def tx_query(acc_address: AccAddress) -> str:
+    """Tx events of transactions sent by `acc_address`."""
+    return f"{TX_QUERY} AND message.sender='{acc_address}'"
+
+
+@attr.s(slots=True)
+class TendermintEvent:
+    query: str = attr.ib()
+    type: str = attr.ib()
+    height: int = attr.ib(converter=int)
+    value: dict = attr.ib(repr=False)
+    txhash: Optional[str] = attr.ib(default=None)
+
+    @classmethod
+    def from_result(cls, result: dict) -> "TendermintEvent":
+        data = result["data"]
+        value = data.get("value") or {}
+        event_type = data["type"].rsplit("/", 1)[-1]
+        if event_type == "Tx":
+            tx_result = value["TxResult"]
+            txhash = (result.get("events") or {}).get("tx.hash", [None])[0]
+            if txhash is None:
+                txhash = hashlib.sha256(base64.b64decode(tx_result["tx"])).hexdigest().upper()
+            return cls(result["query"], event_type, tx_result["height"], value, txhash)
+        height = value.get("block", {}).get("header", {}).get("height") or value.get("height") or 0
+        return cls(result["query"], event_type, height, value)
+
+    def to_tx_response(self) -> dict:
+        """Tx event as an LCD tx_response, as read by TxResult.from_data and record_gas_used."""
+        result = self.value["TxResult"].get("result") or {}
+        return {
+            "txhash": self.txhash,
+            "height": str(self.height),
+            "code": result.get("code") or 0,
+            "codespace": result.get("codespace") or "",
+            "raw_log": result.get("log") or "",
+            "gas_wanted": result.get("gas_wanted") or "0",
+            "gas_used": result.get("gas_used") or "0",
+        }
+
+
+class TendermintEventClient:
+    """
+    Subscriber of the CometBFT `subscribe` websocket API.
+
+    Subscriptions are kept across reconnections. Events are queued up to `queue_size`;
+    when consumers fall behind the oldest events are dropped and counted in `dropped`,
+    consumers relying on every event should pair this client with a lookup by hash.
+    Nodes allow 5 subscriptions per client unless `max_subscriptions_per_client` is raised.
+    """
+
+    def __init__(
+        self,
+        websocket_url: str,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        reconnect_delay: float = DEFAULT_RECONNECT_DELAY,
+        max_reconnect_delay: float = DEFAULT_MAX_RECONNECT_DELAY,
+        max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+    ):
+        self.websocket_url = websocket_url
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_message_size = max_message_size
+        self.queries: Dict[int, str] = {}
+        self.dropped = 0
+        self.reconnects = 0
+        self.connected = asyncio.Event()
+        self._ids = itertools.count(1)
+        self._websocket = None
+        self._reader: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_rpc_url(cls, rpc_url: str, **kwargs) -> "TendermintEventClient":
+        """Client of a node's RPC, e.g. http://localhost:26657."""
+        return cls(rpc_url.replace("http", "ws", 1).rstrip("/") + "/websocket", **kwargs)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def running(self) -> bool:
+        return self._reader is not None and not self._reader.done()
+
+    def start(self):
+        if not self.running:
+            self._reader = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        if self._websocket is not None:
+            await self._websocket.close()
+            self._websocket = None
+        self.connected.clear()
+
+    async def subscribe(self, query: str):
+        """Subscribe to `query`, now if connected and again after every reconnection."""
+        if query in self.queries.values():
+            return
+        subscription_id = next(self._ids)
+        self.queries[subscription_id] = query
+        if self._websocket is not None and self.connected.is_set():
+            await self._send_subscribe(subscription_id, query)
+
+    async def subscribe_new_blocks(self):
+        await self.subscribe(NEW_BLOCK_QUERY)
+
+    async def subscribe_txs(self, acc_addresses: Iterable[AccAddress]):
+        for acc_address in acc_addresses:
+            await self.subscribe(tx_query(acc_address))
+
+    def has_tx_subscription(self) -> bool:
+        return any(query.startswith(TX_QUERY) for query in self.queries.values())
+
+    async def _send_subscribe(self, subscription_id: int, query: str):
+        await self._websocket.send(
+            json.dumps({"jsonrpc": "2.0", "method": "subscribe", "id": subscription_id, "params": {"query": query}})
+        )
+
+    def _put(self, event: TendermintEvent):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    def _handle(self, message: dict):
+        error = message.get("error")
+        if error:
+            query = self.queries.pop(message.get("id"), None)
+            log_event(
+                logger, logging.ERROR, "subscription_failed", chain=TENDERMINT,
+                query=query, error=error.get('data') or error.get('message'),
+            )
+            return
+        result = message.get("result")
+        # Subscription acknowledgements carry an empty result
+        if result and "data" in result:
+            self._put(TendermintEvent.from_result(result))
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.websocket_url, max_size=self.max_message_size) as websocket:
+                    self._websocket = websocket
+                    for subscription_id, query in list(self.queries.items()):
+                        await self._send_subscribe(subscription_id, query)
+                    self.connected.set()
+                    delay = self.reconnect_delay
+                    async for raw_message in websocket:
+                        try:
+                            self._handle(json.loads(raw_message))
+                        except Exception as error:
+                            # A malformed message must not stop the reader, later events are still valid
+                            log_event(
+                                logger, logging.WARNING, "event_skipped", chain=TENDERMINT,
+                                url=self.websocket_url, error=repr(error),
+                            )
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as error:
+                log_event(
+                    logger, logging.WARNING, "websocket_disconnected", chain=TENDERMINT,
+                    url=self.websocket_url, error=repr(error),
+                )
+            self._websocket = None
+            self.connected.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+            self.reconnects += 1
+
+    async def get(self) -> TendermintEvent:
+        return await self.queue.get()
+
+    async def events(self) -> AsyncIterator[TendermintEvent]:
+        while True:
+            yield await self.queue.get()
@@ -0,0 +1,77 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from any_tx_builder.tendermint.messages import BaseTendermintData
+
+GasCacheKey = Tuple[str, Tuple[str, ...], int, int]
+
+
+class _GasEntry:
+    __slots__ = ("gas_used", "hits", "updated_at")
+
+    def __init__(self, gas_used: int):
+        self.gas_used = gas_used
+        self.hits = 0
+        self.updated_at = time.monotonic()
+
+
+class GasEstimateCache:
+    """
+    Gas used by previous transactions of the same shape.
+
+    Transactions are keyed by (chain_id, message type_urls, message count, memo length bucket),
+    the highest gas used observed is kept. Cached values get an extra `margin` on top of the
+    gas adjustment, and are dropped after `revalidate_every` hits or `max_age` seconds so the
+    next transaction of that shape is simulated again.
+    """
+
+    def __init__(self, margin: float = 1.1, revalidate_every: int = 100, max_age: float = 600.0, memo_bucket_size: int = 64):
+        self.margin = margin
+        self.revalidate_every = revalidate_every
+        self.max_age = max_age
+        self.memo_bucket_size = memo_bucket_size
+        self._entries: Dict[GasCacheKey, _GasEntry] = {}
+        self._lock = threading.Lock()
+
+    def key(self, chain_id: str, msgs: List[BaseTendermintData], memo: Optional[str]) -> GasCacheKey:
+        return (
+            chain_id,
+            tuple(msg.type_url for msg in msgs),
+            len(msgs),
+            len(memo or "") // self.memo_bucket_size,
+        )
+
+    def get(self, key: GasCacheKey) -> Optional[int]:
+        """Cached gas used with the margin applied, None when unknown or due for revalidation."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.hits >= self.revalidate_every or time.monotonic() - entry.updated_at > self.max_age:
+                del self._entries[key]
+                return None
+            entry.hits += 1
+            return int(entry.gas_used * self.margin)
+
+    def record(self, key: GasCacheKey, gas_used: int, simulated: bool = False):
+        """
+        Learn from a simulation or an included transaction.
+
+        Only simulations refresh the entry's age, so that a steady flow of included
+        transactions does not keep a stale estimate from being simulated again.
+        """
+        if gas_used <= 0:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = _GasEntry(gas_used)
+            else:
+                entry.gas_used = max(entry.gas_used, gas_used)
+                if simulated:
+                    entry.updated_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,7 +1,10 @@
 import base64
+from typing import Optional
 
 from pydantic import BaseModel
 from any_tx_builder.tendermint.proto import Any_pb, PubKey
+from any_tx_builder.tendermint.proto.reader import get_bytes, get_string, parse_fields
+from any_tx_builder.tendermint.proto.writer import encode_any, encode_pub_key
 from any_tx_builder.tendermint.types import AccAddress
 
 class PublicKey(BaseModel):
@@ -15,24 +18,46 @@ class PublicKey(BaseModel):
             "key": base64.b64encode(self.key),
         }
 
+    @classmethod
+    def from_proto(cls, proto: Any_pb):
+        return cls(type=proto.type_url, key=PubKey().parse(proto.value).key)
+
+    @classmethod
+    def from_any_bytes(cls, value: bytes):
+        fields = parse_fields(value)
+        return cls(type=get_string(fields, 1), key=get_bytes(parse_fields(get_bytes(fields, 2)), 1))
+
     def to_proto(self) -> PubKey:
         return PubKey(key=self.key)
 
     def pack_any(self) -> Any_pb:
         return Any_pb(type_url=self.type_url, value=bytes(self.to_proto()))
 
+    def pack_any_bytes(self) -> bytes:
+        return encode_any(self.type_url, encode_pub_key(self.key))
+
 
 class Account:
     chain: str
     acc_address: AccAddress
-    public_key: PublicKey
-    account_number: int
-    sequence: int
+    public_key: Optional[PublicKey]
+    account_number: Optional[int]
+    sequence: Optional[int]
 
-    def __init__(self, chain: str, acc_address: AccAddress, pub_key: PublicKey, account_number: int, sequence: int):
+    def __init__(
+        self,
+        chain: str,
+        acc_address: AccAddress,
+        pub_key: Optional[dict],
+        account_number: Optional[int],
+        sequence: Optional[int],
+    ):
         self.chain = chain
         self.acc_address = AccAddress(acc_address)
-        self.public_key = PublicKey(type=pub_key["@type"], key=base64.b64decode(pub_key["key"]))
+        # Accounts that never signed a transaction have no public key on chain
+        self.public_key = (
+            PublicKey(type=pub_key["@type"], key=base64.b64decode(pub_key["key"])) if pub_key else None
+        )
         self.account_number = account_number
         self.sequence = sequence
 
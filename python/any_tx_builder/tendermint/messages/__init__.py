@@ -1,6 +1,21 @@
-from .messages import BaseTendermintData, MsgDelegate_
+from .messages import (
+    MESSAGE_TYPES,
+    BaseTendermintData,
+    MsgBeginRedelegate_,
+    MsgDelegate_,
+    MsgExec_,
+    MsgSend_,
+    MsgUndelegate_,
+    MsgWithdrawDelegatorReward_,
+)
 
 __all__ = [
     "BaseTendermintData",
     "MsgDelegate_",
+    "MsgUndelegate_",
+    "MsgBeginRedelegate_",
+    "MsgWithdrawDelegatorReward_",
+    "MsgSend_",
+    "MsgExec_",
+    "MESSAGE_TYPES",
 ]
@@ -1,10 +1,29 @@
-import json
 from abc import abstractmethod
+from typing import Dict, List, Type
+
 import attr
 from betterproto import Message
 
+from any_tx_builder.tendermint.canonical_json import encode_string, serializer
 from any_tx_builder.tendermint.coin import Coin_
-from any_tx_builder.tendermint.proto import Any_pb, MsgDelegate
+from any_tx_builder.tendermint.proto import (
+    Any_pb,
+    MsgBeginRedelegate,
+    MsgDelegate,
+    MsgExec,
+    MsgSend,
+    MsgUndelegate,
+    MsgWithdrawDelegatorReward,
+)
+from any_tx_builder.tendermint.proto.reader import get_bytes, get_repeated, get_string, parse_fields
+from any_tx_builder.tendermint.proto.writer import (
+    encode_any,
+    encode_msg_begin_redelegate,
+    encode_msg_delegate,
+    encode_msg_exec,
+    encode_msg_send,
+    encode_msg_withdraw_delegator_reward,
+)
 from any_tx_builder.tendermint.types import AccAddress, ValAddress
 from any_tx_builder.tendermint.utils import dict_to_data
 
@@ -12,6 +31,38 @@ from any_tx_builder.tendermint.utils import dict_to_data
 class BaseTendermintData(Message):
     type: str
     type_url: str
+    type_amino: str
+    proto_type: Type[Message]
+
+    @classmethod
+    def from_data(cls, data: dict) -> "BaseTendermintData":
+        # Subclasses decode their own fields, the base class dispatches on "@type"
+        return MESSAGE_TYPES[data["@type"]].from_data(data)
+
+    @classmethod
+    def from_bytes(cls, value: bytes) -> "BaseTendermintData":
+        # Subclasses define from_proto, and from_fields when they have a specialized reader
+        from_fields = getattr(cls, "from_fields", None)
+        if from_fields is None:
+            # Messages without a specialized reader fall back on betterproto
+            return cls.from_proto(cls.proto_type().parse(value))
+        return from_fields(parse_fields(value))
+
+    @staticmethod
+    def unpack_any(proto: Any_pb) -> "BaseTendermintData":
+        return BaseTendermintData.unpack_any_bytes(proto.type_url, proto.value)
+
+    @staticmethod
+    def unpack_any_bytes(type_url: str, value: bytes) -> "BaseTendermintData":
+        message_type = MESSAGE_TYPES.get(type_url)
+        if message_type is None:
+            raise ValueError(f"Unknown message type: {type_url}")
+        return message_type.from_bytes(value)
+
+    @staticmethod
+    def from_any_bytes(value: bytes) -> "BaseTendermintData":
+        fields = parse_fields(value)
+        return BaseTendermintData.unpack_any_bytes(get_string(fields, 1), get_bytes(fields, 2))
 
     def to_data(self) -> dict:
         data = dict_to_data(attr.asdict(self))
@@ -19,28 +70,267 @@ class BaseTendermintData(Message):
         return data
 
     def to_json(self) -> str:
-        return json.dumps(self.to_data(), sort_keys=True, separators=(",", ":"))
+        # Same bytes as json.dumps(self.to_data(), sort_keys=True, separators=(",", ":"))
+        return serializer(type(self))(self)
+
+    def to_amino_json(self) -> str:
+        return (
+            '{"type":' + encode_string(self.type_amino)
+            + ',"value":' + serializer(type(self), amino=True)(self) + "}"
+        )
 
     @abstractmethod
     def to_proto(self):
         pass
 
     def pack_any(self) -> Any_pb:
-        return Any_pb(type_url=self.type_url, value=bytes(self.to_proto()))
+        return Any_pb(type_url=self.type_url, value=self.to_bytes())
+
+    def to_bytes(self) -> bytes:
+        # Messages without a specialized writer fall back on betterproto
+        return bytes(self.to_proto())
+
+    def pack_any_bytes(self) -> bytes:
+        return encode_any(self.type_url, self.to_bytes())
 
 
 @attr.s
 class MsgDelegate_(BaseTendermintData):
     type_url = "/cosmos.staking.v1beta1.MsgDelegate"
+    type_amino = "cosmos-sdk/MsgDelegate"
     action = "delegate"
+    proto_type = MsgDelegate
 
     delegator_address: AccAddress = attr.ib()
     validator_address: ValAddress = attr.ib()
     amount: Coin_ = attr.ib(converter=Coin_.parse)
 
+    @classmethod
+    def from_data(cls, data: dict):
+        return cls(data["delegator_address"], data["validator_address"], Coin_.from_data(data["amount"]))
+
+    @classmethod
+    def from_fields(cls, fields: dict):
+        return cls(get_string(fields, 1), get_string(fields, 2), Coin_.from_bytes(get_bytes(fields, 3)))
+
+    @classmethod
+    def from_proto(cls, proto: MsgDelegate):
+        return cls(proto.delegator_address, proto.validator_address, Coin_.from_proto(proto.amount))
+
     def to_proto(self) -> MsgDelegate:
         return MsgDelegate(
             delegator_address=self.delegator_address,
             validator_address=self.validator_address,
             amount=self.amount.to_proto(),
         )
+
+    def to_bytes(self) -> bytes:
+        return encode_msg_delegate(self.delegator_address, self.validator_address, self.amount.to_bytes())
+
+
+@attr.s
+class MsgUndelegate_(BaseTendermintData):
+    type_url = "/cosmos.staking.v1beta1.MsgUndelegate"
+    type_amino = "cosmos-sdk/MsgUndelegate"
+    action = "undelegate"
+    proto_type = MsgUndelegate
+
+    delegator_address: AccAddress = attr.ib()
+    validator_address: ValAddress = attr.ib()
+    amount: Coin_ = attr.ib(converter=Coin_.parse)
+
+    @classmethod
+    def from_data(cls, data: dict):
+        return cls(data["delegator_address"], data["validator_address"], Coin_.from_data(data["amount"]))
+
+    @classmethod
+    def from_fields(cls, fields: dict):
+        return cls(get_string(fields, 1), get_string(fields, 2), Coin_.from_bytes(get_bytes(fields, 3)))
+
+    @classmethod
+    def from_proto(cls, proto: MsgUndelegate):
+        return cls(proto.delegator_address, proto.validator_address, Coin_.from_proto(proto.amount))
+
+    def to_proto(self) -> MsgUndelegate:
+        return MsgUndelegate(
+            delegator_address=self.delegator_address,
+            validator_address=self.validator_address,
+            amount=self.amount.to_proto(),
+        )
+
+    def to_bytes(self) -> bytes:
+        return encode_msg_delegate(self.delegator_address, self.validator_address, self.amount.to_bytes())
+
+
+@attr.s
+class MsgBeginRedelegate_(BaseTendermintData):
+    type_url = "/cosmos.staking.v1beta1.MsgBeginRedelegate"
+    type_amino = "cosmos-sdk/MsgBeginRedelegate"
+    action = "begin_redelegate"
+    proto_type = MsgBeginRedelegate
+
+    delegator_address: AccAddress = attr.ib()
+    validator_src_address: ValAddress = attr.ib()
+    validator_dst_address: ValAddress = attr.ib()
+    amount: Coin_ = attr.ib(converter=Coin_.parse)
+
+    @classmethod
+    def from_data(cls, data: dict):
+        return cls(
+            data["delegator_address"],
+            data["validator_src_address"],
+            data["validator_dst_address"],
+            Coin_.from_data(data["amount"]),
+        )
+
+    @classmethod
+    def from_fields(cls, fields: dict):
+        return cls(
+            get_string(fields, 1),
+            get_string(fields, 2),
+            get_string(fields, 3),
+            Coin_.from_bytes(get_bytes(fields, 4)),
+        )
+
+    @classmethod
+    def from_proto(cls, proto: MsgBeginRedelegate):
+        return cls(
+            proto.delegator_address,
+            proto.validator_src_address,
+            proto.validator_dst_address,
+            Coin_.from_proto(proto.amount),
+        )
+
+    def to_proto(self) -> MsgBeginRedelegate:
+        return MsgBeginRedelegate(
+            delegator_address=self.delegator_address,
+            validator_src_address=self.validator_src_address,
+            validator_dst_address=self.validator_dst_address,
+            amount=self.amount.to_proto(),
+        )
+
+    def to_bytes(self) -> bytes:
+        return encode_msg_begin_redelegate(
+            self.delegator_address, self.validator_src_address, self.validator_dst_address, self.amount.to_bytes()
+        )
+
+
+@attr.s
+class MsgWithdrawDelegatorReward_(BaseTendermintData):
+    type_url = "/cosmos.distribution.v1beta1.MsgWithdrawDelegatorReward"
+    type_amino = "cosmos-sdk/MsgWithdrawDelegationReward"
+    action = "withdraw_delegator_reward"
+    proto_type = MsgWithdrawDelegatorReward
+
+    delegator_address: AccAddress = attr.ib()
+    validator_address: ValAddress = attr.ib()
+
+    @classmethod
+    def from_data(cls, data: dict):
+        return cls(data["delegator_address"], data["validator_address"])
+
+    @classmethod
+    def from_fields(cls, fields: dict):
+        return cls(get_string(fields, 1), get_string(fields, 2))
+
+    @classmethod
+    def from_proto(cls, proto: MsgWithdrawDelegatorReward):
+        return cls(proto.delegator_address, proto.validator_address)
+
+    def to_proto(self) -> MsgWithdrawDelegatorReward:
+        return MsgWithdrawDelegatorReward(
+            delegator_address=self.delegator_address,
+            validator_address=self.validator_address,
+        )
+
+    def to_bytes(self) -> bytes:
+        return encode_msg_withdraw_delegator_reward(self.delegator_address, self.validator_address)
+
+
+@attr.s
+class MsgSend_(BaseTendermintData):
+    type_url = "/cosmos.bank.v1beta1.MsgSend"
+    type_amino = "cosmos-sdk/MsgSend"
+    action = "send"
+    proto_type = MsgSend
+
+    from_address: AccAddress = attr.ib()
+    to_address: AccAddress = attr.ib()
+    amount: List[Coin_] = attr.ib(converter=lambda coins: [Coin_.parse(coin) for coin in coins])
+
+    @classmethod
+    def from_data(cls, data: dict):
+        return cls(data["from_address"], data["to_address"], [Coin_.from_data(coin) for coin in data["amount"]])
+
+    @classmethod
+    def from_fields(cls, fields: dict):
+        return cls(get_string(fields, 1), get_string(fields, 2), [Coin_.from_bytes(c) for c in get_repeated(fields, 3)])
+
+    @classmethod
+    def from_proto(cls, proto: MsgSend):
+        return cls(proto.from_address, proto.to_address, [Coin_.from_proto(coin) for coin in proto.amount])
+
+    def to_proto(self) -> MsgSend:
+        return MsgSend(
+            from_address=self.from_address,
+            to_address=self.to_address,
+            amount=[coin.to_proto() for coin in self.amount],
+        )
+
+    def to_bytes(self) -> bytes:
+        return encode_msg_send(self.from_address, self.to_address, [coin.to_bytes() for coin in self.amount])
+
+
+@attr.s
+class MsgExec_(BaseTendermintData):
+    """authz MsgExec: `grantee` executes `msgs` on behalf of their signers, who granted it."""
+
+    type_url = "/cosmos.authz.v1beta1.MsgExec"
+    type_amino = "cosmos-sdk/MsgExec"
+    action = "exec"
+    proto_type = MsgExec
+
+    grantee: AccAddress = attr.ib()
+    msgs: List[BaseTendermintData] = attr.ib(converter=list)
+
+    @classmethod
+    def from_data(cls, data: dict):
+        return cls(data["grantee"], [BaseTendermintData.from_data(msg) for msg in data["msgs"]])
+
+    @classmethod
+    def from_fields(cls, fields: dict):
+        return cls(get_string(fields, 1), [BaseTendermintData.from_any_bytes(m) for m in get_repeated(fields, 2)])
+
+    @classmethod
+    def from_proto(cls, proto: MsgExec):
+        return cls(proto.grantee, [BaseTendermintData.unpack_any(msg) for msg in proto.msgs])
+
+    def to_data(self) -> dict:
+        return {"@type": self.type_url, "grantee": self.grantee, "msgs": [msg.to_data() for msg in self.msgs]}
+
+    def to_amino_json(self) -> str:
+        return (
+            '{"type":' + encode_string(self.type_amino)
+            + ',"value":{"grantee":' + encode_string(self.grantee)
+            + ',"msgs":[' + ",".join(msg.to_amino_json() for msg in self.msgs) + "]}}"
+        )
+
+    def to_proto(self) -> MsgExec:
+        return MsgExec(grantee=self.grantee, msgs=[msg.pack_any() for msg in self.msgs])
+
+    def to_bytes(self) -> bytes:
+        return encode_msg_exec(self.grantee, [msg.pack_any_bytes() for msg in self.msgs])
+
+
+# type_url -> message class, resolved once at import
+MESSAGE_TYPES: Dict[str, Type[BaseTendermintData]] = {
+    message_type.type_url: message_type
+    for message_type in (
+        MsgDelegate_,
+        MsgUndelegate_,
+        MsgBeginRedelegate_,
+        MsgWithdrawDelegatorReward_,
+        MsgSend_,
+        MsgExec_,
+    )
+}
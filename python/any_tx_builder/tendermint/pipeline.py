@@ -0,0 +1,253 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+import attr
+
+from any_tx_builder.instrumentation import TENDERMINT, log_event
+from any_tx_builder.tendermint.async_client import AsyncTendermintClient
+from any_tx_builder.tendermint.events import TX_QUERY, TendermintEventClient
+from any_tx_builder.tendermint.transactions import Tx_
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_POLL_INTERVAL = 1.0
+# Blocks a broadcast transaction may take to be included before it is looked up by hash
+DEFAULT_INCLUSION_TIMEOUT_BLOCKS = 20
+# Blocks a Tx event is kept for when it comes before the broadcast response of its tx
+EARLY_TX_EVENT_BLOCKS = 2
+
+
+@attr.s
+class TxResult:
+    txhash: str = attr.ib()
+    code: int = attr.ib(converter=int)
+    height: Optional[int] = attr.ib(default=None)
+    gas_wanted: int = attr.ib(default=0, converter=int)
+    gas_used: int = attr.ib(default=0, converter=int)
+    raw_log: str = attr.ib(default="")
+
+    @property
+    def success(self) -> bool:
+        return self.code == 0 and self.height is not None
+
+    @classmethod
+    def from_data(cls, data: dict):
+        return cls(
+            data["txhash"],
+            data.get("code") or 0,
+            int(data["height"]) if data.get("height") and int(data["height"]) else None,
+            data.get("gas_wanted") or 0,
+            data.get("gas_used") or 0,
+            data.get("raw_log") or "",
+        )
+
+
+class _PendingTx:
+    __slots__ = ("tx", "future", "deadline_height")
+
+    def __init__(self, tx: Tx_, future: asyncio.Future):
+        self.tx = tx
+        self.future = future
+        self.deadline_height: Optional[int] = None
+
+
+class BroadcastPipeline:
+    """
+    Broadcast signed transactions with BROADCAST_MODE_SYNC and track their inclusion.
+
+    Transactions are queued per signer and broadcast in sequence order, signers running
+    concurrently. Inclusion is tracked once per block with a single tx.height search for
+    every pending transaction, and each submitted future resolves to a TxResult: right
+    away when CheckTx rejects it, or with the DeliverTx code and gas used once included.
+
+    With an `events` client, NewBlock and Tx events pushed by the node replace the block
+    polling; without Tx subscriptions of its own, every Tx event is subscribed to.
+    """
+
+    def __init__(
+        self,
+        client: AsyncTendermintClient,
+        poll_interval: float = DEFAULT_BLOCK_POLL_INTERVAL,
+        timeout_blocks: int = DEFAULT_INCLUSION_TIMEOUT_BLOCKS,
+        events: Optional[TendermintEventClient] = None,
+    ):
+        self.client = client
+        self.events = events
+        self.poll_interval = poll_interval
+        self.timeout_blocks = timeout_blocks
+        self._queues: Dict[bytes, asyncio.PriorityQueue] = {}
+        self._workers: List[asyncio.Task] = []
+        self._pending: Dict[str, _PendingTx] = {}
+        # Tx events of hashes not pending yet, by hash
+        self._early_txs: Dict[str, dict] = {}
+        self._tracker: Optional[asyncio.Task] = None
+        self._last_height: Optional[int] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def submit(self, tx: Tx_) -> asyncio.Future:
+        """Queue a signed transaction, the returned future resolves to its TxResult."""
+        future = asyncio.get_running_loop().create_future()
+        # The last signer info is the one sign_tx appended
+        signer_info = tx.auth_info.signer_infos[-1]
+        signer = signer_info.public_key.key
+        queue = self._queues.get(signer)
+        if queue is None:
+            queue = self._queues[signer] = asyncio.PriorityQueue()
+            self._workers.append(asyncio.create_task(self._broadcast_worker(queue)))
+        queue.put_nowait((signer_info.sequence, id(tx), _PendingTx(tx, future)))
+        if self._tracker is None:
+            self._tracker = asyncio.create_task(
+                self._track_events() if self.events is not None else self._track_inclusion()
+            )
+        return future
+
+    async def broadcast_many(self, txs: List[Tx_]) -> List[TxResult]:
+        return await asyncio.gather(*(self.submit(tx) for tx in txs))
+
+    async def _broadcast_worker(self, queue: asyncio.PriorityQueue):
+        while True:
+            _, _, pending = await queue.get()
+            try:
+                result = await self.client._broadcast(pending.tx)
+                tx_response = result.get("tx_response")
+                if not tx_response:
+                    raise RuntimeError(f"Broadcast failed: {result.get('message') or result}")
+                txhash = tx_response.get("txhash") or pending.tx.to_hash()
+                if int(tx_response.get("code") or 0) != 0:
+                    pending.future.set_result(TxResult.from_data({**tx_response, "txhash": txhash}))
+                else:
+                    self._pending[txhash] = pending
+                    early_tx_response = self._early_txs.pop(txhash, None)
+                    if early_tx_response is not None:
+                        self._resolve(early_tx_response)
+            except Exception as error:
+                if not pending.future.done():
+                    pending.future.set_exception(error)
+            finally:
+                queue.task_done()
+
+    def _resolve(self, tx_response: dict):
+        pending = self._pending.pop(tx_response["txhash"], None)
+        if pending is None or pending.future.done():
+            return
+        self.client.record_gas_used(pending.tx, tx_response)
+        pending.future.set_result(TxResult.from_data(tx_response))
+
+    async def _expire(self, height: int):
+        expired = [
+            txhash for txhash, pending in self._pending.items()
+            if pending.deadline_height is not None and height > pending.deadline_height
+        ]
+        # Missed by the height search (pruned or unindexed blocks), looked up by hash once
+        responses = await asyncio.gather(*(self.client.get_tx(txhash) for txhash in expired))
+        for txhash, tx_response in zip(expired, responses):
+            if tx_response is not None:
+                self._resolve(tx_response)
+                continue
+            pending = self._pending.pop(txhash)
+            if not pending.future.done():
+                pending.future.set_exception(
+                    asyncio.TimeoutError(f"Transaction {txhash} not included after {self.timeout_blocks} blocks")
+                )
+
+    def _set_deadlines(self, height: int):
+        for pending in self._pending.values():
+            if pending.deadline_height is None:
+                pending.deadline_height = height + self.timeout_blocks
+
+    async def _search_blocks(self, heights: range):
+        for tx_responses in await asyncio.gather(*(self.client.get_txs_by_height(h) for h in heights)):
+            for tx_response in tx_responses:
+                self._resolve(tx_response)
+
+    async def _track_inclusion(self):
+        while True:
+            try:
+                height = await self.client.get_latest_height()
+                if not self._pending or self._last_height is None:
+                    # Idle, follow the chain: a broadcast in flight may land in the latest block
+                    self._last_height = height - 1
+                else:
+                    self._set_deadlines(height)
+                    await self._search_blocks(range(self._last_height + 1, height + 1))
+                    self._last_height = height
+                    await self._expire(height)
+            except Exception as error:
+                # Node unreachable or unexpected response, the next poll tries again
+                log_event(logger, logging.WARNING, "inclusion_tracking_failed", chain=TENDERMINT, error=repr(error))
+            await asyncio.sleep(self.poll_interval)
+
+    async def _track_events(self):
+        await self.events.subscribe_new_blocks()
+        if not self.events.has_tx_subscription():
+            await self.events.subscribe(TX_QUERY)
+        self.events.start()
+        reconnects, dropped = self.events.reconnects, self.events.dropped
+        while True:
+            event = await self.events.get()
+            if event.type == "Tx":
+                tx_response = event.to_tx_response()
+                if tx_response["txhash"] in self._pending:
+                    self._resolve(tx_response)
+                else:
+                    # The broadcast response may still be on its way, kept for the worker
+                    self._early_txs[tx_response["txhash"]] = tx_response
+                continue
+            if event.type != "NewBlock":
+                continue
+            self._early_txs = {
+                txhash: tx_response for txhash, tx_response in self._early_txs.items()
+                if int(tx_response["height"]) > event.height - EARLY_TX_EVENT_BLOCKS
+            }
+            # Tx events follow the NewBlock of their block. Blocks whose events may have been
+            # missed, across a reconnection or dropped by a full queue, are searched instead.
+            first_missed = event.height
+            if self._last_height is not None:
+                first_missed = self._last_height + 1
+                if (self.events.reconnects, self.events.dropped) != (reconnects, dropped):
+                    first_missed = self._last_height
+            reconnects, dropped = self.events.reconnects, self.events.dropped
+            self._set_deadlines(event.height)
+            try:
+                if self._pending and first_missed < event.height:
+                    await self._search_blocks(range(first_missed, event.height))
+                self._last_height = event.height
+                await self._expire(event.height)
+            except Exception as error:
+                log_event(logger, logging.WARNING, "inclusion_tracking_failed", chain=TENDERMINT, error=repr(error))
+
+    async def drain(self):
+        """Wait until every submitted transaction is resolved."""
+        for queue in list(self._queues.values()):
+            await queue.join()
+        while self._pending:
+            if self._tracker is not None and self._tracker.done():
+                self._fail_pending(self._tracker)
+                break
+            await asyncio.sleep(self.poll_interval)
+
+    def _fail_pending(self, tracker: asyncio.Task):
+        # Nothing left to resolve the pending futures, fail them rather than wait forever
+        error = None if tracker.cancelled() else tracker.exception()
+        for txhash, pending in list(self._pending.items()):
+            del self._pending[txhash]
+            if not pending.future.done():
+                pending.future.set_exception(
+                    RuntimeError(f"Inclusion tracking of {txhash} stopped: {error!r}")
+                )
+
+    async def close(self):
+        await self.drain()
+        tasks = self._workers + ([self._tracker] if self._tracker else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._queues.clear()
+        self._tracker = None
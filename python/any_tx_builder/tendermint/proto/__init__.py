@@ -4,10 +4,13 @@ from typing import List
 from betterproto import (
     Enum,
     Message,
+    ServiceStub,
     bytes_field,
     enum_field,
+    int64_field,
     message_field,
     string_field,
+    uint32_field,
     uint64_field,
 )
 from betterproto.lib.google.protobuf import Any as Any_pb
@@ -80,6 +83,40 @@ class MsgDelegate(Message):
     amount: "Coin" = message_field(3)
 
 
+@dataclass(eq=False, repr=False)
+class MsgUndelegate(Message):
+    delegator_address: str = string_field(1)
+    validator_address: str = string_field(2)
+    amount: "Coin" = message_field(3)
+
+
+@dataclass(eq=False, repr=False)
+class MsgBeginRedelegate(Message):
+    delegator_address: str = string_field(1)
+    validator_src_address: str = string_field(2)
+    validator_dst_address: str = string_field(3)
+    amount: "Coin" = message_field(4)
+
+
+@dataclass(eq=False, repr=False)
+class MsgWithdrawDelegatorReward(Message):
+    delegator_address: str = string_field(1)
+    validator_address: str = string_field(2)
+
+
+@dataclass(eq=False, repr=False)
+class MsgSend(Message):
+    from_address: str = string_field(1)
+    to_address: str = string_field(2)
+    amount: List["Coin"] = message_field(3)
+
+
+@dataclass(eq=False, repr=False)
+class MsgExec(Message):
+    grantee: str = string_field(1)
+    msgs: List[Any_pb] = message_field(2)
+
+
 #
 # Transactions
 #
@@ -120,3 +157,93 @@ class Tx(Message):
     body: "TxBody" = message_field(1)
     auth_info: "AuthInfo" = message_field(2)
     signatures: List[bytes] = bytes_field(3)
+
+
+@dataclass(eq=False, repr=False)
+class TxRaw(Message):
+    body_bytes: bytes = bytes_field(1)
+    auth_info_bytes: bytes = bytes_field(2)
+    signatures: List[bytes] = bytes_field(3)
+
+
+#
+# Services
+#
+
+
+@dataclass(eq=False, repr=False)
+class BaseAccount(Message):
+    address: str = string_field(1)
+    pub_key: Any_pb = message_field(2)
+    account_number: int = uint64_field(3)
+    sequence: int = uint64_field(4)
+
+
+@dataclass(eq=False, repr=False)
+class QueryAccountRequest(Message):
+    address: str = string_field(1)
+
+
+@dataclass(eq=False, repr=False)
+class QueryAccountResponse(Message):
+    account: Any_pb = message_field(1)
+
+
+class BroadcastMode(Enum):
+    BROADCAST_MODE_UNSPECIFIED = 0
+    BROADCAST_MODE_BLOCK = 1
+    BROADCAST_MODE_SYNC = 2
+    BROADCAST_MODE_ASYNC = 3
+
+
+@dataclass(eq=False, repr=False)
+class GasInfo(Message):
+    gas_wanted: int = uint64_field(1)
+    gas_used: int = uint64_field(2)
+
+
+@dataclass(eq=False, repr=False)
+class SimulateRequest(Message):
+    tx_bytes: bytes = bytes_field(2)
+
+
+@dataclass(eq=False, repr=False)
+class SimulateResponse(Message):
+    gas_info: "GasInfo" = message_field(1)
+
+
+@dataclass(eq=False, repr=False)
+class TxResponse(Message):
+    height: int = int64_field(1)
+    txhash: str = string_field(2)
+    codespace: str = string_field(3)
+    code: int = uint32_field(4)
+    data: str = string_field(5)
+    raw_log: str = string_field(6)
+    info: str = string_field(8)
+    gas_wanted: int = int64_field(9)
+    gas_used: int = int64_field(10)
+
+
+@dataclass(eq=False, repr=False)
+class BroadcastTxRequest(Message):
+    tx_bytes: bytes = bytes_field(1)
+    mode: "BroadcastMode" = enum_field(2)
+
+
+@dataclass(eq=False, repr=False)
+class BroadcastTxResponse(Message):
+    tx_response: "TxResponse" = message_field(1)
+
+
+class AuthQueryStub(ServiceStub):
+    async def account(self, request: QueryAccountRequest) -> QueryAccountResponse:
+        return await self._unary_unary("/cosmos.auth.v1beta1.Query/Account", request, QueryAccountResponse)
+
+
+class TxServiceStub(ServiceStub):
+    async def simulate(self, request: SimulateRequest) -> SimulateResponse:
+        return await self._unary_unary("/cosmos.tx.v1beta1.Service/Simulate", request, SimulateResponse)
+
+    async def broadcast_tx(self, request: BroadcastTxRequest) -> BroadcastTxResponse:
+        return await self._unary_unary("/cosmos.tx.v1beta1.Service/BroadcastTx", request, BroadcastTxResponse)
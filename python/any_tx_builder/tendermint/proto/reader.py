@@ -0,0 +1,74 @@
+########################################################
+#
+# Protobuf reader
+#
+# Counterpart of writer.py for decoding transactions at volume: fields are split
+# in a single pass and each message picks the ones it knows, without betterproto's
+# per-field reflection. Unknown fields are skipped.
+#
+########################################################
+from typing import Dict, List, Tuple, Union
+
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LEN = 2
+WIRE_FIXED32 = 5
+
+FieldValue = Union[int, bytes]
+
+
+def decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = data[pos]
+    if value < 0x80:
+        return value, pos + 1
+    result, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def parse_fields(data: bytes) -> Dict[int, List[FieldValue]]:
+    """Field number -> values in wire order: ints for varints, bytes for everything else."""
+    fields: Dict[int, List[FieldValue]] = {}
+    pos, end = 0, len(data)
+    while pos < end:
+        key, pos = decode_varint(data, pos)
+        wire_type = key & 0x7
+        if wire_type == WIRE_VARINT:
+            value, pos = decode_varint(data, pos)
+        elif wire_type == WIRE_LEN:
+            length, pos = decode_varint(data, pos)
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == WIRE_FIXED64:
+            value = data[pos:pos + 8]
+            pos += 8
+        elif wire_type == WIRE_FIXED32:
+            value = data[pos:pos + 4]
+            pos += 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        fields.setdefault(key >> 3, []).append(value)
+    return fields
+
+
+def get_bytes(fields: Dict[int, List[FieldValue]], number: int) -> bytes:
+    values = fields.get(number)
+    return values[-1] if values else b""
+
+
+def get_string(fields: Dict[int, List[FieldValue]], number: int) -> str:
+    return get_bytes(fields, number).decode()
+
+
+def get_int(fields: Dict[int, List[FieldValue]], number: int) -> int:
+    values = fields.get(number)
+    return values[-1] if values else 0
+
+
+def get_repeated(fields: Dict[int, List[FieldValue]], number: int) -> List[FieldValue]:
+    return fields.get(number, [])
@@ -0,0 +1,146 @@
+########################################################
+#
+# Chain registry
+#
+# Chain configs loaded from a JSON file, with clients created on first use of a chain
+# and shared by every wallet of that chain. Sync and async clients of every chain share a
+# single connection pool each, every client keeping its own per-endpoint concurrency limits.
+#
+########################################################
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import httpx
+import requests
+
+from any_tx_builder.tendermint.async_client import DEFAULT_MAX_CONNECTIONS, DEFAULT_TIMEOUT, AsyncTendermintClient
+from any_tx_builder.tendermint.builder import Wallet
+from any_tx_builder.tendermint.client import TendermintClient
+from any_tx_builder.tendermint.config import TENDERMINT_SETUP, TendermintChainConfig
+from any_tx_builder.tendermint.gas import GasEstimateCache
+from any_tx_builder.tendermint.grpc_client import GrpcTendermintClient
+from any_tx_builder.tendermint.types import AccAddress
+
+
+class ChainRegistry:
+    """
+    Tendermint chains by name, e.g. "cosmos" or "osmosis".
+
+    Nothing is created for a chain until its client is first asked for, so a registry of
+    many chains costs one config parse at startup. `gas_cache` is shared by every chain,
+    its keys include the chain id.
+    """
+
+    def __init__(
+        self,
+        chains: Iterable[TendermintChainConfig],
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        gas_cache: Optional[GasEstimateCache] = None,
+    ):
+        self.configs: Dict[str, TendermintChainConfig] = {config.chain: config for config in chains}
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.gas_cache = gas_cache
+        self._clients: Dict[str, TendermintClient] = {}
+        self._async_clients: Dict[str, AsyncTendermintClient] = {}
+        self._session: Optional[requests.Session] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        # Sync clients may be asked for from several threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> "ChainRegistry":
+        """
+        Registry of a JSON file mapping chain names to TendermintChainConfig fields:
+        {"osmosis": {"rpc_url": "...", "denom": "uosmo", "chain_id": "osmosis-1", ...}}
+        """
+        with open(path) as file:
+            data = json.load(file)
+        return cls((TendermintChainConfig(chain=chain, **config) for chain, config in data.items()), **kwargs)
+
+    @classmethod
+    def default(cls, **kwargs) -> "ChainRegistry":
+        return cls(TENDERMINT_SETUP.values(), **kwargs)
+
+    def __contains__(self, chain: str) -> bool:
+        return chain in self.configs
+
+    def config(self, chain: str) -> TendermintChainConfig:
+        config = self.configs.get(chain)
+        if config is None:
+            raise KeyError(f"Unknown Tendermint chain: {chain}")
+        return config
+
+    def client(self, chain: str) -> TendermintClient:
+        client = self._clients.get(chain)
+        if client is not None:
+            return client
+        config = self.config(chain)
+        with self._lock:
+            if chain not in self._clients:
+                if self._session is None:
+                    self._session = requests.Session()
+                self._clients[chain] = TendermintClient(
+                    config.rpc_url,
+                    config.base_gas_price,
+                    config.denom,
+                    config.chain_id,
+                    config.gas_adjustment,
+                    self.gas_cache,
+                    self._session,
+                    endpoint_limits=config.endpoint_limits,
+                )
+            return self._clients[chain]
+
+    def async_client(self, chain: str) -> AsyncTendermintClient:
+        client = self._async_clients.get(chain)
+        if client is not None:
+            return client
+        config = self.config(chain)
+        if self._http_client is None:
+            limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            self._http_client = httpx.AsyncClient(timeout=self.timeout, limits=limits)
+        options = dict(
+            chain_id=config.chain_id,
+            gas_adjustment=config.gas_adjustment,
+            gas_cache=self.gas_cache,
+            timeout=self.timeout,
+            endpoint_limits=config.endpoint_limits,
+            http_client=self._http_client,
+            fallback_urls=config.fallback_urls,
+        )
+        if config.grpc_url:
+            client = GrpcTendermintClient(
+                config.grpc_url, config.rpc_url, config.base_gas_price, config.denom, **options
+            )
+        else:
+            client = AsyncTendermintClient(config.rpc_url, config.base_gas_price, config.denom, **options)
+        self._async_clients[chain] = client
+        return client
+
+    def wallet(self, chain: str, acc_address: AccAddress, **account_info) -> Wallet:
+        return Wallet(self.client(chain), acc_address, **account_info)
+
+    def wallet_from_mnemonic(
+        self, chain: str, mnemonic: str, account: int = 0, index: int = 0, **account_info
+    ) -> Wallet:
+        """Wallet derived with the chain's coin type and bech32 prefix."""
+        config = self.config(chain)
+        return Wallet.from_mnemonic(
+            self.client(chain), mnemonic, config.coin_type, account, index, config.bech32_prefix, **account_info
+        )
+
+    async def close(self):
+        for client in self._async_clients.values():
+            await client.close()
+        self._async_clients.clear()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self._clients.clear()
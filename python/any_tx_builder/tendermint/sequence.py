@@ -0,0 +1,133 @@
+import re
+import threading
+from typing import Optional
+
+from any_tx_builder.instrumentation import TENDERMINT, span
+from any_tx_builder.tendermint.client import TendermintClient
+from any_tx_builder.tendermint.types import AccAddress
+
+# raw_log of a tx rejected by the ante handler for a wrong sequence (code 32)
+SEQUENCE_MISMATCH_PATTERN = re.compile(r"account sequence mismatch, expected (\d+), got (\d+)")
+SEQUENCE_MISMATCH_CODE = 32
+
+
+def parse_sequence_mismatch(raw_log: str) -> Optional[int]:
+    match = SEQUENCE_MISMATCH_PATTERN.search(raw_log or "")
+    return int(match.group(1)) if match else None
+
+
+class SequenceManager:
+    """
+    Local sequence allocator for one account.
+
+    Sequences are handed out locally so many transactions can be signed and broadcast
+    from the same account within a block; the chain is only queried on first use or
+    when a broadcast reports a sequence mismatch.
+    """
+
+    def __init__(
+        self,
+        client: TendermintClient,
+        acc_address: AccAddress,
+        account_number: Optional[int] = None,
+        sequence: Optional[int] = None,
+    ):
+        self.client = client
+        self.acc_address = acc_address
+        self.account_number = int(account_number) if account_number is not None else None
+        self._next_sequence = int(sequence) if sequence is not None else None
+        # On chain public key, as returned by the LCD, known once the account signed a transaction
+        self.pub_key: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def _sync(self):
+        with span("sequence_lookup", chain=TENDERMINT):
+            account_info = self.client.get_account_info(self.acc_address)
+        if account_info is None:
+            raise ValueError(f"Account {self.acc_address} not found on chain, it must receive funds first")
+        self.account_number = int(account_info.get("account_number"))
+        self._next_sequence = int(account_info.get("sequence"))
+        self.pub_key = account_info.get("pub_key")
+
+    def get_account_number(self) -> int:
+        """Account number, fetched with the sequence on first use."""
+        with self._lock:
+            if self.account_number is None:
+                next_sequence = self._next_sequence
+                self._sync()
+                # A locally known sequence is ahead of the chain, keep it
+                if next_sequence is not None:
+                    self._next_sequence = next_sequence
+            return self.account_number
+
+    def get_pub_key(self) -> Optional[dict]:
+        """On chain public key, fetched until the account has one."""
+        with self._lock:
+            if self.pub_key is None:
+                next_sequence = self._next_sequence
+                self._sync()
+                # A locally known sequence is ahead of the chain, keep it
+                if next_sequence is not None:
+                    self._next_sequence = next_sequence
+            return self.pub_key
+
+    def peek(self) -> int:
+        """Sequence the next signed transaction will use."""
+        with self._lock:
+            if self._next_sequence is None:
+                self._sync()
+            return self._next_sequence
+
+    def next(self) -> int:
+        """Allocate a sequence for a transaction about to be signed."""
+        with self._lock:
+            if self._next_sequence is None:
+                self._sync()
+            sequence = self._next_sequence
+            self._next_sequence += 1
+            return sequence
+
+    def next_many(self, count: int) -> range:
+        """Allocate consecutive sequences for transactions signed together."""
+        with self._lock:
+            if self._next_sequence is None:
+                self._sync()
+            first = self._next_sequence
+            self._next_sequence += count
+            return range(first, first + count)
+
+    def release(self, sequence: int):
+        """Give back a sequence whose transaction never made it to the mempool."""
+        with self._lock:
+            if self._next_sequence is not None and sequence == self._next_sequence - 1:
+                self._next_sequence = sequence
+
+    def resync(self, expected: Optional[int] = None):
+        """Reset to the sequence expected by the chain, fetched from the LCD when unknown."""
+        with self._lock:
+            if expected is None:
+                self._sync()
+            else:
+                self._next_sequence = expected
+
+    def handle_broadcast_result(self, result: dict, sequence: int) -> bool:
+        """
+        Inspect a BROADCAST_MODE_SYNC response for the transaction signed with `sequence`.
+
+        Returns True when the transaction was rejected and the local sequence was adjusted.
+        """
+        tx_response = result.get("tx_response")
+        if not tx_response:
+            # LCD error body, e.g. {"code": 3, "message": ...}: whether the tx reached the mempool is unknown
+            self.resync()
+            return True
+        code = int(tx_response.get("code", 0))
+        if code == 0:
+            return False
+        if code == SEQUENCE_MISMATCH_CODE:
+            expected = parse_sequence_mismatch(tx_response.get("raw_log"))
+            self.resync(expected)
+        else:
+            # Rejected by CheckTx, the sequence was not consumed
+            self.release(sequence)
+        return True
@@ -3,6 +3,8 @@ from typing import List, Optional
 import attr
 from any_tx_builder.tendermint.coin import Coin_
 from any_tx_builder.tendermint.proto import Fee
+from any_tx_builder.tendermint.proto.reader import get_int, get_repeated, get_string, parse_fields
+from any_tx_builder.tendermint.proto.writer import encode_fee
 from any_tx_builder.tendermint.types import AccAddress
 
 
@@ -21,6 +23,20 @@ class Fee_:
             "granter": str(self.granter),
         }
 
+    @classmethod
+    def from_proto(cls, proto: Fee):
+        return cls(proto.gas_limit, [Coin_.from_proto(coin) for coin in proto.amount], proto.payer, proto.granter)
+
+    @classmethod
+    def from_bytes(cls, value: bytes):
+        fields = parse_fields(value)
+        return cls(
+            get_int(fields, 2),
+            [Coin_.from_bytes(coin) for coin in get_repeated(fields, 1)],
+            get_string(fields, 3),
+            get_string(fields, 4),
+        )
+
     def to_proto(self) -> Fee:
         return Fee(
             amount=[coin.to_proto() for coin in self.amount],
@@ -28,3 +44,6 @@ class Fee_:
             payer=self.payer,
             granter=self.granter,
         )
+
+    def to_bytes(self) -> bytes:
+        return encode_fee([coin.to_bytes() for coin in self.amount], self.gas_limit, self.payer, self.granter)
@@ -4,6 +4,7 @@ import attr
 from any_tx_builder.tendermint.key import PublicKey
 from any_tx_builder.tendermint.transactions.transactions import AuthInfo_, TxBody_
 from any_tx_builder.tendermint.proto import SignDoc, SignMode
+from any_tx_builder.tendermint.proto.writer import encode_sign_doc
 
 
 @attr.s
@@ -40,7 +41,7 @@ class SignDoc_:
         )
 
     def to_bytes(self) -> bytes:
-        return bytes(self.to_proto())
+        return encode_sign_doc(self.tx_body.to_bytes(), self.auth_info.to_bytes(), self.chain_id, self.account_number)
 
 
 @attr.s
@@ -15,6 +15,15 @@ from any_tx_builder.tendermint.proto import (
     SignMode,
     Tx,
     TxBody,
+    TxRaw,
+)
+from any_tx_builder.tendermint.proto.reader import get_bytes, get_int, get_repeated, get_string, parse_fields
+from any_tx_builder.tendermint.proto.writer import (
+    encode_auth_info,
+    encode_mode_info_single,
+    encode_signer_info,
+    encode_tx_body,
+    encode_tx_raw,
 )
 
 
@@ -36,9 +45,20 @@ class ModeInfo_:
     def to_data(self) -> dict:
         return {"single": self.single.to_data()}
 
+    @classmethod
+    def from_proto(cls, proto: ModeInfo):
+        return cls(single=ModeInfoSingle_(SignMode(proto.single.mode)))
+
+    @classmethod
+    def from_bytes(cls, value: bytes):
+        return cls(single=ModeInfoSingle_(SignMode(get_int(parse_fields(get_bytes(parse_fields(value), 1)), 1))))
+
     def to_proto(self) -> ModeInfo:
         return ModeInfo(single=self.single.to_proto())
 
+    def to_bytes(self) -> bytes:
+        return encode_mode_info_single(self.single.mode)
+
 
 @attr.s
 class SignerInfo_:
@@ -53,6 +73,19 @@ class SignerInfo_:
             "sequence": self.sequence,
         }
 
+    @classmethod
+    def from_proto(cls, proto: SignerInfo):
+        return cls(proto.sequence, PublicKey.from_proto(proto.public_key), ModeInfo_.from_proto(proto.mode_info))
+
+    @classmethod
+    def from_bytes(cls, value: bytes):
+        fields = parse_fields(value)
+        return cls(
+            get_int(fields, 3),
+            PublicKey.from_any_bytes(get_bytes(fields, 1)),
+            ModeInfo_.from_bytes(get_bytes(fields, 2)),
+        )
+
     def to_proto(self) -> SignerInfo:
         return SignerInfo(
             public_key=self.public_key.pack_any(),
@@ -60,6 +93,9 @@ class SignerInfo_:
             sequence=self.sequence,
         )
 
+    def to_bytes(self) -> bytes:
+        return encode_signer_info(self.public_key.pack_any_bytes(), self.mode_info.to_bytes(), self.sequence)
+
 
 @attr.s
 class CreateTxOptions:
@@ -96,6 +132,9 @@ class TxBody_:
             timeout_height=self.timeout_height,
         )
 
+    def to_bytes(self) -> bytes:
+        return encode_tx_body([m.pack_any_bytes() for m in self.messages], self.memo, self.timeout_height)
+
     @classmethod
     def from_data(cls, data: dict):
         return cls(
@@ -104,11 +143,28 @@ class TxBody_:
             data["timeout_height"] if data["timeout_height"] else 0,
         )
 
+    @classmethod
+    def from_proto(cls, proto: TxBody):
+        return cls(
+            [BaseTendermintData.unpack_any(m) for m in proto.messages],
+            proto.memo,
+            proto.timeout_height,
+        )
+
+    @classmethod
+    def from_bytes(cls, value: bytes):
+        fields = parse_fields(value)
+        return cls(
+            [BaseTendermintData.from_any_bytes(m) for m in get_repeated(fields, 1)],
+            get_string(fields, 2),
+            get_int(fields, 3),
+        )
+
     def to_fireblocks_hex(self):
-        return bytes(self.to_proto()).hex()
+        return self.to_bytes().hex()
 
     def to_fireblocks_hash(self):
-        return hashlib.sha256(bytes(self.to_proto())).hexdigest()
+        return hashlib.sha256(self.to_bytes()).hexdigest()
 
 
 @attr.s
@@ -122,17 +178,29 @@ class AuthInfo_:
             "fee": self.fee.to_data(),
         }
 
+    @classmethod
+    def from_proto(cls, proto: AuthInfo):
+        return cls([SignerInfo_.from_proto(signer) for signer in proto.signer_infos], Fee_.from_proto(proto.fee))
+
+    @classmethod
+    def from_bytes(cls, value: bytes):
+        fields = parse_fields(value)
+        return cls([SignerInfo_.from_bytes(s) for s in get_repeated(fields, 1)], Fee_.from_bytes(get_bytes(fields, 2)))
+
     def to_proto(self) -> AuthInfo:
         return AuthInfo(
             signer_infos=[signer.to_proto() for signer in self.signer_infos],
             fee=self.fee.to_proto(),
         )
 
+    def to_bytes(self) -> bytes:
+        return encode_auth_info([signer.to_bytes() for signer in self.signer_infos], self.fee.to_bytes())
+
     def to_fireblocks_hex(self):
-        return bytes(self.to_proto()).hex()
+        return self.to_bytes().hex()
 
     def to_fireblocks_hash(self):
-        return hashlib.sha256(bytes(self.to_proto())).hexdigest()
+        return hashlib.sha256(self.to_bytes()).hexdigest()
 
 
 @attr.s
@@ -140,6 +208,9 @@ class Tx_:
     body: TxBody_ = attr.ib()
     auth_info: AuthInfo_ = attr.ib()
     signatures: List[bytes] = attr.ib(converter=list)
+    # Bytes the signatures were computed over, reused as is by to_bytes
+    body_bytes: Optional[bytes] = attr.ib(default=None, eq=False, repr=False)
+    auth_info_bytes: Optional[bytes] = attr.ib(default=None, eq=False, repr=False)
 
     def to_data(self) -> dict:
         return {
@@ -148,6 +219,33 @@ class Tx_:
             "signatures": [base64.b64encode(sig).decode("ascii") for sig in self.signatures],
         }
 
+    @classmethod
+    def from_bytes(cls, tx_bytes: bytes):
+        """Decode a TxRaw, keeping the signed bytes so that to_bytes gives them back unchanged."""
+        fields = parse_fields(tx_bytes)
+        body_bytes, auth_info_bytes = get_bytes(fields, 1), get_bytes(fields, 2)
+        return cls(
+            TxBody_.from_bytes(body_bytes),
+            AuthInfo_.from_bytes(auth_info_bytes),
+            list(get_repeated(fields, 3)),
+            body_bytes,
+            auth_info_bytes,
+        )
+
+    @classmethod
+    def from_proto(cls, proto: TxRaw):
+        return cls(
+            TxBody_.from_proto(TxBody().parse(proto.body_bytes)),
+            AuthInfo_.from_proto(AuthInfo().parse(proto.auth_info_bytes)),
+            proto.signatures,
+            proto.body_bytes,
+            proto.auth_info_bytes,
+        )
+
+    @classmethod
+    def from_string_bytes(cls, tx_bytes: str):
+        return cls.from_bytes(base64.b64decode(tx_bytes))
+
     def append_empty_signatures(self, signers: List[SignerInfo_]):
         for signer_info in signers:
             self.auth_info.signer_infos.append(signer_info)
@@ -160,5 +258,16 @@ class Tx_:
             signatures=self.signatures,
         )
 
+    def to_bytes(self) -> bytes:
+        return encode_tx_raw(
+            self.body_bytes if self.body_bytes is not None else self.body.to_bytes(),
+            self.auth_info_bytes if self.auth_info_bytes is not None else self.auth_info.to_bytes(),
+            self.signatures,
+        )
+
     def to_string_bytes(self) -> str:
-        return base64.b64encode(bytes(self.to_proto())).decode()
+        return base64.b64encode(self.to_bytes()).decode()
+
+    def to_hash(self) -> str:
+        """Hash the chain indexes the transaction by."""
+        return hashlib.sha256(self.to_bytes()).hexdigest().upper()
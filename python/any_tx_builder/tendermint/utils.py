@@ -1,4 +1,5 @@
 from datetime import datetime
+from decimal import Decimal
 from typing import Any
 
 
@@ -7,6 +8,8 @@ def to_data(x: Any) -> Any:
         return x.to_data()
     if isinstance(x, int):
         return str(x)
+    if isinstance(x, Decimal):
+        return format(x, "f")
     if isinstance(x, list):
         return [to_data(g) for g in x]
     if isinstance(x, dict):
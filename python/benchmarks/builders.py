@@ -0,0 +1,450 @@
+"""
+Build, sign, serialize, broadcast and status throughput of the EVM, Solana and Tendermint
+builders, through their batch interface, against local JSON-RPC and LCD stubs.
+
+Each stage goes through the N transactions in batches of --batch-size. Latency percentiles
+are per transaction (batch time over its size, the exact latency with --batch-size 1), RPC
+counts are the requests the stubs received during the stage. With --trace-memory, the peak
+memory of each stage is traced during its timed run: stages sign with fresh nonces and
+broadcast to stateful stubs, so they are never run twice, and tracemalloc slows them down,
+so traced figures are only compared with traced ones. The stubs run in the benchmark's
+process: figures are meant to be compared between runs, not with a node.
+
+    python benchmarks/builders.py --sizes 1 100 1000 -o results.json
+    python benchmarks/builders.py --sizes 1000 --compare results.json
+    python benchmarks/builders.py --chains evm --evm-rpc http://127.0.0.1:8545   # anvil or hardhat node
+    python benchmarks/builders.py --sizes 1000 --instrument --compare results.json   # instrumentation overhead
+    python benchmarks/builders.py --sizes 1000 --trace-memory -o memory.json
+"""
+import argparse
+import base64
+import hashlib
+import json
+import math
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+import base58
+import requests
+from solana.rpc.api import Client
+from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from web3 import Web3
+
+from any_tx_builder.builder_base import TransactionResult
+from any_tx_builder.evm.builder import EVMTransactionBuilder
+from any_tx_builder.instrumentation import PrometheusExporter, add_exporter
+from any_tx_builder.sol.builder import PROGRAM_IDLS, SolanaTransactionBuilder
+from any_tx_builder.sol.idl import ProgramIdl
+from any_tx_builder.tendermint.builder import TendermintTransactionBuilder, Wallet
+from any_tx_builder.tendermint.client import TendermintClient
+from any_tx_builder.tendermint.coin import Coin_
+from any_tx_builder.tendermint.messages import MsgDelegate_
+
+HOST = "127.0.0.1"
+EVM_PORT = 18545
+SOLANA_PORT = 18899
+LCD_PORT = 18317
+
+CHAINS = ("evm", "solana", "tendermint")
+STAGES = ("build", "sign", "serialize", "broadcast", "status")
+# RPC count of the HTTP requests, several RPC calls sharing one request when batched
+HTTP_REQUESTS = "http_requests"
+
+# Well known first account of anvil and hardhat nodes
+EVM_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+EVM_CONTRACT = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+APPROVE_ABI = [{
+    "type": "function",
+    "name": "approve",
+    "stateMutability": "nonpayable",
+    "inputs": [{"name": "spender", "type": "address"}, {"name": "amount", "type": "uint256"}],
+    "outputs": [{"name": "", "type": "bool"}],
+}]
+
+SOLANA_PROGRAM = Pubkey(bytes([1] * 32))
+SOLANA_IDL = {
+    "instructions": [{
+        "name": "poke",
+        "accounts": [{"name": "user", "isMut": True, "isSigner": True}],
+        "args": [{"name": "amount", "type": "u64"}],
+    }]
+}
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+VALIDATOR = "cosmosvaloper1sjllsnramtg3ewxqwwrwjxfgc4n4ef9u2lcnj0"
+
+
+#
+# Stubs answering like a node, without executing anything
+#
+
+
+class StubServer:
+    """HTTP server on a background thread, counting requests per RPC method and HTTP requests."""
+
+    def __init__(self, port: int, handle: Callable[[str, str, bytes], tuple]):
+        self.requests: Counter = Counter()
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, as clients with a session expect from a node, and no Nagle delay
+            # between the headers and the body
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _answer(self):
+                stub.count(HTTP_REQUESTS)
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                status, payload = handle(self.command, self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _answer
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((HOST, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def count(self, method: str):
+        with self._lock:
+            self.requests[method] += 1
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class JsonRpcStub(StubServer):
+    """JSON-RPC endpoint answering single and batch requests with `methods`."""
+
+    def __init__(self, port: int, methods: Dict[str, Callable[[list], object]]):
+        self.methods = methods
+        super().__init__(port, self._handle)
+
+    def _call(self, request: dict) -> dict:
+        self.count(request["method"])
+        try:
+            return {"jsonrpc": "2.0", "id": request["id"], "result": self.methods[request["method"]](request["params"])}
+        except Exception as error:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32000, "message": repr(error)}}
+
+    def _handle(self, method: str, path: str, body: bytes) -> tuple:
+        request = json.loads(body)
+        if isinstance(request, list):
+            return 200, [self._call(item) for item in request]
+        return 200, self._call(request)
+
+
+def evm_stub() -> JsonRpcStub:
+    sent = set()
+
+    def send_raw_transaction(params):
+        tx_hash = Web3.to_hex(Web3.keccak(hexstr=params[0]))
+        sent.add(tx_hash)
+        return tx_hash
+
+    def receipt(params):
+        return {"transactionHash": params[0], "status": "0x1", "blockNumber": "0x2"} if params[0] in sent else None
+
+    return JsonRpcStub(EVM_PORT, {
+        "eth_chainId": lambda params: "0x7a69",
+        "eth_getBlockByNumber": lambda params: {"number": "0x1", "baseFeePerGas": "0x3b9aca00"},
+        "eth_maxPriorityFeePerGas": lambda params: "0x3b9aca00",
+        "eth_getTransactionCount": lambda params: "0x0",
+        "eth_estimateGas": lambda params: "0xb411",
+        "eth_sendRawTransaction": send_raw_transaction,
+        "eth_getTransactionReceipt": receipt,
+    })
+
+
+def solana_stub() -> JsonRpcStub:
+    context = {"slot": 1}
+    sent = set()
+
+    def send_transaction(params):
+        # First signature, after the one byte compact-u16 signature count
+        signature = base58.b58encode(base64.b64decode(params[0])[1:65]).decode()
+        sent.add(signature)
+        return signature
+
+    def signature_statuses(params):
+        status = {
+            "slot": 1, "confirmations": None, "err": None, "status": {"Ok": None}, "confirmationStatus": "finalized"
+        }
+        return {"context": context, "value": [status if signature in sent else None for signature in params[0]]}
+
+    return JsonRpcStub(SOLANA_PORT, {
+        "getLatestBlockhash": lambda params: {
+            "context": context, "value": {"blockhash": "11111111111111111111111111111111", "lastValidBlockHeight": 100}
+        },
+        "sendTransaction": send_transaction,
+        "getSignatureStatuses": signature_statuses,
+    })
+
+
+def lcd_stub() -> StubServer:
+    sent = set()
+
+    def handle(method: str, path: str, body: bytes) -> tuple:
+        path = path.split("?")[0]
+        if path.startswith("/cosmos/auth/v1beta1/accounts/"):
+            stub.count("accounts")
+            return 200, {"account": {"account_number": "1", "sequence": "0"}}
+        if path == "/cosmos/tx/v1beta1/simulate":
+            stub.count("simulate")
+            return 200, {"gas_info": {"gas_wanted": "0", "gas_used": "90000"}}
+        if path == "/cosmos/tx/v1beta1/txs" and method == "POST":
+            stub.count("broadcast")
+            txhash = hashlib.sha256(base64.b64decode(json.loads(body)["tx_bytes"])).hexdigest().upper()
+            sent.add(txhash)
+            return 200, {"tx_response": {"txhash": txhash, "code": 0}}
+        if path.startswith("/cosmos/tx/v1beta1/txs/"):
+            stub.count("txs")
+            txhash = path.rsplit("/", 1)[1]
+            if txhash not in sent:
+                return 404, {"code": 5, "message": "tx not found"}
+            return 200, {"tx_response": {"txhash": txhash, "code": 0, "height": "2", "gas_used": "90000"}}
+        return 404, {"code": 12, "message": "Not Implemented"}
+
+    stub = StubServer(LCD_PORT, handle)
+    return stub
+
+
+#
+# Chains: each stage maps a batch of the previous stage's outputs to TransactionResults
+#
+
+
+class BuilderAbi(EVMTransactionBuilder):
+    """EVM builder with the approve ABI, instead of fetching it from etherscan."""
+
+    def get_contract_abi(self, contract_address: str) -> list:
+        return APPROVE_ABI
+
+
+def evm_stages(rpc_url: str) -> Dict[str, Callable[[list], List[TransactionResult]]]:
+    builder = BuilderAbi(Web3(Web3.HTTPProvider(rpc_url)))
+    from_address = builder.w3.eth.account.from_key(EVM_PRIVATE_KEY).address
+    return {
+        "build": lambda items: builder.build_many(from_address, [
+            {"contract_address": EVM_CONTRACT, "function_name": "approve", "function_args": [from_address, item]}
+            for item in items
+        ]),
+        "sign": lambda txs: builder.sign_many(txs, EVM_PRIVATE_KEY),
+        "serialize": lambda signed: [builder.w3.to_hex(tx.raw_transaction) for tx in signed],
+        "broadcast": lambda signed: builder.broadcast_many(signed),
+        "status": lambda tx_hashes: builder.status_many(tx_hashes),
+    }
+
+
+def solana_stages(rpc_url: str) -> Dict[str, Callable[[list], List[TransactionResult]]]:
+    builder = SolanaTransactionBuilder(Client(rpc_url), rpc_url)
+    PROGRAM_IDLS[SOLANA_PROGRAM] = ProgramIdl(SOLANA_IDL)
+    keypair = Keypair.from_seed(bytes(32))
+    from_address = str(keypair.pubkey())
+    return {
+        "build": lambda items: builder.build_many(from_address, [
+            {"program_id": SOLANA_PROGRAM, "function_name": "poke", "function_args": [item]} for item in items
+        ]),
+        "sign": lambda txs: builder.sign_many(txs, str(keypair)),
+        "serialize": lambda signed: [tx.serialize() for tx in signed],
+        "broadcast": lambda signed: builder.broadcast_many(signed),
+        "status": lambda signatures: builder.status_many(signatures),
+    }
+
+
+def tendermint_stages(lcd_url: str) -> Dict[str, Callable[[list], List[TransactionResult]]]:
+    # A session, as given by ChainRegistry: the concurrent simulations would open a connection each otherwise
+    client = TendermintClient(lcd_url, "0.025uatom", "uatom", session=requests.Session())
+    wallet = Wallet.from_mnemonic(client, MNEMONIC, 118)
+    builder = TendermintTransactionBuilder(wallet)
+    return {
+        "build": lambda items: builder.build_many(wallet.key.acc_address, [
+            {"msgs": [MsgDelegate_(wallet.key.acc_address, VALIDATOR, Coin_("uatom", 1_000 + item))]}
+            for item in items
+        ]),
+        "sign": lambda txs: builder.sign_many(txs),
+        "serialize": lambda signed: [tx.to_string_bytes() for tx in signed],
+        "broadcast": lambda signed: builder.broadcast_many(signed),
+        "status": lambda tx_hashes: builder.status_many(tx_hashes),
+    }
+
+
+#
+# Measures
+#
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    # Nearest rank
+    return sorted_values[max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)]
+
+
+def run_stage(stage: Callable[[list], list], inputs: list, batch_size: int, trace_memory: bool = False) -> tuple:
+    """Outputs, per transaction latencies, total seconds and peak traced memory (None when not traced)."""
+    outputs = []
+    latencies = []
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        for offset in range(0, len(inputs), batch_size):
+            batch = inputs[offset:offset + batch_size]
+            batch_start = time.perf_counter()
+            outputs.extend(stage(batch))
+            latencies.extend([(time.perf_counter() - batch_start) / len(batch)] * len(batch))
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return outputs, latencies, seconds, peak
+
+
+def run_chain(chain: str, stages: Dict[str, Callable], stub: Optional[StubServer], count: int, args) -> List[dict]:
+    results = []
+    inputs = {"build": list(range(count))}
+    for stage_name in STAGES:
+        stage_inputs = inputs[stage_name]
+        requests_before = Counter(stub.requests) if stub else Counter()
+        outputs, latencies, seconds, peak = run_stage(
+            stages[stage_name], stage_inputs, args.batch_size, args.trace_memory
+        )
+        rpc = dict(stub.requests - requests_before) if stub else {}
+
+        # Failed transactions do not move on to the next stages
+        if stage_name == "build":
+            inputs["sign"] = [result.transaction for result in outputs if result.ok]
+        elif stage_name == "sign":
+            inputs["serialize"] = inputs["broadcast"] = [result.transaction for result in outputs if result.ok]
+        elif stage_name == "broadcast":
+            inputs["status"] = [result.tx_hash for result in outputs if result.ok]
+
+        latencies.sort()
+        result = {
+            "chain": chain,
+            "stage": stage_name,
+            "transactions": len(stage_inputs),
+            "batch_size": args.batch_size,
+            "seconds": seconds,
+            "throughput": len(stage_inputs) / seconds if seconds else 0.0,
+            "latency_ms": {
+                name: percentile(latencies, percent) * 1e3 if latencies else 0.0
+                for name, percent in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+            },
+            "rpc": rpc,
+            "failed": sum(not output.ok for output in outputs if isinstance(output, TransactionResult)),
+            "peak_memory_kib": peak / 1024 if peak is not None else None,
+        }
+        results.append(result)
+        print_result(result)
+    return results
+
+
+def print_result(result: dict):
+    latency = result["latency_ms"]
+    rpc = ", ".join(f"{method} {count}" for method, count in sorted(result["rpc"].items())) or "-"
+    peak = f"{result['peak_memory_kib']:9.1f} KiB" if result["peak_memory_kib"] is not None else "        - KiB"
+    failed = f" | failed {result['failed']}" if result["failed"] else ""
+    print(
+        f"{result['chain']:<10} {result['stage']:<9} {result['transactions']:>6} txs | "
+        f"p50 {latency['p50']:8.3f} ms p95 {latency['p95']:8.3f} ms p99 {latency['p99']:8.3f} ms | "
+        f"{result['throughput']:9.0f} tx/s | peak {peak} | RPC {rpc}{failed}",
+        file=sys.stderr,
+    )
+
+
+def compare(results: List[dict], baseline_path: str, tolerance: float):
+    """Throughput and p50 change of every measure also present in the baseline, flagging losses above `tolerance`."""
+    with open(baseline_path) as file:
+        baseline = {
+            (result["chain"], result["stage"], result["transactions"]): result for result in json.load(file)["results"]
+        }
+    print(f"\nCompared with {baseline_path}", file=sys.stderr)
+    for result in results:
+        previous = baseline.get((result["chain"], result["stage"], result["transactions"]))
+        if previous is None or not previous["throughput"] or not previous["latency_ms"]["p50"]:
+            continue
+        throughput = result["throughput"] / previous["throughput"] - 1
+        p50 = result["latency_ms"]["p50"] / previous["latency_ms"]["p50"] - 1
+        marker = " ❌" if throughput < -tolerance else ""
+        print(
+            f"{result['chain']:<10} {result['stage']:<9} {result['transactions']:>6} txs | "
+            f"throughput {throughput:+7.1%} | p50 {p50:+7.1%}{marker}",
+            file=sys.stderr,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the transaction builders against local stubs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000], help="Transactions per run")
+    parser.add_argument("--chains", nargs="+", choices=CHAINS, default=list(CHAINS))
+    parser.add_argument("--batch-size", type=int, default=100, help="Transactions per batch call")
+    parser.add_argument("--evm-rpc", help="EVM dev node instead of the stub, its first account must be funded")
+    parser.add_argument("--trace-memory", action="store_true", help="Trace peak memory in the timed runs")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Throughput loss flagged by --compare")
+    parser.add_argument("--instrument", action="store_true", help="Run with a Prometheus exporter added")
+    args = parser.parse_args()
+    if args.instrument:
+        add_exporter(PrometheusExporter())
+
+    stubs = {}
+    if "evm" in args.chains and not args.evm_rpc:
+        stubs["evm"] = evm_stub()
+    if "solana" in args.chains:
+        stubs["solana"] = solana_stub()
+    if "tendermint" in args.chains:
+        stubs["tendermint"] = lcd_stub()
+    urls = {
+        "evm": args.evm_rpc or f"http://{HOST}:{EVM_PORT}",
+        "solana": f"http://{HOST}:{SOLANA_PORT}",
+        "tendermint": f"http://{HOST}:{LCD_PORT}",
+    }
+    stage_factories = {"evm": evm_stages, "solana": solana_stages, "tendermint": tendermint_stages}
+
+    results = []
+    try:
+        for chain in args.chains:
+            for count in args.sizes:
+                # Fresh builders per size, nonces and sequences starting over
+                stages = stage_factories[chain](urls[chain])
+                results.extend(run_chain(chain, stages, stubs.get(chain), count, args))
+    finally:
+        for stub in stubs.values():
+            stub.close()
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "instrumented": args.instrument,
+        "memory_traced": args.trace_memory,
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results saved to {args.output}", file=sys.stderr)
+    if args.compare:
+        compare(results, args.compare, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import re
+import time
+import tracemalloc
+from decimal import ROUND_CEILING, Decimal
+
+from any_tx_builder.tendermint.coin import Coin_, Coins, fee_coin
+
+COUNT = 1_000_000
+
+GAS_PRICES = ("0.006uatom", "0.025uosmo", "160000000inj", "0.0000000015inj")
+
+
+def float_fee(gas_price: str, gas: int) -> str:
+    # Previous implementation: regex compiled per call, amounts through float
+    match = re.match(r"^(\-?[0-9]+(\.[0-9]+)?)([0-9a-zA-Z/]+)$", gas_price)
+    return str(int(float(match.group(1)) * float(gas)))
+
+
+def exact_fee(gas_price: str, gas: int) -> str:
+    # Same path as TendermintClient._fee
+    return str(fee_coin(gas_price, gas).amount)
+
+
+def main():
+    gas_limits = [100_000 + i * 7_919 for i in range(COUNT)]
+
+    for gas_price in GAS_PRICES:
+        start = time.perf_counter()
+        float_fees = [float_fee(gas_price, gas) for gas in gas_limits]
+        float_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exact_fees = [exact_fee(gas_price, gas) for gas in gas_limits]
+        exact_elapsed = time.perf_counter() - start
+
+        price_amount = Decimal(Coin_.from_str(gas_price).amount)
+        # Exact fees are the ceiling of the exact product
+        assert all(
+            Decimal(fee) == (price_amount * gas).to_integral_value(rounding=ROUND_CEILING)
+            for gas, fee in zip(gas_limits[:10_000], exact_fees)
+        )
+        wrong = sum(
+            1 for gas, fee in zip(gas_limits, float_fees) if Decimal(fee) < price_amount * gas
+        )
+        print(
+            f"{gas_price:>14}  float {float_elapsed:6.2f} s | exact {exact_elapsed:6.2f} s | "
+            f"float fees below gas price x gas: {wrong}/{COUNT}"
+        )
+
+    start = time.perf_counter()
+    tracemalloc.start()
+    coins = (Coin_("uatom" if i % 2 else "inj", 1_000_000_000_000_000_000 + i) for i in range(COUNT))
+    total = Coins(coins)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Coins sum of {COUNT} coins {time.perf_counter() - start:6.2f} s | peak {peak / 1024:6.1f} KiB | {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import timeit
+
+from solana.constants import SYSTEM_PROGRAM_ID
+from solders.pubkey import Pubkey # type: ignore
+
+from any_tx_builder.sol.utils import (
+    INSTRUCTIONS_LAYOUT,
+    Authorized,
+    InstructionType,
+    Lockup,
+    encode_initialize_data,
+    encode_lamports_data,
+)
+
+ITERATIONS = 100_000
+
+STAKER = Pubkey.new_unique()
+WITHDRAWER = Pubkey.new_unique()
+
+
+def construct_initialize() -> bytes:
+    return INSTRUCTIONS_LAYOUT.build(
+        dict(
+            instruction_type=InstructionType.INITIALIZE,
+            args=dict(
+                authorized=Authorized(staker=STAKER, withdrawer=WITHDRAWER).as_bytes_dict(),
+                lockup=Lockup(unix_timestamp=0, epoch=0, custodian=SYSTEM_PROGRAM_ID).as_bytes_dict(),
+            ),
+        )
+    )
+
+
+def struct_initialize() -> bytes:
+    return encode_initialize_data(
+        Authorized(staker=STAKER, withdrawer=WITHDRAWER),
+        Lockup(unix_timestamp=0, epoch=0, custodian=SYSTEM_PROGRAM_ID),
+    )
+
+
+def construct_withdraw() -> bytes:
+    return INSTRUCTIONS_LAYOUT.build(dict(instruction_type=InstructionType.WITHDRAW, args=dict(lamports=1_000_000)))
+
+
+def struct_withdraw() -> bytes:
+    return encode_lamports_data(InstructionType.WITHDRAW, 1_000_000)
+
+
+def bench(name: str, reference, candidate):
+    assert reference() == candidate(), f"{name}: encoders disagree"
+    reference_time = timeit.timeit(reference, number=ITERATIONS)
+    candidate_time = timeit.timeit(candidate, number=ITERATIONS)
+    print(
+        f"{name:<12} construct {reference_time / ITERATIONS * 1e6:8.2f} µs | "
+        f"struct {candidate_time / ITERATIONS * 1e6:8.2f} µs | x{reference_time / candidate_time:.1f}"
+    )
+
+
+def main():
+    bench("Initialize", construct_initialize, struct_initialize)
+    bench("Withdraw", construct_withdraw, struct_withdraw)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+
+from aiohttp import WSMsgType, web
+
+from any_tx_builder.tendermint.async_client import AsyncTendermintClient
+from any_tx_builder.tendermint.builder import Wallet
+from any_tx_builder.tendermint.coin import Coin_
+from any_tx_builder.tendermint.events import TendermintEventClient
+from any_tx_builder.tendermint.messages import MsgDelegate_
+from any_tx_builder.tendermint.pipeline import BroadcastPipeline
+from any_tx_builder.tendermint.transactions import CreateTxOptions
+from any_tx_builder.tendermint.transactions.fee import Fee_
+
+TXS = 200
+BLOCK_TIME = 0.2
+POLL_INTERVAL = 1.0
+# The stand-in drops every websocket once, at this height, to exercise reconnections
+DISCONNECT_AT_BLOCK = 105
+HOST = "127.0.0.1"
+PORT = 18657
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+VALIDATOR = "cosmosvaloper1sjllsnramtg3ewxqwwrwjxfgc4n4ef9u2lcnj0"
+
+
+class NodeStandIn:
+    """LCD and CometBFT websocket of a node including every broadcast tx in the next block."""
+
+    def __init__(self):
+        self.height = 100
+        self.mempool = []
+        self.blocks = {}
+        self.subscribers = []
+        self.lcd_requests = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/cosmos/tx/v1beta1/txs", self.broadcast)
+        app.router.add_get("/cosmos/base/tendermint/v1beta1/blocks/latest", self.latest_block)
+        app.router.add_get("/cosmos/tx/v1beta1/txs", self.txs_by_height)
+        app.router.add_get("/cosmos/tx/v1beta1/txs/{txhash}", self.tx_by_hash)
+        app.router.add_get("/websocket", self.websocket)
+        return app
+
+    async def broadcast(self, request):
+        self.lcd_requests += 1
+        tx_bytes = base64.b64decode((await request.json())["tx_bytes"])
+        txhash = hashlib.sha256(tx_bytes).hexdigest().upper()
+        self.mempool.append((txhash, tx_bytes))
+        return web.json_response({"tx_response": {"txhash": txhash, "code": 0}})
+
+    async def latest_block(self, request):
+        self.lcd_requests += 1
+        return web.json_response({"block": {"header": {"height": str(self.height)}}})
+
+    async def txs_by_height(self, request):
+        self.lcd_requests += 1
+        height = int(request.query["events"].split("=")[1])
+        return web.json_response({"tx_responses": self.blocks.get(height, [])})
+
+    async def tx_by_hash(self, request):
+        self.lcd_requests += 1
+        for tx_responses in self.blocks.values():
+            for tx_response in tx_responses:
+                if tx_response["txhash"] == request.match_info["txhash"]:
+                    return web.json_response({"tx_response": tx_response})
+        return web.json_response({"code": 5, "message": "tx not found"}, status=404)
+
+    async def websocket(self, request):
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        queries = {}
+        self.subscribers.append((websocket, queries))
+        async for message in websocket:
+            if message.type != WSMsgType.TEXT:
+                break
+            subscribe = json.loads(message.data)
+            queries[subscribe["params"]["query"]] = subscribe["id"]
+            await websocket.send_json({"jsonrpc": "2.0", "id": subscribe["id"], "result": {}})
+        self.subscribers.remove((websocket, queries))
+        return websocket
+
+    async def publish(self, query_prefix: str, result: dict):
+        for websocket, queries in list(self.subscribers):
+            for query, subscription_id in queries.items():
+                if query.startswith(query_prefix):
+                    await websocket.send_json(
+                        {"jsonrpc": "2.0", "id": subscription_id, "result": {"query": query, **result}}
+                    )
+
+    async def produce_blocks(self):
+        while True:
+            await asyncio.sleep(BLOCK_TIME)
+            self.height += 1
+            included, self.mempool = self.mempool, []
+            self.blocks[self.height] = [
+                {"txhash": txhash, "height": str(self.height), "code": 0, "gas_wanted": "120000", "gas_used": "90000"}
+                for txhash, _ in included
+            ]
+            block = {"header": {"height": str(self.height)}}
+            await self.publish(
+                "tm.event='NewBlock'", {"data": {"type": "tendermint/event/NewBlock", "value": {"block": block}}}
+            )
+            for txhash, tx_bytes in included:
+                tx_result = {
+                    "height": str(self.height),
+                    "tx": base64.b64encode(tx_bytes).decode(),
+                    "result": {"code": 0, "gas_wanted": "120000", "gas_used": "90000"},
+                }
+                await self.publish(
+                    "tm.event='Tx'",
+                    {
+                        "data": {"type": "tendermint/event/Tx", "value": {"TxResult": tx_result}},
+                        "events": {"tx.hash": [txhash], "tx.height": [str(self.height)]},
+                    },
+                )
+            if self.height == DISCONNECT_AT_BLOCK:
+                for websocket, _ in list(self.subscribers):
+                    await websocket.close()
+
+
+def signed_txs(client: AsyncTendermintClient):
+    wallet = Wallet.from_mnemonic(client, MNEMONIC, 118, account_number=1, sequence=0)
+    fee = Fee_(200_000, [Coin_("uatom", 5_000)], "", "")
+    txs = [
+        wallet.build_tx(
+            CreateTxOptions(
+                msgs=[MsgDelegate_(wallet.key.acc_address, VALIDATOR, Coin_("uatom", 1_000 + i))], fee=fee
+            )
+        )
+        for i in range(TXS)
+    ]
+    return wallet.sign_txs(txs)
+
+
+async def run(use_events: bool):
+    node = NodeStandIn()
+    runner = web.AppRunner(node.app())
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+    producer = asyncio.create_task(node.produce_blocks())
+
+    client = AsyncTendermintClient(f"http://{HOST}:{PORT}", "0.025uatom", "uatom")
+    events = TendermintEventClient.from_rpc_url(f"http://{HOST}:{PORT}") if use_events else None
+    pipeline = BroadcastPipeline(client, poll_interval=POLL_INTERVAL, events=events)
+    txs = signed_txs(client)
+
+    latencies = []
+
+    async def submit(tx):
+        start = time.perf_counter()
+        await pipeline.submit(tx)
+        latencies.append(time.perf_counter() - start)
+
+    # Spread over 20 blocks, so that some submissions straddle the disconnection
+    tasks = []
+    for index, tx in enumerate(txs):
+        tasks.append(asyncio.create_task(submit(tx)))
+        if index % (TXS // 20) == 0:
+            await asyncio.sleep(BLOCK_TIME)
+    await asyncio.gather(*tasks)
+
+    await pipeline.close()
+    if events is not None:
+        await events.close()
+    await client.close()
+    producer.cancel()
+    await runner.cleanup()
+
+    label = "websocket events" if use_events else f"LCD polling {POLL_INTERVAL}s"
+    reconnects = f" | reconnects {events.reconnects}" if events is not None else ""
+    print(
+        f"{label:<18} mean inclusion {sum(latencies) / len(latencies) * 1e3:7.1f} ms | "
+        f"max {max(latencies) * 1e3:7.1f} ms | LCD requests {node.lcd_requests}{reconnects}"
+    )
+
+
+def main():
+    print(f"{TXS} txs, {BLOCK_TIME}s blocks")
+    asyncio.run(run(use_events=False))
+    asyncio.run(run(use_events=True))
+
+
+if __name__ == "__main__":
+    main()
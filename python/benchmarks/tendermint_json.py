@@ -0,0 +1,77 @@
+import json
+import timeit
+
+from any_tx_builder.tendermint.canonical_json import encode_std_sign_doc
+from any_tx_builder.tendermint.coin import Coin_
+from any_tx_builder.tendermint.messages import MsgDelegate_, MsgSend_
+from any_tx_builder.tendermint.transactions.fee import Fee_
+
+ITERATIONS = 200
+
+ADDRESS = "cosmos19rl4cm2hmr8afy4kldpxz3fka4jguq0auqdal4"
+
+# Non-ASCII and HTML characters: encoding/json writes the former as is and escapes the latter
+MEMO = "café ✓ <a&b>\u2028"
+GO_MEMO = b'"memo":"caf\xc3\xa9 \xe2\x9c\x93 \\u003ca\\u0026b\\u003e\\u2028"'
+GO_ESCAPES = str.maketrans({"<": "\\u003c", ">": "\\u003e", "&": "\\u0026", "\u2028": "\\u2028", "\u2029": "\\u2029"})
+
+
+def build_messages(message_count: int):
+    messages = []
+    for i in range(message_count):
+        if i % 2:
+            messages.append(MsgSend_(from_address=ADDRESS, to_address=ADDRESS, amount=[Coin_("uatom", 1_000 + i)]))
+        else:
+            messages.append(
+                MsgDelegate_(
+                    delegator_address=ADDRESS,
+                    validator_address="cosmosvaloper1sjllsnramtg3ewxqwwrwjxfgc4n4ef9u2lcnj0",
+                    amount=Coin_(denom="uatom", amount=str(100_000 + i)),
+                )
+            )
+    messages.append(MsgSend_(from_address=ADDRESS, to_address="<to&é>", amount=[Coin_("uatom", 1)]))
+    return messages
+
+
+def dumps_sign_doc(messages, fee: Fee_) -> bytes:
+    # Previous path: attr.asdict + dict_to_data per message, then json.dumps(sort_keys=True) in UTF-8
+    # with the escapes of encoding/json
+    msgs = []
+    for message in messages:
+        value = message.to_data()
+        value.pop("@type")
+        msgs.append({"type": message.type_amino, "value": value})
+    doc = {
+        "account_number": "1234",
+        "chain_id": "cosmoshub-4",
+        "fee": {"amount": [coin.to_data() for coin in fee.amount], "gas": str(fee.gas_limit)},
+        "memo": MEMO,
+        "msgs": msgs,
+        "sequence": "7",
+    }
+    return json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False).translate(GO_ESCAPES).encode()
+
+
+def compiled_sign_doc(messages, fee: Fee_) -> bytes:
+    return encode_std_sign_doc(1234, "cosmoshub-4", fee, MEMO, [m.to_amino_json() for m in messages], 7)
+
+
+def main():
+    for message_count in (1, 10, 100):
+        messages = build_messages(message_count)
+        fee = Fee_(200_000 * message_count, [Coin_(denom="uatom", amount="5000")], "", "")
+        assert dumps_sign_doc(messages, fee) == compiled_sign_doc(messages, fee)
+        assert GO_MEMO in compiled_sign_doc(messages, fee)
+        assert b'"to_address":"\\u003cto\\u0026\xc3\xa9\\u003e"' in compiled_sign_doc(messages, fee)
+        assert all(json.dumps(m.to_data(), sort_keys=True, separators=(",", ":")) == m.to_json() for m in messages)
+
+        dumps = timeit.timeit(lambda: dumps_sign_doc(messages, fee), number=ITERATIONS)
+        compiled = timeit.timeit(lambda: compiled_sign_doc(messages, fee), number=ITERATIONS)
+        print(
+            f"{message_count:>3} msgs  amino sign doc json.dumps {dumps / ITERATIONS * 1e3:7.3f} ms | "
+            f"compiled {compiled / ITERATIONS * 1e3:7.3f} ms | x{dumps / compiled:5.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import base64
+import copy
+import sys
+import timeit
+import tracemalloc
+
+from any_tx_builder.tendermint.builder import Wallet
+from any_tx_builder.tendermint.client import TendermintClient
+from any_tx_builder.tendermint.coin import Coin_
+from any_tx_builder.tendermint.messages import MsgDelegate_
+from any_tx_builder.tendermint.proto import SignMode
+from any_tx_builder.tendermint.transactions import AuthInfo_, ModeInfo_, ModeInfoSingle_, SignerInfo_, Tx_, TxBody_
+from any_tx_builder.tendermint.transactions.fee import Fee_
+from any_tx_builder.tendermint.transactions.signature import SignDoc_
+
+ITERATIONS = 200
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+ADDRESS = "cosmos19rl4cm2hmr8afy4kldpxz3fka4jguq0auqdal4"
+
+
+class LocalClient(TendermintClient):
+    """Answers the account query locally, nothing else is needed to sign."""
+
+    def get_account_info(self, acc_address):
+        return {
+            "address": acc_address,
+            "pub_key": {"@type": "/cosmos.crypto.secp256k1.PubKey", "key": "A" * 44},
+            "account_number": "1234",
+            "sequence": "0",
+        }
+
+
+def build_tx(message_count: int) -> Tx_:
+    messages = [
+        MsgDelegate_(
+            delegator_address=ADDRESS,
+            validator_address="cosmosvaloper1sjllsnramtg3ewxqwwrwjxfgc4n4ef9u2lcnj0",
+            amount=Coin_(denom="uatom", amount=str(100_000 + i)),
+        )
+        for i in range(message_count)
+    ]
+    fee = Fee_(200_000 * message_count, [Coin_(denom="uatom", amount="5000")], "", "")
+    return Tx_(TxBody_(messages, "STAKING MEMO", 0), AuthInfo_([], fee), [])
+
+
+def previous_sign_tx(wallet: Wallet, tx: Tx_, sequence: int) -> Tx_:
+    # Previous path: sign doc over the betterproto encoding, signer infos deep copied and restored
+    account_number = wallet.sequences.get_account_number()
+    signed_tx = Tx_(body=tx.body, auth_info=AuthInfo_(signer_infos=[], fee=tx.auth_info.fee), signatures=[])
+    sign_doc = SignDoc_(wallet.client.chain_id, account_number, sequence, signed_tx.auth_info, signed_tx.body)
+    signer_infos_backup = copy.deepcopy(sign_doc.auth_info.signer_infos)
+    sign_doc.auth_info.signer_infos = [
+        SignerInfo_(
+            public_key=wallet.key.public_key,
+            sequence=sequence,
+            mode_info=ModeInfo_(single=ModeInfoSingle_(mode=SignMode.SIGN_MODE_DIRECT)),
+        )
+    ]
+    signature = wallet.sign(bytes(sign_doc.to_proto()))
+    sign_doc.auth_info.signer_infos = signer_infos_backup
+    signed_tx.signatures.append(signature)
+    signed_tx.auth_info.signer_infos.append(
+        SignerInfo_(
+            public_key=wallet.key.public_key,
+            sequence=sequence,
+            mode_info=ModeInfo_(single=ModeInfoSingle_(mode=SignMode.SIGN_MODE_DIRECT)),
+        )
+    )
+    return signed_tx
+
+
+def previous_sign_and_serialize(wallet: Wallet, tx: Tx_) -> str:
+    return base64.b64encode(bytes(previous_sign_tx(wallet, tx, 0).to_proto())).decode()
+
+
+def sign_and_serialize(wallet: Wallet, tx: Tx_) -> str:
+    return wallet.sign_tx(tx, sequence=0).to_string_bytes()
+
+
+def count_allocations(function) -> int:
+    """
+    Memory blocks allocated by `function`, freed ones included.
+
+    The allocated block count is sampled at every bytecode through a trace function,
+    allocations only show up as increases between two samples.
+    """
+    allocated_blocks = sys.getallocatedblocks
+    state = {"blocks": 0, "allocations": 0}
+
+    def trace(frame, event, arg):
+        frame.f_trace_opcodes = True
+        blocks = allocated_blocks()
+        if blocks > state["blocks"]:
+            state["allocations"] += blocks - state["blocks"]
+        state["blocks"] = blocks
+        return trace
+
+    state["blocks"] = allocated_blocks()
+    sys.settrace(trace)
+    try:
+        function()
+    finally:
+        sys.settrace(None)
+    return state["allocations"]
+
+
+def main():
+    wallet = Wallet(LocalClient("http://localhost:1317", "0.006uatom", "uatom"), ADDRESS)
+    wallet.set_private_key(MNEMONIC, 118, 0, 0)
+
+    for message_count in (1, 10, 100):
+        tx = build_tx(message_count)
+        assert previous_sign_and_serialize(wallet, tx) == sign_and_serialize(wallet, tx)
+
+        elapsed = timeit.timeit(lambda: sign_and_serialize(wallet, tx), number=ITERATIONS)
+        previous_elapsed = timeit.timeit(lambda: previous_sign_and_serialize(wallet, tx), number=ITERATIONS)
+        allocations = count_allocations(lambda: sign_and_serialize(wallet, tx))
+        previous_allocations = count_allocations(lambda: previous_sign_and_serialize(wallet, tx))
+
+        tracemalloc.start()
+        sign_and_serialize(wallet, tx)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{message_count:>3} msgs  sign+serialize {elapsed / ITERATIONS * 1e3:7.3f} ms "
+            f"(previous {previous_elapsed / ITERATIONS * 1e3:7.3f} ms) | "
+            f"allocations {allocations:7d} (previous {previous_allocations:7d}) | peak {peak / 1024:8.1f} KiB"
+        )
+
+if __name__ == "__main__":
+    main()
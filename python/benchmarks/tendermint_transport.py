@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import time
+
+import grpclib.const
+from aiohttp import web
+from grpclib.server import Server
+
+from any_tx_builder.tendermint.async_client import AsyncTendermintClient
+from any_tx_builder.tendermint.coin import Coin_
+from any_tx_builder.tendermint.grpc_client import GrpcTendermintClient
+from any_tx_builder.tendermint.messages import MsgDelegate_
+from any_tx_builder.tendermint.proto import (
+    BroadcastTxRequest,
+    BroadcastTxResponse,
+    GasInfo,
+    SimulateRequest,
+    SimulateResponse,
+    TxResponse,
+)
+from any_tx_builder.tendermint.transactions import AuthInfo_, Tx_, TxBody_
+from any_tx_builder.tendermint.transactions.fee import Fee_
+
+REQUESTS = 2000
+HOST = "127.0.0.1"
+LCD_PORT = 18317
+GRPC_PORT = 19090
+
+ADDRESS = "cosmos19rl4cm2hmr8afy4kldpxz3fka4jguq0auqdal4"
+
+
+#
+# Local stand-ins answering like a node, without executing anything
+#
+
+
+class TxService:
+    def __init__(self):
+        self.received_bytes = 0
+
+    async def simulate(self, stream):
+        request = await stream.recv_message()
+        self.received_bytes += len(bytes(request))
+        await stream.send_message(SimulateResponse(gas_info=GasInfo(gas_wanted=0, gas_used=100_000)))
+
+    async def broadcast_tx(self, stream):
+        request = await stream.recv_message()
+        self.received_bytes += len(bytes(request))
+        await stream.send_message(BroadcastTxResponse(tx_response=TxResponse(txhash="AB", code=0)))
+
+    def __mapping__(self):
+        return {
+            "/cosmos.tx.v1beta1.Service/Simulate": grpclib.const.Handler(
+                self.simulate, grpclib.const.Cardinality.UNARY_UNARY, SimulateRequest, SimulateResponse
+            ),
+            "/cosmos.tx.v1beta1.Service/BroadcastTx": grpclib.const.Handler(
+                self.broadcast_tx, grpclib.const.Cardinality.UNARY_UNARY, BroadcastTxRequest, BroadcastTxResponse
+            ),
+        }
+
+
+def lcd_app(stats: dict) -> web.Application:
+    async def simulate(request):
+        body = await request.read()
+        stats["received_bytes"] += len(body)
+        base64.b64decode((await request.json())["tx_bytes"])
+        return web.json_response({"gas_info": {"gas_wanted": "0", "gas_used": "100000"}})
+
+    async def broadcast(request):
+        body = await request.read()
+        stats["received_bytes"] += len(body)
+        base64.b64decode((await request.json())["tx_bytes"])
+        return web.json_response({"tx_response": {"txhash": "AB", "code": 0}})
+
+    app = web.Application()
+    app.router.add_post("/cosmos/tx/v1beta1/simulate", simulate)
+    app.router.add_post("/cosmos/tx/v1beta1/txs", broadcast)
+    return app
+
+
+def build_tx(message_count: int) -> Tx_:
+    messages = [
+        MsgDelegate_(
+            delegator_address=ADDRESS,
+            validator_address="cosmosvaloper1sjllsnramtg3ewxqwwrwjxfgc4n4ef9u2lcnj0",
+            amount=Coin_(denom="uatom", amount=str(100_000 + i)),
+        )
+        for i in range(message_count)
+    ]
+    fee = Fee_(200_000 * message_count, [Coin_(denom="uatom", amount="5000")], "", "")
+    return Tx_(TxBody_(messages, "STAKING MEMO", 0), AuthInfo_([], fee), [b"\x01" * 64])
+
+
+async def run(client: AsyncTendermintClient, tx: Tx_) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(client.simulate_gas_used(tx) for _ in range(REQUESTS // 2)))
+    await asyncio.gather(*(client._broadcast(tx) for _ in range(REQUESTS // 2)))
+    return time.perf_counter() - start
+
+
+async def main():
+    lcd_stats = {"received_bytes": 0}
+    runner = web.AppRunner(lcd_app(lcd_stats))
+    await runner.setup()
+    await web.TCPSite(runner, HOST, LCD_PORT).start()
+    tx_service = TxService()
+    server = Server([tx_service])
+    await server.start(HOST, GRPC_PORT)
+
+    lcd_url = f"http://{HOST}:{LCD_PORT}"
+    rest = AsyncTendermintClient(lcd_url, "0.006uatom", "uatom")
+    grpc = GrpcTendermintClient(f"{HOST}:{GRPC_PORT}", lcd_url, "0.006uatom", "uatom")
+    try:
+        for message_count in (1, 10, 100):
+            tx = build_tx(message_count)
+            lcd_stats["received_bytes"] = tx_service.received_bytes = 0
+            rest_elapsed = await run(rest, tx)
+            grpc_elapsed = await run(grpc, tx)
+            print(
+                f"{message_count:>3} msgs  REST {REQUESTS / rest_elapsed:8.0f} req/s "
+                f"{lcd_stats['received_bytes'] / REQUESTS:8.0f} B/req | "
+                f"gRPC {REQUESTS / grpc_elapsed:8.0f} req/s {tx_service.received_bytes / REQUESTS:8.0f} B/req"
+            )
+    finally:
+        await rest.close()
+        await grpc.close()
+        server.close()
+        await server.wait_closed()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+import timeit
+
+from any_tx_builder.tendermint.coin import Coin_
+from any_tx_builder.tendermint.key import PublicKey
+from any_tx_builder.tendermint.messages import MsgDelegate_
+from any_tx_builder.tendermint.proto import SignMode
+from any_tx_builder.tendermint.transactions import AuthInfo_, ModeInfo_, ModeInfoSingle_, SignerInfo_, Tx_, TxBody_
+from any_tx_builder.tendermint.transactions.fee import Fee_
+from any_tx_builder.tendermint.transactions.signature import SignDoc_
+
+ITERATIONS = 1_000
+
+PUBLIC_KEY = PublicKey(type="/cosmos.crypto.secp256k1.PubKey", key=b"\x02" + b"\x11" * 32)
+
+
+def build_tx(message_count: int) -> Tx_:
+    messages = [
+        MsgDelegate_(
+            delegator_address="cosmos19rl4cm2hmr8afy4kldpxz3fka4jguq0auqdal4",
+            validator_address="cosmosvaloper1sjllsnramtg3ewxqwwrwjxfgc4n4ef9u2lcnj0",
+            amount=Coin_(denom="uatom", amount=str(100_000 + i)),
+        )
+        for i in range(message_count)
+    ]
+    signer_info = SignerInfo_(42, PUBLIC_KEY, ModeInfo_(single=ModeInfoSingle_(SignMode.SIGN_MODE_DIRECT)))
+    fee = Fee_(200_000 * message_count, [Coin_(denom="uatom", amount="5000")], "", "")
+    return Tx_(TxBody_(messages, "STAKING MEMO", 0), AuthInfo_([signer_info], fee), [b"\x01" * 64])
+
+
+def betterproto_sign_path(tx: Tx_) -> bytes:
+    sign_doc = SignDoc_("cosmoshub-4", 1234, 42, tx.auth_info, tx.body)
+    bytes(sign_doc.to_proto())
+    return bytes(tx.to_proto())
+
+
+def writer_sign_path(tx: Tx_) -> bytes:
+    sign_doc = SignDoc_("cosmoshub-4", 1234, 42, tx.auth_info, tx.body)
+    sign_doc.to_bytes()
+    return tx.to_bytes()
+
+
+def main():
+    for message_count in (1, 10, 100):
+        tx = build_tx(message_count)
+        assert betterproto_sign_path(tx) == writer_sign_path(tx), "encoders disagree"
+        sign_doc = SignDoc_("cosmoshub-4", 1234, 42, tx.auth_info, tx.body)
+        assert bytes(sign_doc.to_proto()) == sign_doc.to_bytes(), "sign docs disagree"
+
+        reference = timeit.timeit(lambda: betterproto_sign_path(tx), number=ITERATIONS)
+        candidate = timeit.timeit(lambda: writer_sign_path(tx), number=ITERATIONS)
+        print(
+            f"{message_count:>3} msgs  betterproto {reference / ITERATIONS * 1e6:9.1f} µs | "
+            f"writer {candidate / ITERATIONS * 1e6:8.1f} µs | x{reference / candidate:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
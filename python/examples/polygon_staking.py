@@ -1,3 +1,4 @@
+import logging
 import os
 from web3.exceptions import ContractLogicError
 from any_tx_builder.evm.connection import setup_web3_connection
@@ -100,4 +101,6 @@ def main():
     print(f"💸 Liquid Rewards: {liq_rew}")
 
 if __name__ == "__main__":
+    # Builders log their progress as events
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
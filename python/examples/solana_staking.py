@@ -1,3 +1,4 @@
+import logging
 from any_tx_builder.sol.connection import setup_solana_connection
 from any_tx_builder.sol.builder import SolanaStakingTransactionBuilder
 from dotenv import load_dotenv
@@ -34,4 +35,6 @@ def build_staking_transaction():
     print(builder.is_transaction_broadcasted(sent_tx.value))
 
 if __name__ == "__main__":
+    # Builders log their progress as events
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     build_staking_transaction()
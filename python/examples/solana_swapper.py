@@ -1,3 +1,4 @@
+import logging
 from dotenv import load_dotenv
 import os
 from any_tx_builder.sol.connection import setup_solana_connection
@@ -56,6 +57,8 @@ def test_get_token_decimals():
     print(decimals)
 
 if __name__ == "__main__":
+    # Builders log their progress as events
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     #build_transfer_sol_transaction()
     #build_transfer_token_transaction()
     test_get_token_decimals()
\ No newline at end of file
@@ -1,11 +1,11 @@
+import logging
 import os
 from any_tx_builder.tendermint.builder import Wallet
-from any_tx_builder.tendermint.client import TendermintClient
 from any_tx_builder.tendermint.coin import Coin_
 from any_tx_builder.tendermint.messages import MsgDelegate_
 from any_tx_builder.tendermint.transactions import CreateTxOptions
 from any_tx_builder.tendermint.types import AccAddress, ValAddress
-from any_tx_builder.tendermint.config import TENDERMINT_SETUP
+from any_tx_builder.tendermint.registry import ChainRegistry
 
 from dotenv import load_dotenv
 
@@ -14,17 +14,18 @@ from dotenv import load_dotenv
 #
 
 load_dotenv()
-SETUP = TENDERMINT_SETUP[os.getenv('TENDERMINT_CHAIN')]
+# Chains of TENDERMINT_CHAINS_FILE (see tendermint_chains.json), or the built-in cosmos setup
+REGISTRY = (
+    ChainRegistry.from_file(os.getenv('TENDERMINT_CHAINS_FILE'))
+    if os.getenv('TENDERMINT_CHAINS_FILE')
+    else ChainRegistry.default()
+)
+CHAIN = os.getenv('TENDERMINT_CHAIN')
+SETUP = REGISTRY.config(CHAIN)
 
 
 def build_cosmos_delegation_tx(cosmos_address: AccAddress):
-    cosmos_client = TendermintClient(
-        lcd_url=SETUP.rpc_url,
-        denom=SETUP.denom,
-        default_price=SETUP.base_gas_price,
-        chain_id=SETUP.chain_id,
-    )
-    wallet = Wallet(cosmos_client, cosmos_address)
+    wallet: Wallet = REGISTRY.wallet(CHAIN, cosmos_address)
     wallet.set_private_key(os.getenv('TENDERMINT_PRIVATE_KEY'), SETUP.coin_type, 0, 0)
 
     # Delegation Transaction Message
@@ -57,4 +58,6 @@ def build_cosmos_delegation_tx(cosmos_address: AccAddress):
     return signed_tx
 
 if __name__ == "__main__":
+    # Builders log their progress as events
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     signed_tx = build_cosmos_delegation_tx(os.getenv('TENDERMINT_WALLET_ADDRESS'))